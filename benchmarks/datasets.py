@@ -0,0 +1,70 @@
+"""
+Synthetic, reproducible datasets for the benchmarks: the same seed and size
+always give the same rows and documents.
+"""
+import csv
+import json
+import random
+import datetime
+
+ROW_COLUMNS = ["id", "name", "email", "age", "score", "created_at"]
+
+CITIES = ["Delhi", "Mumbai", "Pune", "Chennai", "Kolkata", "Jaipur", "Bengaluru"]
+TAGS = ["new", "vip", "trial", "churned", "partner", "internal"]
+EPOCH = datetime.datetime(2024, 1, 1)
+
+
+def make_rows(size, seed=42):
+    """
+    Return 'size' rows (tuples in the order of ROW_COLUMNS).
+    """
+    generator = random.Random(seed)
+    rows = []
+    for i in range(1, size + 1):
+        name = f"user{generator.randrange(10**6):06d}"
+        rows.append(
+            (
+                i,
+                name,
+                f"{name}@example.com",
+                generator.randint(18, 90),
+                round(generator.random() * 1000, 3),
+                (EPOCH + datetime.timedelta(seconds=generator.randrange(10**7))).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+            )
+        )
+    return rows
+
+
+def make_documents(size, seed=42):
+    """
+    Return 'size' documents: the fields of 'make_rows', a nested address and
+    an array of tags.
+    """
+    generator = random.Random(seed + 1)
+    documents = []
+    for row in make_rows(size, seed):
+        document = dict(zip(ROW_COLUMNS, row))
+        document["address"] = {
+            "city": generator.choice(CITIES),
+            "zip": f"{generator.randrange(10**6):06d}",
+        }
+        document["tags"] = generator.sample(TAGS, generator.randint(0, 3))
+        documents.append(document)
+    return documents
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(ROW_COLUMNS)
+        writer.writerows(rows)
+    return path
+
+
+def write_jsonl(path, documents):
+    with open(path, "w", encoding="utf-8") as json_file:
+        for document in documents:
+            json_file.write(json.dumps(document) + "\n")
+    return path
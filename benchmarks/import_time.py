@@ -0,0 +1,126 @@
+"""
+Import time of the dbautomate package.
+
+Every import statement runs '--repeat' times, each in a new interpreter, and
+the best wall time of the statement (the least disturbed by the machine) is
+reported with the heavy dependencies it loaded. A statement fails the run
+when it does not import, or when it loads a dependency it does not need
+(e.g. pandas for 'import dbautomate').
+
+Usage:
+    python benchmarks/import_time.py --output import_baseline.json
+    python benchmarks/import_time.py --baseline import_baseline.json --tolerance 0.2
+
+With '--baseline' the exit status is also 1 when a statement is slower than
+the baseline by more than '--tolerance'.
+"""
+import sys
+import json
+import argparse
+import platform
+import subprocess
+
+HEAVY_MODULES = ["pandas", "numpy", "pymongo", "bson", "mysql.connector", "prettytable", "pyarrow"]
+
+# Statement -> heavy modules it must not load
+CASES = {
+    "import dbautomate": HEAVY_MODULES,
+    "from dbautomate import Mongo_operation": ["pandas", "numpy", "mysql.connector", "prettytable", "pyarrow"],
+    "from dbautomate import MySQL_operation": ["pandas", "numpy", "pymongo", "bson", "prettytable", "pyarrow"],
+    "from dbautomate import AsyncMySQL_operation": ["pandas", "numpy", "pymongo", "bson", "prettytable", "pyarrow"],
+    "from dbautomate import Metrics": HEAVY_MODULES,
+    "from dbautomate import mysql_to_mongo": ["pandas", "numpy", "prettytable", "pyarrow"],
+}
+
+# Run in the new interpreter: time the statement, list the heavy modules loaded
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement, repeat):
+    """
+    Return the best seconds of 'statement' over 'repeat' new interpreters
+    and the heavy modules it loaded.
+
+    Raises:
+    - RuntimeError: If the statement fails.
+    """
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    times = []
+    loaded = []
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if process.returncode != 0:
+            lines = process.stderr.strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"exit status {process.returncode}")
+        probe = json.loads(process.stdout.strip().splitlines()[-1])
+        times.append(probe["seconds"])
+        loaded = probe["loaded"]
+    return min(times), loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time of the dbautomate package.")
+    parser.add_argument("--repeat", type=int, default=5, help="interpreters per statement")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results saved in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="allowed slowdown (default 0.20)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+
+    results = {}
+    failures = []
+    width = max(len(statement) for statement in CASES)
+    for statement, forbidden in CASES.items():
+        try:
+            seconds, loaded = measure(statement, args.repeat)
+        except RuntimeError as e:
+            failures.append(statement)
+            print(f"{statement:<{width}}  FAILED: {e}")
+            continue
+        results[statement] = {"ms": seconds * 1000, "loaded": loaded}
+        line = f"{statement:<{width}}  {seconds * 1000:8.1f} ms  {', '.join(loaded) or '-'}"
+
+        unexpected = [module for module in loaded if module in forbidden]
+        if unexpected:
+            failures.append(statement)
+            line += f"  UNEXPECTED: {', '.join(unexpected)}"
+        before = baseline.get(statement)
+        if before is not None and before["ms"]:
+            change = seconds * 1000 / before["ms"] - 1
+            line += f"  {change:+.1%}"
+            if change > args.tolerance:
+                failures.append(statement)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.output:
+        report = {
+            "meta": {
+                "repeat": args.repeat,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"Results saved to '{args.output}'")
+
+    if failures:
+        print(f"Failed: {', '.join(dict.fromkeys(failures))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
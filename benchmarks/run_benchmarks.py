@@ -0,0 +1,474 @@
+"""
+Benchmarks of the MySQL and MongoDB operators.
+
+Every operation runs '--repeat' times on a synthetic dataset of '--rows'
+rows/documents, after '--warmup' untimed runs (the first call loads the
+lazy imports such as pandas or pyarrow, and fills the caches), and reports the rows per second (of the median run), the
+latency percentiles (of every call for the point operations, of every run
+otherwise) and the peak resident memory of the process during the run.
+
+MySQL runs on a server given with '--mysql-config' (a JSON object or file
+with the 'mysql.connector' config), or on an in-process stand-in
+('tests/fake_mysql.py'). MongoDB runs on a server given with '--mongo-uri', or on
+'mongomock' if it is installed.
+
+Usage:
+    python benchmarks/run_benchmarks.py --rows 20000 --output baseline.json
+    python benchmarks/run_benchmarks.py --rows 20000 --baseline baseline.json
+    python benchmarks/run_benchmarks.py --only mongo --mongo-uri mongodb://localhost:27017
+
+With '--baseline' the exit status is 1 when an operation is slower than the
+baseline by more than '--tolerance' (rows/s or p95 latency).
+"""
+import io
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import contextlib
+from collections import namedtuple
+from prettytable import PrettyTable
+
+import datasets
+from dbautomate.mysqloperator import MySQL_operation
+from dbautomate.mongodboperator import Mongo_operation
+
+TABLE = "bench_rows"
+COLLECTION = "bench_documents"
+DATABASE = "dbautomate_bench"
+POINT_QUERIES = 500
+
+Case = namedtuple("Case", ["name", "backend", "setup", "run"])
+CASES = []
+
+
+def case(name, backend, setup=None):
+    """
+    Register a benchmark. 'run(context, latencies)' returns the number of rows
+    it processed and may append the latency of every call to 'latencies'.
+    'setup(context)' runs before every repeat and is not timed.
+    """
+
+    def register(run):
+        CASES.append(Case(name, backend, setup, run))
+        return run
+
+    return register
+
+
+# MySQL
+
+
+def create_table(context):
+    mysql_handler = context["mysql"]
+    mysql_handler.execute_query(f"DROP TABLE IF EXISTS {TABLE}")
+    mysql_handler.execute_query(
+        f"CREATE TABLE {TABLE} (id INT PRIMARY KEY, name VARCHAR(64), email VARCHAR(128), "
+        "age INT, score DOUBLE, created_at DATETIME)"
+    )
+
+
+def fill_table(context):
+    create_table(context)
+    context["mysql"].insert_data(
+        TABLE, context["rows"], columns=datasets.ROW_COLUMNS, many=True
+    )
+
+
+@case("mysql.insert_data", "mysql", create_table)
+def mysql_insert_data(context, latencies):
+    rows, batch_size = context["rows"], context["batch_size"]
+    for offset in range(0, len(rows), batch_size):
+        start = time.perf_counter()
+        context["mysql"].insert_data(
+            TABLE, rows[offset : offset + batch_size], columns=datasets.ROW_COLUMNS, many=True
+        )
+        latencies.append(time.perf_counter() - start)
+    return len(rows)
+
+
+@case("mysql.bulk_insert", "mysql", create_table)
+def mysql_bulk_insert(context, latencies):
+    result = context["mysql"].bulk_insert(
+        TABLE, context["csv_path"], chunksize=context["batch_size"]
+    )
+    return result.rows
+
+
+@case("mysql.load_data_infile", "mysql", create_table)
+def mysql_load_data_infile(context, latencies):
+    result = context["mysql"].load_data_infile(
+        TABLE, context["csv_path"], fallback_chunksize=context["batch_size"]
+    )
+    return result.rows
+
+
+@case("mysql.save_data", "mysql", fill_table)
+def mysql_save_data(context, latencies):
+    result = context["mysql"].save_data(
+        TABLE,
+        batch_size=context["batch_size"],
+        output_path=os.path.join(context["directory"], "mysql_export.csv"),
+    )
+    return result.rows
+
+
+@case("mysql.execute_query", "mysql", fill_table)
+def mysql_execute_query(context, latencies):
+    df = context["mysql"].execute_query(
+        f"SELECT * FROM {TABLE}", result="dataframe", batch_size=context["batch_size"]
+    )
+    return len(df)
+
+
+@case("mysql.point_query", "mysql", fill_table)
+def mysql_point_query(context, latencies):
+    size = len(context["rows"])
+    for i in range(POINT_QUERIES):
+        start = time.perf_counter()
+        context["mysql"].execute_query(
+            f"SELECT * FROM {TABLE} WHERE id = {i * 7919 % size + 1}", result="preview"
+        )
+        latencies.append(time.perf_counter() - start)
+    return POINT_QUERIES
+
+
+# MongoDB
+
+
+def empty_collection(context):
+    context["mongo"].collection.delete_many({})
+    # insert_many adds '_id' to the documents, insert copies
+    context["documents_copy"] = [dict(document) for document in context["documents"]]
+
+
+def fill_collection(context):
+    empty_collection(context)
+    context["mongo"].collection.insert_many(context["documents_copy"])
+
+
+@case("mongo.insert_data", "mongo", empty_collection)
+def mongo_insert_data(context, latencies):
+    context["mongo"].insert_data(context["documents_copy"])
+    return len(context["documents_copy"])
+
+
+@case("mongo.bulk_insert", "mongo", empty_collection)
+def mongo_bulk_insert(context, latencies):
+    result = context["mongo"].bulk_insert(
+        context["jsonl_path"], batch_size=context["batch_size"]
+    )
+    return result.rows
+
+
+@case("mongo.parallel_insert", "mongo", empty_collection)
+def mongo_parallel_insert(context, latencies):
+    result = context["mongo"].parallel_insert(
+        context["documents_copy"], batch_size=context["batch_size"], workers=4
+    )
+    return result.rows
+
+
+@case("mongo.find_data", "mongo", fill_collection)
+def mongo_find_data(context, latencies):
+    return len(context["mongo"].find_data({"age": {"$gte": 0}}, as_dataframe=False))
+
+
+@case("mongo.query_data", "mongo", fill_collection)
+def mongo_query_data(context, latencies):
+    df = context["mongo"].query_data(
+        projection={"_id": 0, "id": 1, "name": 1, "score": 1},
+        output="dataframe",
+        batch_size=context["batch_size"],
+    )
+    return len(df)
+
+
+@case("mongo.point_query", "mongo", fill_collection)
+def mongo_point_query(context, latencies):
+    size = len(context["documents"])
+    for i in range(POINT_QUERIES):
+        start = time.perf_counter()
+        context["mongo"].find_data({"id": i * 7919 % size + 1}, as_dataframe=False)
+        latencies.append(time.perf_counter() - start)
+    return POINT_QUERIES
+
+
+@case("mongo.save_data", "mongo", fill_collection)
+def mongo_save_data(context, latencies):
+    result = context["mongo"].save_data(
+        "jsonl",
+        os.path.join(context["directory"], "mongo_export.jsonl"),
+        batch_size=context["batch_size"],
+    )
+    return result.rows
+
+
+# Measurement
+
+
+class PeakRSS:
+    """
+    Sample the resident memory of the process in a thread while the block runs.
+    Without '/proc' the peak of the whole process ('ru_maxrss') is reported.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def current():
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            import resource
+
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # kilobytes on Linux, bytes on macOS
+            return peak if sys.platform == "darwin" else peak * 1024
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.current()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    # nearest rank
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_case(benchmark, context, repeat, verbose, warmup=1):
+    # Untimed runs: lazy imports, schema caches and the server warm up
+    for _ in range(warmup):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if benchmark.setup is not None:
+                benchmark.setup(context)
+            benchmark.run(context, [])
+    durations, latencies, peaks, rows = [], [], [], 0
+    for _ in range(repeat):
+        output = sys.stdout if verbose else io.StringIO()
+        with contextlib.redirect_stdout(output):
+            if benchmark.setup is not None:
+                benchmark.setup(context)
+            calls = []
+            with PeakRSS() as memory:
+                start = time.perf_counter()
+                rows = benchmark.run(context, calls)
+                elapsed = time.perf_counter() - start
+        durations.append(elapsed)
+        latencies.extend(calls or [elapsed])
+        peaks.append(memory.peak)
+    median = percentile(durations, 0.5)
+    return {
+        "rows": rows,
+        "runs": repeat,
+        "seconds": median,
+        "rows_per_second": rows / median if median > 0 else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_rss_mb": max(peaks) / 2**20,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print the change of every operation against the baseline and return the
+    names of the regressions.
+    """
+    table = PrettyTable(["operation", "baseline rows/s", "rows/s", "change", "p95 change", ""])
+    table.align = "r"
+    table.align["operation"] = "l"
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            table.add_row([name, "-", f"{result['rows_per_second']:,.0f}", "new", "-", ""])
+            continue
+        speed = result["rows_per_second"] / before["rows_per_second"] - 1
+        latency = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        slower = speed < -tolerance or latency > tolerance
+        if slower:
+            regressions.append(name)
+        table.add_row(
+            [
+                name,
+                f"{before['rows_per_second']:,.0f}",
+                f"{result['rows_per_second']:,.0f}",
+                f"{speed:+.1%}",
+                f"{latency:+.1%}",
+                "REGRESSION" if slower else "",
+            ]
+        )
+    print(table)
+    return regressions
+
+
+# Setup
+
+
+def mysql_operator(config):
+    mysql_handler = MySQL_operation(interactive=False)
+    if config is None:
+        # The stand-in of the tests, imported from the root of the repository
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from tests import fake_mysql
+
+        fake_mysql.install()
+        config = {"host": "in-process", "database": DATABASE}
+    elif os.path.exists(config):
+        with open(config) as config_file:
+            config = json.load(config_file)
+    else:
+        config = json.loads(config)
+    if mysql_handler.connect_to_mysql(config, attempts=1) is None:
+        raise SystemExit("Can not connect to MySQL")
+    return mysql_handler
+
+
+def mongo_operator(uri):
+    mongo = Mongo_operation(interactive=False)
+    if uri is None:
+        try:
+            import mongomock
+        except ImportError:
+            return None
+        mongo.client = mongomock.MongoClient()
+        mongo.is_closed = False
+        mongo.database = mongo.client[DATABASE]
+        mongo.collection = mongo.database[COLLECTION]
+        return mongo
+    if mongo.get_mongo_client(uri) is None:
+        raise SystemExit("Can not connect to MongoDB")
+    mongo.create_database(DATABASE)
+    mongo.create_collection(COLLECTION)
+    return mongo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the dbautomate operators.")
+    parser.add_argument("--rows", type=int, default=10000, help="rows/documents of the dataset")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of every operation")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before the timed ones")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", help="only run the operations containing this text")
+    parser.add_argument("--mysql-config", help="JSON config or JSON file of a MySQL server")
+    parser.add_argument("--mongo-uri", help="URI of a MongoDB server")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results saved in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown (default 0.10)")
+    parser.add_argument("--verbose", action="store_true", help="show the output of the operators")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if args.only is None or args.only in c.name]
+    backends = {c.backend for c in cases}
+    context = {"batch_size": args.batch_size}
+    with contextlib.ExitStack() as stack:
+        directory = stack.enter_context(tempfile.TemporaryDirectory())
+        context["directory"] = directory
+        context["rows"] = datasets.make_rows(args.rows, args.seed)
+        context["csv_path"] = datasets.write_csv(
+            os.path.join(directory, "rows.csv"), context["rows"]
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            if "mysql" in backends:
+                context["mysql"] = mysql_operator(args.mysql_config)
+            if "mongo" in backends:
+                context["mongo"] = mongo_operator(args.mongo_uri)
+        if "mongo" in backends:
+            if context["mongo"] is None:
+                print("Skipping MongoDB: pass --mongo-uri or install mongomock")
+                cases = [c for c in cases if c.backend != "mongo"]
+            else:
+                context["documents"] = datasets.make_documents(args.rows, args.seed)
+                context["jsonl_path"] = datasets.write_jsonl(
+                    os.path.join(directory, "documents.jsonl"), context["documents"]
+                )
+
+        results = {}
+        table = PrettyTable(
+            ["operation", "rows", "rows/s", "p50 ms", "p95 ms", "p99 ms", "peak RSS MB"]
+        )
+        table.align = "r"
+        table.align["operation"] = "l"
+        for benchmark in cases:
+            result = run_case(benchmark, context, args.repeat, args.verbose, args.warmup)
+            results[benchmark.name] = result
+            table.add_row(
+                [
+                    benchmark.name,
+                    result["rows"],
+                    f"{result['rows_per_second']:,.0f}",
+                    f"{result['p50_ms']:.2f}",
+                    f"{result['p95_ms']:.2f}",
+                    f"{result['p99_ms']:.2f}",
+                    f"{result['peak_rss_mb']:.1f}",
+                ]
+            )
+            print(f"{benchmark.name}: {result['rows_per_second']:,.0f} rows/s", file=sys.stderr)
+        print(table)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            if context.get("mysql") is not None:
+                context["mysql"].close_connection()
+            if context.get("mongo") is not None and args.mongo_uri is not None:
+                context["mongo"].collection.drop()
+                context["mongo"].close_mongo_client()
+
+    report = {
+        "meta": {
+            "rows": args.rows,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "batch_size": args.batch_size,
+            "seed": args.seed,
+            "mysql": "server" if args.mysql_config else "in-process",
+            "mongo": "server" if args.mongo_uri else "mongomock",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"Results saved to '{args.output}'")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline["meta"]["rows"] != args.rows:
+            print(f"Warning: the baseline was measured with {baseline['meta']['rows']} rows")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"Slower than the baseline: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,4 +40,7 @@ setup(
         "mysql-connector-python",
         "prettytable",
     ],
+    extras_require={
+        "columnar": ["pyarrow"],
+    },
 )
@@ -0,0 +1,41 @@
+"""
+Automate the common tasks of MySQL and MongoDB.
+
+The operators are imported lazily on first access, so 'import dbautomate'
+does not load the MySQL driver, pymongo or pandas; each one is only imported
+by the module (or the code path) that needs it.
+
+Example Usage:
+```python
+from dbautomate import Mongo_operation  # loads pymongo, not mysql.connector
+```
+"""
+import importlib
+
+# Public name -> module that defines it
+_LAZY_ATTRIBUTES = {
+    "MySQL_operation": ".mysqloperator",
+    "AsyncMySQL_operation": ".asyncmysqloperator",
+    "Mongo_operation": ".mongodboperator",
+    "OperationResult": ".results",
+    "Metrics": ".metrics",
+    "MetricEvent": ".metrics",
+    "mysql_to_mongo": ".pipelines",
+    "mongo_to_mysql": ".pipelines",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache it, so the next access does not go through '__getattr__'
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,167 @@
+import asyncio
+import functools
+import termcolor
+from concurrent.futures import ThreadPoolExecutor
+from .mysqloperator import MySQL_operation
+
+
+class AsyncMySQL_operation:
+    """
+    asyncio front-end of 'MySQL_operation'.
+
+    The blocking MySQL calls run on a managed thread pool with one thread per
+    pooled connection, so the event loop is never blocked and up to
+    'pool_size' operations run at the same time; the other ones wait for a
+    free connection without blocking the loop. The wrapped operator is
+    non-interactive, the options have to be passed as arguments.
+
+    Example Usage:
+    ```python
+    async def main():
+        mysql_handler = AsyncMySQL_operation()
+        await mysql_handler.connect(config, pool_size=16)
+        await asyncio.gather(
+            *(mysql_handler.insert_data("events", rows, many=True) for rows in chunks)
+        )
+        df = await mysql_handler.execute_query("SELECT * FROM events", result="dataframe")
+        await mysql_handler.close()
+
+    asyncio.run(main())
+    ```
+    """
+
+    def __init__(self):
+        self.operator = MySQL_operation(interactive=False)
+        self._executor = None
+        self._semaphore = None
+
+    def __str__(self):
+        return str(self.operator)
+
+    async def _run(self, method, *args, **kwargs):
+        if self._executor is None:
+            raise Exception("Not connected, call 'connect' first")
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(method, *args, **kwargs)
+            )
+
+    async def connect(
+        self, config, attempts=3, delay=2, pool_size=10, pool_timeout=30, health_check=True
+    ):
+        """
+        Create the pool of connections, retrying with a progressive delay that
+        does not block the event loop.
+
+        Parameters:
+        - config (dict): The connection config of 'mysql.connector'.
+        - attempts (int, optional): The maximum number of connection attempts (default is 3).
+        - delay (int, optional): The delay in seconds between connection attempts, raised to the attempt number (default is 2).
+        - pool_size (int, optional): Number of pooled connections and of concurrent operations (default is 10).
+        - pool_timeout (float, optional): Seconds to wait for a free pooled connection (default is 30).
+        - health_check (bool, optional): Ping a pooled connection when it is borrowed (default is True).
+
+        Returns:
+        - MySQLConnectionPool or None: The pool, or None if the connection attempts are exhausted.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=pool_size, thread_name_prefix="dbautomate"
+            )
+            self._semaphore = asyncio.Semaphore(pool_size)
+        for attempt in range(1, attempts + 1):
+            pool = await self._run(
+                self.operator.connect_to_mysql,
+                config,
+                attempts=1,
+                delay=0,
+                pool_size=pool_size,
+                pool_timeout=pool_timeout,
+                health_check=health_check,
+            )
+            if pool is not None:
+                return pool
+            if attempt < attempts:
+                # progressive reconnect delay
+                await asyncio.sleep(delay**attempt)
+        return None
+
+    async def execute_query(self, query, result="table", max_rows=100, batch_size=10000):
+        """
+        Execute a SQL query, see 'MySQL_operation.execute_query'. The "batches"
+        mode is served by 'iter_query'.
+        """
+        if result == "batches":
+            return self.iter_query(query, batch_size)
+        return await self._run(
+            self.operator.execute_query, query, result, max_rows, batch_size
+        )
+
+    async def iter_query(self, query, batch_size=10000):
+        """
+        Asynchronous iterator over the rows of a query, in lists of at most
+        'batch_size' tuples. Every batch is fetched on the thread pool.
+
+        Example Usage:
+        ```python
+        async for rows in mysql_handler.iter_query("SELECT * FROM events"):
+            ...
+        ```
+        """
+        batches = self.operator.iter_query(query, batch_size)
+        try:
+            while True:
+                rows = await self._run(next, batches, None)
+                if rows is None:
+                    break
+                yield rows
+        finally:
+            await self._run(batches.close)
+
+    async def insert_data(self, table_name, values, db_name="", **kwargs):
+        """
+        Insert data into a table, see 'MySQL_operation.insert_data'.
+        """
+        return await self._run(
+            self.operator.insert_data, table_name, values, db_name, **kwargs
+        )
+
+    async def bulk_insert(self, table_name, filepath, db_name="", **kwargs):
+        """
+        Insert a CSV, Parquet or Arrow file into a table, see 'MySQL_operation.bulk_insert'.
+        """
+        return await self._run(
+            self.operator.bulk_insert, table_name, filepath, db_name, **kwargs
+        )
+
+    async def load_data_infile(self, table_name, source, db_name="", **kwargs):
+        """
+        Bulk load a file or a DataFrame, see 'MySQL_operation.load_data_infile'.
+        """
+        return await self._run(
+            self.operator.load_data_infile, table_name, source, db_name, **kwargs
+        )
+
+    async def save_data(self, table_name, db_name="", **kwargs):
+        """
+        Save a table to a file, see 'MySQL_operation.save_data'.
+        """
+        return await self._run(self.operator.save_data, table_name, db_name, **kwargs)
+
+    async def close(self):
+        """
+        Close the pool of connections and shut down the thread pool.
+        """
+        if self._executor is None:
+            termcolor.cprint(
+                "MySQL connection is not active, may be connection is already closed.",
+                "magenta",
+                attrs=["bold"],
+                end=" ",
+            )
+            return
+        await self._run(self.operator.close_connection)
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        self._semaphore = None
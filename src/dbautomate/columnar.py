@@ -0,0 +1,294 @@
+"""
+Parquet and Arrow IPC files for the operators.
+
+'pyarrow' is an optional dependency (pip install dbautomate[columnar]), it is
+only imported when a Parquet or Arrow file is read or written.
+"""
+import os
+import json
+
+COLUMNAR_FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+
+def import_pyarrow():
+    """
+    Import and return the 'pyarrow' module.
+
+    Raises:
+    - ImportError: If 'pyarrow' is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet and Arrow files need 'pyarrow', install it with 'pip install pyarrow'."
+        ) from e
+    return pyarrow
+
+
+def columnar_format(path):
+    """
+    Return 'parquet' or 'arrow' from the extension of 'path', or None for other files.
+    """
+    lower = str(path).lower()
+    for extension, file_format in COLUMNAR_FORMATS.items():
+        if lower.endswith(extension):
+            return file_format
+    return None
+
+
+class ColumnarWriter:
+    """
+    Write batches of rows to a Parquet file (one row group per batch) or an
+    Arrow IPC file (one record batch per batch).
+
+    The columns and their types are fixed before the first row group is
+    written: they are given by 'schema' (a pyarrow schema, e.g. from
+    'widen_schema' over a first pass on the data), or taken from the first
+    batch. In the second case decimal columns get the largest precision, so
+    that longer values of the next batches fit, and columns that are all null
+    get their type from 'null_types' (a dict of column name to a pyarrow type
+    alias such as 'int64') or string. A column that mixes types in one batch
+    is stored as string.
+
+    Later batches are cast to the schema, a string column takes any value.
+    The rows already written are never rewritten: a value that does not fit
+    the type of its column raises ValueError, and so does a column that is
+    not in the schema.
+
+    Used as a context manager, the file is deleted if the block raises, so a
+    failed export does not leave a truncated file.
+
+    Example Usage:
+    ```python
+    with ColumnarWriter("out.parquet", "parquet", ["id", "name"]) as writer:
+        writer.write_rows([(1, "a"), (2, "b")])
+    ```
+    """
+
+    def __init__(self, path, file_format, column_names, null_types=None, schema=None):
+        self.pa = import_pyarrow()
+        self.path = path
+        self.file_format = file_format
+        self.column_names = list(schema.names if schema is not None else column_names)
+        self.null_types = null_types or {}
+        self.schema = schema
+        self._writer = None
+        self._sink = None
+
+    def write_rows(self, rows):
+        """
+        Write a list of tuples, in the order of 'column_names'.
+        """
+        arrays = [list(column) for column in zip(*rows)] if rows else []
+        if not arrays:
+            arrays = [[] for _ in self.column_names]
+        self._write(column_table(dict(zip(self.column_names, arrays))))
+
+    def write_records(self, records):
+        """
+        Write a list of dicts; keys missing from a record are written as null.
+
+        Raises:
+        - ValueError: If a record has a key that is not a column.
+        """
+        known = set(self.column_names)
+        unknown = list(dict.fromkeys(key for record in records for key in record if key not in known))
+        if unknown:
+            raise ValueError(f"Fields {unknown} are not columns of the file {self.column_names}")
+        arrays = {
+            name: [record.get(name) for record in records] for name in self.column_names
+        }
+        self._write(column_table(arrays))
+
+    def _write(self, table):
+        pa = self.pa
+        if self._writer is None:
+            if self.schema is None:
+                self.schema = pa.schema([self._first_field(field) for field in table.schema])
+            self._open()
+        table = cast_table(table, self.schema)
+        if self.file_format == "parquet":
+            self._writer.write_table(table)
+        else:
+            for batch in table.to_batches():
+                self._writer.write_batch(batch)
+
+    def _first_field(self, field):
+        """
+        Return the field of the file for a column of the first batch.
+        """
+        pa = self.pa
+        if pa.types.is_null(field.type):
+            return pa.field(field.name, pa.type_for_alias(self.null_types.get(field.name, "string")))
+        if pa.types.is_decimal(field.type):
+            # Room for the longer values of the next batches
+            return pa.field(field.name, pa.decimal128(38, min(field.type.scale, 38)))
+        return field
+
+    def _open(self):
+        pa = self.pa
+        if self.file_format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(self.path, self.schema)
+        else:
+            self._sink = pa.OSFile(self.path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+
+    def _close_writer(self):
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def close(self):
+        if self._writer is None:
+            # Nothing was written, still create a file with the columns
+            self._write(self.pa.table({name: [] for name in self.column_names}))
+        self._close_writer()
+
+    def abort(self):
+        """
+        Close the file and delete it.
+        """
+        if self._writer is not None:
+            try:
+                self._close_writer()
+            except Exception:
+                pass
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def column_table(arrays):
+    """
+    Build a pyarrow table from a dict of column name to list of values; a
+    column that mixes types is stored as string.
+    """
+    pa = import_pyarrow()
+    columns = {}
+    for name, values in arrays.items():
+        try:
+            columns[name] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed types in the batch
+            columns[name] = pa.array([string_value(value) for value in values], pa.string())
+    return pa.table(columns)
+
+
+def widen_schema(schema, other):
+    """
+    Return a schema that holds the values of both schemas: the types of the
+    common columns are widened (null to int64, int64 to float64, ...) or
+    become string, and the columns only in 'other' are added at the end.
+    'schema' can be None.
+
+    Example Usage:
+    ```python
+    schema = None
+    for records in batches:
+        schema = widen_schema(schema, column_table(records).schema)
+    ```
+    """
+    pa = import_pyarrow()
+    if schema is None:
+        return other
+    fields = []
+    for field in schema:
+        if field.name not in other.names:
+            fields.append(field)
+            continue
+        new = other.field(field.name)
+        if pa.types.is_null(new.type) or new.type == field.type:
+            fields.append(field)
+        elif pa.types.is_null(field.type):
+            fields.append(new)
+        else:
+            try:
+                fields.append(
+                    pa.unify_schemas(
+                        [pa.schema([field]), pa.schema([new])], promote_options="permissive"
+                    ).field(field.name)
+                )
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError):
+                fields.append(pa.field(field.name, pa.string()))
+    fields.extend(field for field in other if field.name not in schema.names)
+    return pa.schema(fields)
+
+
+def string_value(value):
+    """
+    Return the string stored for a value of a column that falls back to string:
+    nested documents and arrays as JSON, other values with 'str'.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def cast_table(table, schema):
+    """
+    Cast a table to 'schema'; columns that become strings and can not be
+    cast by pyarrow (e.g. nested types) are converted value by value, and
+    columns missing from the table are null.
+
+    Raises:
+    - ValueError: If a column does not fit its type in 'schema'.
+    """
+    pa = import_pyarrow()
+    columns = []
+    for field in schema:
+        if field.name not in table.schema.names:
+            columns.append(pa.nulls(table.num_rows, field.type))
+            continue
+        column = table.column(field.name)
+        try:
+            column = column.cast(field.type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            if not pa.types.is_string(field.type):
+                raise ValueError(
+                    f"Column '{field.name}' ({column.type}) does not fit the type {field.type} of the file: {e}"
+                ) from e
+            column = pa.array([string_value(value) for value in column.to_pylist()], pa.string())
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def iter_record_batches(path, batch_size, file_format=None):
+    """
+    Yield 'pyarrow.RecordBatch' objects of at most 'batch_size' rows from a
+    Parquet or Arrow IPC file, without loading the whole file. The format is
+    taken from the extension of 'path' unless 'file_format' is given.
+    """
+    pa = import_pyarrow()
+    if (file_format or columnar_format(path)) == "parquet":
+        parquet_file = pa.parquet.ParquetFile(path)
+        yield from parquet_file.iter_batches(batch_size=batch_size)
+        return
+    with pa.memory_map(path, "r") as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def iter_row_batches(path, batch_size):
+    """
+    Yield (column_names, list of row tuples) for every batch of a Parquet or Arrow file.
+    """
+    for batch in iter_record_batches(path, batch_size):
+        columns = [column.to_pylist() for column in batch.columns]
+        yield batch.schema.names, list(zip(*columns))
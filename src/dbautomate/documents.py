@@ -0,0 +1,503 @@
+"""
+Readers and converters for MongoDB documents.
+"""
+import os
+import csv
+import json
+import uuid
+import base64
+import decimal
+import datetime
+from itertools import islice
+from bson.objectid import ObjectId
+from bson.decimal128 import Decimal128
+from .columnar import ColumnarWriter, column_table, widen_schema
+
+JSON_WHITESPACE = " \t\r\n"
+# Characters at the end of the buffer where an element may still be cut,
+# e.g. a number, a literal or a \uXXXX\uXXXX escape
+JSON_LOOKAHEAD = 16
+
+
+def batched(iterable, size):
+    """
+    Yield lists of at most 'size' items from 'iterable'.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_json_lines(path, object_hook=None):
+    """
+    Yield the documents of a JSON Lines file, one per non-empty line.
+    'object_hook' is passed to 'json.loads', e.g. 'bson.json_util.object_hook'
+    to read MongoDB Extended JSON.
+    """
+    with open(path, "r", encoding="utf-8") as json_file:
+        for line in json_file:
+            if line.strip():
+                yield json.loads(line, object_hook=object_hook)
+
+
+def iter_json_array(path, chunk_size=1 << 16, object_hook=None):
+    """
+    Yield the elements of a JSON array file one by one, reading the file in
+    chunks of 'chunk_size' characters. A file holding a single JSON object
+    yields that object. 'object_hook' is passed to the JSON decoder.
+
+    Raises:
+    - ValueError: If the file is not valid JSON.
+    """
+    decoder = json.JSONDecoder(object_hook=object_hook)
+    with open(path, "r", encoding="utf-8") as json_file:
+        # Skip the leading whitespace, however many chunks it takes
+        buffer = json_file.read(chunk_size)
+        while buffer and not buffer.strip(JSON_WHITESPACE):
+            buffer = json_file.read(chunk_size)
+        position = len(buffer) - len(buffer.lstrip(JSON_WHITESPACE))
+        if buffer[position : position + 1] != "[":
+            value = json.loads(buffer + json_file.read(), object_hook=object_hook)
+            if isinstance(value, list):
+                yield from value
+            else:
+                yield value
+            return
+        position += 1
+        eof = False
+        # After '[' a value or ']', after ',' a value, after a value ',' or ']'
+        expect_value = True
+        first = True
+
+        while True:
+            # Skip the whitespace, reading more of the file when needed
+            while position < len(buffer) and buffer[position] in JSON_WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                more = json_file.read(chunk_size)
+                if not more:
+                    raise ValueError("Unexpected end of the JSON array")
+                buffer, position = buffer[position:] + more, 0
+                continue
+
+            character = buffer[position]
+            if character == "]" and (not expect_value or first):
+                expect_end(json_file, buffer[position + 1 :], chunk_size)
+                return
+            if not expect_value:
+                if character != ",":
+                    raise ValueError(f"Expecting ',' or ']' in the JSON array, found {character!r}")
+                position += 1
+                expect_value = True
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                error = None
+            except json.JSONDecodeError as e:
+                end, error = None, e
+                # An error far from the end of the buffer is not due to a cut
+                # element (an unterminated string is reported at its start)
+                if eof or (
+                    e.pos < len(buffer) - JSON_LOOKAHEAD and not e.msg.startswith("Unterminated string")
+                ):
+                    raise
+            # The element may be cut at the end of the buffer (a number or a
+            # literal can even look complete): read more, at least as much as
+            # is kept, so that a long element is parsed a bounded number of times
+            if error is not None or (end > len(buffer) - JSON_LOOKAHEAD and not eof):
+                more = json_file.read(max(chunk_size, len(buffer) - position))
+                if not more:
+                    eof = True
+                    continue
+                buffer, position = buffer[position:] + more, 0
+                continue
+            yield value
+            position = end
+            expect_value = first = False
+
+
+def expect_end(json_file, rest, chunk_size):
+    """
+    Check that only whitespace follows the end of a JSON array.
+
+    Raises:
+    - ValueError: If there is data after the array.
+    """
+    while True:
+        if rest.strip(JSON_WHITESPACE):
+            raise ValueError("Extra data after the end of the JSON array")
+        rest = json_file.read(chunk_size)
+        if not rest:
+            return
+
+
+def column_values(series):
+    """
+    Convert a pandas Series to a list of BSON friendly Python values:
+    NaN/NaT/NA become None, datetimes become 'datetime.datetime', numpy
+    integers and floats become 'int' and 'float', 'decimal.Decimal' becomes
+    'Decimal128' and timedeltas become seconds.
+    """
+    kind = series.dtype.kind
+    if kind == "M":
+        values = list(series.array.to_pydatetime())
+    elif kind == "m":
+        values = series.dt.total_seconds().tolist()
+    else:
+        values = series.tolist()
+        if kind == "O":
+            values = [
+                Decimal128(value) if isinstance(value, decimal.Decimal) else value
+                for value in values
+            ]
+    missing = series.isna().to_numpy()
+    if missing.any():
+        values = [None if is_missing else value for value, is_missing in zip(values, missing)]
+    return values
+
+
+def iter_dataframe_documents(dataframe, batch_size):
+    """
+    Yield lists of at most 'batch_size' documents (dicts) built column by
+    column from a DataFrame, see 'column_values' for the value conversion.
+    """
+    names = [str(name) for name in dataframe.columns]
+    for offset in range(0, len(dataframe), batch_size):
+        part = dataframe.iloc[offset : offset + batch_size]
+        columns = [column_values(part.iloc[:, i]) for i in range(part.shape[1])]
+        yield [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def dataframe_to_documents(dataframe):
+    """
+    Convert a whole DataFrame to a list of documents (dicts).
+
+    Example Usage:
+    ```python
+    documents = dataframe_to_documents(pd.read_csv("data.csv"))
+    ```
+    """
+    documents = []
+    for batch in iter_dataframe_documents(dataframe, max(len(dataframe), 1)):
+        documents.extend(batch)
+    return documents
+
+
+def documents_to_columns(documents, columns=None, offset=0):
+    """
+    Append a batch of documents to a dict of column lists, one list per field.
+
+    Fields that are new in the batch are back-filled with None for the
+    'offset' rows already added, and fields missing from a document get None.
+
+    Returns:
+    - dict: The column lists, e.g. to build a DataFrame with 'pd.DataFrame(columns)'.
+    """
+    columns = {} if columns is None else columns
+    keys = dict.fromkeys(key for document in documents for key in document)
+    for key in keys:
+        if key not in columns:
+            columns[key] = [None] * offset
+        columns[key].extend(document.get(key) for document in documents)
+    for key, column in columns.items():
+        if key not in keys:
+            column.extend([None] * len(documents))
+    return columns
+
+
+def flatten_document(document, separator="_", prefix=""):
+    """
+    Flatten the nested documents of a document into one level, e.g.
+    {'a': {'b': 1}} becomes {'a_b': 1}. The arrays are returned apart.
+
+    Returns:
+    - tuple: (dict of the flattened fields, dict of the flattened path of every array to the array).
+
+    Raises:
+    - ValueError: If two fields get the same name, e.g. {'a': {'b': 1}, 'a_b': 2}.
+    """
+    fields, arrays = {}, {}
+    for key, value in document.items():
+        name = f"{prefix}{separator}{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            nested_fields, nested_arrays = flatten_document(value, separator, name)
+        elif isinstance(value, list):
+            nested_fields, nested_arrays = {}, {name: value}
+        else:
+            nested_fields, nested_arrays = {name: value}, {}
+        same = (fields.keys() | arrays.keys()) & (nested_fields.keys() | nested_arrays.keys())
+        if same:
+            raise ValueError(f"Fields with the same name once flattened: {sorted(same)}")
+        fields.update(nested_fields)
+        arrays.update(nested_arrays)
+    return fields, arrays
+
+
+# Conversion of the values read from MySQL, Parquet or Arrow that BSON can
+# not encode
+BSON_CONVERTERS = {
+    decimal.Decimal: Decimal128,
+    datetime.date: lambda value: datetime.datetime(value.year, value.month, value.day),
+    datetime.time: datetime.time.isoformat,
+    datetime.timedelta: datetime.timedelta.total_seconds,
+    set: sorted,
+    bytearray: bytes,
+}
+
+
+def bson_documents(documents):
+    """
+    Convert in place the values of a list of documents (dicts of Python values,
+    e.g. MySQL rows or Parquet records) that BSON can not encode, nested
+    documents and arrays included: 'Decimal' becomes 'Decimal128', 'date' a
+    'datetime' at midnight, 'time' an ISO 8601 string, 'timedelta' seconds and
+    'set' a sorted list.
+
+    Returns:
+    - list: The same documents.
+    """
+    for document in documents:
+        for key, value in document.items():
+            converter = BSON_CONVERTERS.get(type(value))
+            if converter is not None:
+                document[key] = converter(value)
+            elif isinstance(value, (dict, list)):
+                document[key] = bson_value(value)
+    return documents
+
+
+def bson_value(value):
+    """
+    Convert one value like 'bson_documents', recursively.
+    """
+    converter = BSON_CONVERTERS.get(type(value))
+    if converter is not None:
+        value = converter(value)
+    if isinstance(value, dict):
+        bson_documents([value])
+    elif isinstance(value, list):
+        value = [bson_value(item) for item in value]
+    return value
+
+
+# Conversion of the BSON and Python types that 'json' can not encode,
+# looked up by exact type first
+JSON_CONVERTERS = {
+    ObjectId: str,
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    Decimal128: str,
+    decimal.Decimal: str,
+    uuid.UUID: str,
+    bytes: lambda value: base64.b64encode(value).decode("ascii"),
+}
+
+
+def json_default(value):
+    """
+    'default' function of the JSON encoder: ObjectId, Decimal128, Decimal and
+    UUID become strings, datetimes ISO 8601 strings and bytes base64 strings.
+
+    Raises:
+    - TypeError: If the value has no JSON conversion.
+    """
+    converter = JSON_CONVERTERS.get(type(value))
+    if converter is None:
+        for kind, candidate in JSON_CONVERTERS.items():
+            if isinstance(value, kind):
+                converter = candidate
+                break
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return converter(value)
+
+
+# Shared encoder, so the options are not set up again for every document
+DOCUMENT_ENCODER = json.JSONEncoder(
+    default=json_default, ensure_ascii=False, separators=(",", ":")
+)
+
+
+class DocumentWriter:
+    """
+    Write batches of documents to a file as they are read from a cursor.
+
+    Formats:
+    - "jsonl": one JSON document per line.
+    - "json": a JSON array, one document per line.
+    - "csv": nested documents and arrays are written as JSON.
+    - "parquet" / "arrow": see 'ColumnarWriter', ObjectIds are written as strings.
+
+    The columns of the CSV, Parquet and Arrow files are fixed before the
+    first batch is written: they are 'fields' (or the columns of 'schema', a
+    pyarrow schema for Parquet and Arrow files), or else the fields of the
+    first batch. The rows written are never rewritten, so a document with a
+    field that is not a column raises ValueError. 'scan_columns' makes a
+    first pass over the documents to find all the columns and their types.
+
+    Example Usage:
+    ```python
+    with DocumentWriter("out.jsonl", "jsonl") as writer:
+        for documents in batched(collection.find(), 1000):
+            writer.write(documents)
+    ```
+    """
+
+    FORMATS = ("json", "jsonl", "csv", "parquet", "arrow")
+
+    def __init__(self, path, file_format, fields=None, schema=None):
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Unknown file format '{file_format}', choose one of {self.FORMATS}")
+        self.path = path
+        self.file_format = file_format
+        self.fields = list(schema.names if schema is not None else fields or [])
+        self.schema = schema
+        self.documents = 0
+        self._file = None
+        self._writer = None
+        if file_format in ("json", "jsonl"):
+            self._file = open(path, "w", encoding="utf-8")
+        elif file_format == "csv":
+            self._file = open(path, "w", newline="", encoding="utf-8")
+        if file_format == "json":
+            self._file.write("[")
+
+    def write(self, documents):
+        if self.file_format == "jsonl":
+            encode = DOCUMENT_ENCODER.encode
+            self._file.write("".join(encode(document) + "\n" for document in documents))
+        elif self.file_format == "json":
+            encode = DOCUMENT_ENCODER.encode
+            separator = "\n" if self.documents == 0 else ",\n"
+            self._file.write(separator + ",\n".join(encode(document) for document in documents))
+        elif self.file_format == "csv":
+            self._check_fields(documents)
+            if self._writer is None:
+                self._writer = csv.DictWriter(self._file, self.fields)
+                self._writer.writeheader()
+            self._writer.writerows(
+                {key: csv_value(value) for key, value in document.items()}
+                for document in documents
+            )
+        else:
+            self._check_fields(documents)
+            if self._writer is None:
+                self._writer = ColumnarWriter(self.path, self.file_format, self.fields, schema=self.schema)
+            self._writer.write_records(
+                [
+                    {key: columnar_value(value) for key, value in document.items()}
+                    for document in documents
+                ]
+            )
+        if self._file is not None:
+            self._file.flush()
+        self.documents += len(documents)
+
+    def _check_fields(self, documents):
+        """
+        Take the columns from the first batch if they are not known yet, and
+        check that the documents have no other field.
+
+        Raises:
+        - ValueError: If a document has a field that is not a column.
+        """
+        if not self.fields:
+            self.fields = field_names(documents)
+            return
+        known = set(self.fields)
+        unknown = [name for name in field_names(documents) if name not in known]
+        if unknown:
+            raise ValueError(
+                f"Fields {unknown} are not columns of the file, pass all the columns in 'fields'"
+            )
+
+    def close(self):
+        if self.file_format == "json":
+            self._file.write("\n]\n")
+        elif self.file_format == "csv" and self._writer is None and self.fields:
+            csv.writer(self._file).writerow(self.fields)
+        if self._file is not None:
+            self._file.close()
+        elif self._writer is None:
+            # No document, still create the file
+            ColumnarWriter(self.path, self.file_format, self.fields, schema=self.schema).close()
+        else:
+            self._writer.close()
+
+    def abort(self):
+        """
+        Close the file and delete it, e.g. when the export fails.
+        """
+        if self._file is not None:
+            self._file.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        elif self._writer is not None:
+            self._writer.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def scan_columns(batches, file_format, fields=None):
+    """
+    First pass of an export over batches of documents: return the columns of
+    a 'DocumentWriter', 'fields' first and then the other fields in order of
+    appearance, and for Parquet and Arrow files a pyarrow schema wide enough
+    for all the values (None for the other formats). Only the field names
+    and the types are kept, the memory does not grow with the documents.
+
+    Example Usage:
+    ```python
+    fields, schema = scan_columns(batched(collection.find(), 1000), "parquet")
+    with DocumentWriter("out.parquet", "parquet", fields, schema) as writer:
+        ...
+    ```
+    """
+    columns = list(fields or [])
+    known = set(columns)
+    schema = None
+    for documents in batches:
+        new_fields = [name for name in field_names(documents) if name not in known]
+        columns.extend(new_fields)
+        known.update(new_fields)
+        if file_format in ("parquet", "arrow"):
+            arrays = {
+                name: [columnar_value(document.get(name)) for document in documents]
+                for name in columns
+            }
+            schema = widen_schema(schema, column_table(arrays).schema)
+    return columns, schema
+
+
+def field_names(documents):
+    """
+    Return the fields of a batch of documents, in order of appearance.
+    """
+    return list(dict.fromkeys(key for document in documents for key in document))
+
+
+def csv_value(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (dict, list)):
+        return DOCUMENT_ENCODER.encode(value)
+    return json_default(value)
+
+
+def columnar_value(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return value.to_decimal()
+    return value
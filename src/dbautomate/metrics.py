@@ -0,0 +1,291 @@
+"""
+Metrics and tracing hooks of the operators.
+
+A hook is any callable taking a 'MetricEvent'. It is registered on an
+operator with 'add_metrics_hook' and called after every public method
+("call" events), every batch of the streaming methods ("batch" events) and
+every connection retry ("retry" events). 'Metrics' is a hook that
+aggregates the events and exports them as Prometheus text or JSON.
+
+Without hooks, the instrumented methods only check that the list of hooks is
+empty before running as before.
+
+Example Usage:
+```python
+from dbautomate.metrics import Metrics
+
+metrics = Metrics()
+mysql_handler.add_metrics_hook(metrics)
+mongo.add_metrics_hook(metrics)
+mongo.add_metrics_hook(lambda event: print(event) if event.elapsed > 1 else None)
+...
+print(metrics.to_prometheus())
+```
+"""
+import os
+import json
+import time
+import functools
+import threading
+import termcolor
+from dataclasses import dataclass, field, asdict
+from .results import OperationResult
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+# Instrumented calls of the current thread, innermost last: [operator, failed]
+_calls = threading.local()
+
+
+@dataclass
+class MetricEvent:
+    """
+    One measured call, batch or retry of an operator.
+
+    Attributes:
+    - operator (str): "mysql" or "mongo".
+    - operation (str): Name of the method.
+    - kind (str): "call", "batch" or "retry".
+    - elapsed (float): Wall time in seconds.
+    - rows (int): Rows or documents handled.
+    - bytes (int): Size of the file read or written by the call, if any.
+    - batches (int): Batches of the call (1 for a batch event).
+    - errors (int): Failed rows/documents or failed call (1).
+    - timestamp (float): End time, in seconds since the epoch.
+    """
+
+    operator: str
+    operation: str
+    kind: str = "call"
+    elapsed: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    batches: int = 0
+    errors: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+
+def emit(operator, event):
+    """
+    Send an event to the hooks of an operator. A failing hook is reported and
+    does not stop the operation.
+    """
+    for hook in list(operator.metric_hooks):
+        try:
+            hook(event)
+        except Exception as e:
+            termcolor.cprint("Error in metrics hook:", "red", attrs=["bold"], end=" ")
+            print(e)
+
+
+def record_batch(operator, operation, rows, elapsed, errors=0):
+    """
+    Emit a "batch" event, if the operator has hooks.
+    """
+    if operator.metric_hooks:
+        emit(
+            operator,
+            MetricEvent(
+                operator.metrics_name, operation, "batch", elapsed, rows, batches=1, errors=errors
+            ),
+        )
+
+
+def record_retry(operator, operation, error=True):
+    """
+    Emit a "retry" event, if the operator has hooks.
+    """
+    if operator.metric_hooks:
+        emit(operator, MetricEvent(operator.metrics_name, operation, "retry", errors=int(error)))
+
+
+def record_error(operator):
+    """
+    Mark the calls of an operator running in this thread as failed, e.g. from
+    the except block of a method that reports the error and returns None, so
+    that its "call" event counts the error. A call made by another method of
+    the operator (e.g. 'bulk_insert' calling 'stream_insert') fails both.
+    """
+    for call in getattr(_calls, "stack", ()):
+        if call[0] is operator:
+            call[1] = True
+
+
+def instrumented(method):
+    """
+    Decorator for the public methods of the operators: emit a "call" event
+    with the latency, rows, bytes, batches and errors of every call.
+
+    The counts are taken from a returned 'OperationResult' (the size of its
+    'path' is the bytes), or the length of a returned list or DataFrame. A
+    raised exception counts as an error, and so does a call marked with
+    'record_error'.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.metric_hooks:
+            return method(self, *args, **kwargs)
+        calls = _calls.__dict__.setdefault("stack", [])
+        call = [self, False]
+        calls.append(call)
+        start = time.perf_counter()
+        try:
+            value = method(self, *args, **kwargs)
+        except BaseException:
+            emit(
+                self,
+                MetricEvent(
+                    self.metrics_name, name, elapsed=time.perf_counter() - start, errors=1
+                ),
+            )
+            raise
+        finally:
+            calls.pop()
+        event = MetricEvent(
+            self.metrics_name, name, elapsed=time.perf_counter() - start, errors=int(call[1])
+        )
+        if isinstance(value, OperationResult):
+            event.rows = value.rows
+            event.batches = value.batches
+            event.errors = max(event.errors, value.details.get("failed", len(value.errors)))
+            if value.path and os.path.isfile(value.path):
+                event.bytes = os.path.getsize(value.path)
+        elif hasattr(value, "__len__") and not isinstance(value, (str, bytes, dict, tuple)):
+            event.rows = len(value)
+        emit(self, event)
+        return value
+
+    return wrapper
+
+
+class Metrics:
+    """
+    Thread-safe aggregation of the events of one or more operators, by
+    operator, operation and kind: count, errors, rows, bytes, batches, total
+    seconds and a latency histogram ('LATENCY_BUCKETS').
+
+    Example Usage:
+    ```python
+    metrics = Metrics()
+    mysql_handler.add_metrics_hook(metrics)
+    mysql_handler.bulk_insert("events", "events.csv", chunksize=10000)
+    print(metrics.to_json(indent=2))
+    ```
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        key = (event.operator, event.operation, event.kind)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "count": 0,
+                    "errors": 0,
+                    "rows": 0,
+                    "bytes": 0,
+                    "batches": 0,
+                    "seconds": 0.0,
+                    "buckets": [0] * len(self.buckets),
+                }
+            series["count"] += 1
+            series["errors"] += event.errors
+            series["rows"] += event.rows
+            series["bytes"] += event.bytes
+            series["batches"] += event.batches
+            series["seconds"] += event.elapsed
+            for i, bound in enumerate(self.buckets):
+                if event.elapsed <= bound:
+                    series["buckets"][i] += 1
+                    break
+
+    def snapshot(self):
+        """
+        Return the aggregated series as a list of dicts.
+        """
+        with self._lock:
+            return [
+                dict(
+                    series,
+                    operator=key[0],
+                    operation=key[1],
+                    kind=key[2],
+                    buckets=list(series["buckets"]),
+                )
+                for key, series in sorted(self._series.items())
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def to_json(self, indent=None):
+        """
+        Export the series as JSON, with the bucket bounds.
+        """
+        return json.dumps(
+            {"buckets": list(self.buckets), "series": self.snapshot()}, indent=indent
+        )
+
+    def to_prometheus(self, prefix="dbautomate"):
+        """
+        Export the series in the Prometheus text exposition format: counters
+        '<prefix>_<kind>s_total', '<prefix>_<kind>_errors_total', '_rows_total',
+        '_bytes_total', '_batches_total' and the histogram '<prefix>_<kind>_seconds',
+        labelled by operator and operation.
+        """
+        lines = []
+        series_list = self.snapshot()
+        for kind in ("call", "batch", "retry"):
+            selected = [series for series in series_list if series["kind"] == kind]
+            if not selected:
+                continue
+            counters = [
+                (f"{prefix}_{kind}s_total", "count", f"Number of {kind}s."),
+                (f"{prefix}_{kind}_errors_total", "errors", f"Errors of the {kind}s."),
+            ]
+            if kind != "retry":
+                counters += [
+                    (f"{prefix}_{kind}_rows_total", "rows", f"Rows or documents of the {kind}s."),
+                    (f"{prefix}_{kind}_bytes_total", "bytes", f"Bytes of the files of the {kind}s."),
+                    (f"{prefix}_{kind}_batches_total", "batches", f"Batches of the {kind}s."),
+                ]
+            for name, field_name, description in counters:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} counter")
+                for series in selected:
+                    lines.append(f"{name}{{{self._labels(series)}}} {series[field_name]}")
+            if kind == "retry":
+                continue
+
+            name = f"{prefix}_{kind}_seconds"
+            lines.append(f"# HELP {name} Latency of the {kind}s in seconds.")
+            lines.append(f"# TYPE {name} histogram")
+            for series in selected:
+                labels = self._labels(series)
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {series["count"]}')
+                lines.append(f"{name}_sum{{{labels}}} {series['seconds']}")
+                lines.append(f"{name}_count{{{labels}}} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(series):
+        return f'operator="{series["operator"]}",operation="{series["operation"]}"'
+
+
+def event_dict(event):
+    """
+    Return a 'MetricEvent' as a dict, e.g. for a JSON log hook.
+    """
+    return asdict(event)
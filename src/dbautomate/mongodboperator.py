@@ -1,24 +1,72 @@
 import os
 import json
+import time
+import threading
 import pymongo
 import termcolor
-import pandas as pd
-from bson import ObjectId
-from bson import SON, raw_bson
+from bson import SON, raw_bson, json_util
 from pymongo import MongoClient
 from pymongo.database import Database
 from pymongo.collection import Collection
 from collections.abc import MutableMapping
 from pymongo.mongo_client import MongoClient
+from pymongo.errors import BulkWriteError
+from pymongo import InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne, DeleteMany
+from concurrent.futures import ThreadPoolExecutor
+from .results import OperationResult
+from .metrics import instrumented, record_batch, record_error
+from .columnar import columnar_format, iter_record_batches
+from .documents import (
+    DocumentWriter,
+    batched,
+    scan_columns,
+    bson_documents,
+    dataframe_to_documents,
+    documents_to_columns,
+    iter_dataframe_documents,
+    iter_json_array,
+    iter_json_lines,
+)
+
+# Number of failed documents kept in the errors of a streamed insert
+MAX_REPORTED_ERRORS = 100
+
+# Requests accepted by 'bulk_mutate' as they are
+WRITE_REQUESTS = (InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne, DeleteMany)
+
+# Query operators that select a range of values; the other operators and
+# plain values are equality matches for the index advisor
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$regex", "$exists", "$not"}
+
+# Counters of a bulk write result, by their name in 'BulkWriteError.details'
+BULK_COUNTS = {
+    "nInserted": "inserted",
+    "nMatched": "matched",
+    "nModified": "modified",
+    "nRemoved": "deleted",
+    "nUpserted": "upserted",
+}
 
 
 class Mongo_operation:
-    def __init__(self):
+    metrics_name = "mongo"
+
+    def __init__(self, interactive=True):
+        """
+        Args:
+        interactive (bool, optional): Ask with 'input()' for the options that are not passed
+                                      to a method (default is True). Use False for scripts and batch jobs.
+        """
+        self.interactive = interactive
         self.uri = None
         self.client = None
         self.database = None
         self.collection = None
         self.is_closed = True
+        # Filters used by the queries, updates and deletes, see 'index_advice'
+        self.query_shapes = {}
+        self._shapes_lock = threading.Lock()
+        self.metric_hooks = []
 
     def __str__(self):
         termcolor.cprint("MongoDB_CRUD Object -", "dark_grey", attrs=["bold"], end="\n")
@@ -47,6 +95,33 @@ class Mongo_operation:
         )
         return ""
 
+    def add_metrics_hook(self, hook):
+        """
+        Register a metrics hook: a callable that receives a 'MetricEvent' after every
+        public method and every batch of the streaming methods.
+
+        Args:
+        hook (callable): E.g. a 'dbautomate.metrics.Metrics' instance, or a function.
+
+        Example Usage:
+        ```python
+        from dbautomate.metrics import Metrics
+
+        metrics = Metrics()
+        my_object.add_metrics_hook(metrics)
+        print(metrics.to_prometheus())
+        ```
+        """
+        self.metric_hooks.append(hook)
+
+    def remove_metrics_hook(self, hook):
+        """
+        Unregister a metrics hook added with 'add_metrics_hook'.
+        """
+        if hook in self.metric_hooks:
+            self.metric_hooks.remove(hook)
+
+    @instrumented
     def get_mongo_client(self, uri):
         """
         Establishes a connection to MongoDB using the provided URI.
@@ -98,7 +173,9 @@ class Mongo_operation:
             # Exception handling
             termcolor.cprint("Error during connection:", "red", attrs=["bold"], end=" ")
             print(e)
+            record_error(self)
 
+    @instrumented
     def create_database(self, database_name):
         """
         Creates a MongoDB database with the specified name.
@@ -135,7 +212,9 @@ class Mongo_operation:
                 "Error creating the database:", "red", attrs=["bold"], end=" "
             )
             print(e)
+            record_error(self)
 
+    @instrumented
     def create_collection(self, collection_name):
         """
         Creates a MongoDB collection with the specified name within the current database.
@@ -173,7 +252,9 @@ class Mongo_operation:
                 "Error creating the collection:", "red", attrs=["bold"], end=" "
             )
             print(e)
+            record_error(self)
 
+    @instrumented
     def insert_data(self, data):
         """
         Inserts data into the MongoDB collection.
@@ -234,14 +315,27 @@ class Mongo_operation:
                 "Error inserting the entry:", "red", attrs=["bold"], end=" "
             )
             print(e)
+            record_error(self)
 
-    def bulk_insert(self, datafile, collection_name=""):
+    @instrumented
+    def bulk_insert(self, datafile, collection_name="", batch_size=None, workers=1):
         """
-        Bulk insert data from a CSV, Excel, or JSON file into a MongoDB collection.
+        Bulk insert data from a CSV, Excel, JSON, Parquet or Arrow IPC file into a MongoDB collection.
+
+        With 'batch_size' the file is streamed instead (see 'stream_insert'):
+        documents are read and inserted 'batch_size' at a time and a bad
+        document does not stop the load. Parquet ('.parquet') and Arrow
+        ('.arrow', '.feather') files are always streamed, 10000 rows at a time
+        unless 'batch_size' is given ('pyarrow' is needed).
 
         Args:
-        - datafile (str): Path to the data file (CSV, Excel, or JSON).
+        - datafile (str): Path to the data file (CSV, Excel, JSON, JSON Lines, Parquet or Arrow).
         - collection_name (str, optional): Name of the MongoDB collection. If not provided, the default collection is used.
+        - batch_size (int, optional): Number of documents per 'insert_many' in streaming mode (default is None).
+        - workers (int, optional): Number of threads writing the batches in streaming mode (default is 1).
+
+        Returns:
+        - OperationResult or None: In streaming mode, the inserted documents, batches and errors.
 
         Raises:
         - Exception: If an error occurs during the data insertion process.
@@ -256,12 +350,26 @@ class Mongo_operation:
 
         # If you want to save the data into new collection
         my_object.bulk_insert('path/to/data.csv', 'my_collection')
+
+        # Stream a big file in batches of 5000 documents
+        my_object.bulk_insert('path/to/big.jsonl', batch_size=5000)
         ```
         """
         try:
             self.path = datafile
 
+            # Set the collection
+            if collection_name != "":
+                collection = self.create_collection(collection_name)
+
+            if batch_size is None and columnar_format(self.path) is not None:
+                batch_size = 10000
+            if batch_size is not None:
+                return self.stream_insert(self.path, batch_size, workers)
+
             # Configure the type of the file
+            import pandas as pd
+
             if self.path.endswith(".csv"):
                 dataframe = pd.read_csv(self.path, encoding="utf-8")
 
@@ -273,11 +381,7 @@ class Mongo_operation:
                     datajson = json.load(json_file)
 
             if not self.path.endswith(".json"):
-                datajson = json.loads(dataframe.to_json(orient="records"))
-
-            # Set the collection
-            if collection_name != "":
-                collection = self.create_collection(collection_name)
+                datajson = dataframe_to_documents(dataframe)
 
             # call the function to insert the data
             self.insert_data(datajson)
@@ -286,14 +390,209 @@ class Mongo_operation:
                 "Error in insert the data:", "red", attrs=["bold"], end=" "
             )
             print(e)
+            record_error(self)
 
-    def find_data(self, key_value=""):
+    @instrumented
+    def stream_insert(self, datafile, batch_size=1000, workers=1):
+        """
+        Stream a data file into the current collection, 'batch_size' documents at a time.
+
+        CSV files are read in chunks, JSON Lines files ('.jsonl', '.ndjson')
+        line by line and JSON array files element by element, so only one batch
+        is held in memory. Excel files can not be read in parts, they are read
+        at once and inserted in batches. Every batch is sent with
+        'insert_many(ordered=False)': the documents that fail (e.g. duplicate
+        keys) are reported and the load goes on with the rest. With 'workers'
+        the batches are written concurrently (see 'parallel_insert').
+
+        Args:
+        - datafile (str): Path to the data file (CSV, Excel, JSON, JSON Lines, Parquet or Arrow).
+        - batch_size (int, optional): Number of documents per batch (default is 1000).
+        - workers (int, optional): Number of threads writing batches (default is 1).
+
+        Returns:
+        - OperationResult or None: The inserted documents, the batches, the elapsed time
+          and the errors of the failed documents ('details["failed"]' counts them all).
+
+        Example Usage:
+        ```python
+        result = my_object.stream_insert('path/to/big.jsonl', batch_size=5000)
+        print(result.rows, result.details["failed"], result.rows_per_second)
+        ```
+        """
+        result = self.insert_batches(
+            self.iter_file_batches(datafile, batch_size), workers, operation="stream_insert"
+        )
+        if result is not None:
+            result.path = datafile
+        return result
+
+    @instrumented
+    def parallel_insert(
+        self, documents, batch_size=1000, workers=4, ordered=False, max_pending=None
+    ):
+        """
+        Insert documents into the current collection with several threads.
+
+        The documents are split into batches of 'batch_size' and written with
+        'insert_many' by 'workers' threads sharing the MongoClient (which is
+        thread-safe). At most 'max_pending' batches (default is twice the
+        workers) are read ahead of the writers, so a lazy iterable is consumed
+        only as fast as the server accepts the batches.
+
+        With 'ordered=False' every batch is written unordered and the failing
+        documents are counted without stopping the load. 'ordered=True' keeps
+        the order of the documents and stops at the first error, so the batches
+        are written one after another: the documents after it in the failing
+        batch are counted as 'skipped', and the documents of the later batches
+        are neither read nor counted.
+
+        Args:
+        - documents (iterable): The documents (dicts) to insert, e.g. a list or a generator.
+        - batch_size (int, optional): Number of documents per 'insert_many' (default is 1000).
+        - workers (int, optional): Number of writer threads (default is 4).
+        - ordered (bool, optional): Keep the order and stop at the first error (default is False).
+        - max_pending (int, optional): Maximum number of batches waiting for a writer.
+
+        Returns:
+        - OperationResult or None: 'rows' is the number of inserted documents, 'details' counts
+          the 'failed', 'duplicates' (duplicate key) and 'skipped' documents ('skipped' only
+          covers the batch of an ordered failure).
+
+        Example Usage:
+        ```python
+        result = my_object.parallel_insert(documents, batch_size=5000, workers=8)
+        print(result.rows, result.details["duplicates"], result.rows_per_second)
+        ```
+        """
+        return self.insert_batches(
+            batched(documents, batch_size), workers, ordered, max_pending, "parallel_insert"
+        )
+
+    # Helper function
+    def insert_batches(
+        self, batches, workers=1, ordered=False, max_pending=None, operation="insert_batches"
+    ):
+        """
+        Write an iterable of document batches with 'insert_batch', on 'workers'
+        threads, and collect the counts, errors and progress in an OperationResult.
+        """
+        result = OperationResult(operation)
+        result.details.update({"failed": 0, "duplicates": 0, "skipped": 0})
+        lock = threading.Lock()
+        start = time.perf_counter()
+        if ordered:
+            workers = 1
+
+        def write(batch_no, documents):
+            batch_start = time.perf_counter()
+            try:
+                inserted, errors = self.insert_batch(documents, ordered)
+            except Exception as e:
+                inserted, errors = 0, [(None, None, str(e))] * len(documents)
+            failed = len(errors)
+            record_batch(self, operation, inserted, time.perf_counter() - batch_start, failed)
+            with lock:
+                result.batches += 1
+                result.rows += inserted
+                result.details["failed"] += failed
+                result.details["duplicates"] += sum(1 for error in errors if error[1] == 11000)
+                result.details["skipped"] += len(documents) - inserted - failed
+                for index, _, message in errors[: max(0, MAX_REPORTED_ERRORS - len(result.errors))]:
+                    result.errors.append(f"batch {batch_no}, document {index}: {message}")
+                result.elapsed = time.perf_counter() - start
+                termcolor.cprint(f"Batch {batch_no}:", "blue", attrs=["bold"], end=" ")
+                print(
+                    f"{inserted} inserted, {failed} failed "
+                    f"({result.rows} total, {result.rows_per_second:,.0f} docs/s)"
+                )
+            return failed
+
+        try:
+            if workers <= 1:
+                for batch_no, documents in enumerate(batches, start=1):
+                    if write(batch_no, documents) and ordered:
+                        break
+            else:
+                # Backpressure: wait for a writer before reading the next batch
+                pending = threading.BoundedSemaphore(max_pending or workers * 2)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for batch_no, documents in enumerate(batches, start=1):
+                        pending.acquire()
+                        future = executor.submit(write, batch_no, documents)
+                        future.add_done_callback(lambda _: pending.release())
+        except Exception as e:
+            termcolor.cprint(
+                "Error in insert the data:", "red", attrs=["bold"], end=" "
+            )
+            print(f"{e} (after {result.batches} batches, {result.rows} documents inserted)")
+            record_error(self)
+            return None
+
+        result.elapsed = time.perf_counter() - start
+        termcolor.cprint("Data inserted successfully....", "green", attrs=["bold"], end=" ")
+        print(
+            f"{result.rows} documents in {result.batches} batches, {result.elapsed:.2f}s "
+            f"({result.rows_per_second:,.0f} docs/s), {result.details['failed']} failed"
+        )
+        return result
+
+    # Helper function
+    def iter_file_batches(self, datafile, batch_size):
+        """
+        Yield lists of at most 'batch_size' documents read from a data file.
+        """
+        if columnar_format(datafile) is not None:
+            for batch in iter_record_batches(datafile, batch_size):
+                yield bson_documents(batch.to_pylist())
+        elif datafile.endswith(".csv"):
+            import pandas as pd
+
+            for chunk in pd.read_csv(datafile, encoding="utf-8", chunksize=batch_size):
+                yield dataframe_to_documents(chunk)
+        elif datafile.endswith(".xlsx"):
+            import pandas as pd
+
+            dataframe = pd.read_excel(datafile)
+            yield from iter_dataframe_documents(dataframe, batch_size)
+        elif datafile.endswith((".jsonl", ".ndjson")):
+            yield from batched(iter_json_lines(datafile), batch_size)
+        elif datafile.endswith(".json"):
+            yield from batched(iter_json_array(datafile), batch_size)
+        else:
+            raise Exception(f"Unsupported file type: '{datafile}'")
+
+    # Helper function
+    def insert_batch(self, documents, ordered=False):
+        """
+        Insert one batch with 'insert_many'.
+
+        Returns:
+        - tuple: (inserted documents, list of (index, code, message) of the failed documents).
+        """
+        try:
+            result = self.collection.insert_many(documents, ordered=ordered)
+            return len(result.inserted_ids), []
+        except BulkWriteError as e:
+            errors = [
+                (error.get("index"), error.get("code"), error.get("errmsg"))
+                for error in e.details.get("writeErrors", [])
+            ]
+            return e.details.get("nInserted", 0), errors
+
+    @instrumented
+    def find_data(self, key_value="", as_dataframe=None):
         """
         Retrieves data from the MongoDB collection based on the specified key-value pair.
 
+        For large reads use 'query_data', which can project, sort and limit the
+        documents and returns them lazily.
+
         Args:
         key_value (dict, optional): A dictionary representing the key-value pair to filter the results.
                                     If not provided or an empty dictionary, all documents are retrieved.
+        as_dataframe (bool, optional): Return a DataFrame instead of a list. If not provided, an
+                                       interactive object asks, a non-interactive one returns a list.
 
         Returns:
         DataFrame or list: Returns a Pandas DataFrame if the user chooses to display the data as a DataFrame,
@@ -321,6 +620,7 @@ class Mongo_operation:
 
             # Find the documents based on the key_value
             else:
+                self.record_query(key_value)
                 item_details = self.collection.find(key_value)
 
             # Store documents in list
@@ -330,10 +630,14 @@ class Mongo_operation:
 
             # If list contains at least one document
             if len(item_list) != 0:
-                flag = input(
-                    "Do you want to print the data as a dataframe(y/n): "
-                ).lower()
-                if flag == "y":
+                if as_dataframe is None and self.interactive:
+                    flag = input(
+                        "Do you want to print the data as a dataframe(y/n): "
+                    ).lower()
+                    as_dataframe = flag == "y"
+                if as_dataframe:
+                    import pandas as pd
+
                     df = pd.DataFrame(item_list)
                     return df
                 return item_list
@@ -348,17 +652,226 @@ class Mongo_operation:
         except Exception as e:
             termcolor.cprint("Error finding the data:", "red", attrs=["bold"], end=" ")
             print(e)
+            record_error(self)
+
+    @instrumented
+    def query_data(
+        self,
+        filter=None,
+        projection=None,
+        sort=None,
+        limit=0,
+        skip=0,
+        hint=None,
+        batch_size=None,
+        output="cursor",
+        chunk_size=10000,
+    ):
+        """
+        Query the MongoDB collection without reading all the matching documents at once.
+
+        Only the requested fields ('projection') of the requested documents are
+        transferred, 'batch_size' documents per round-trip. The result can be:
+        - "cursor": the pymongo cursor, a lazy iterator of documents (default).
+        - "chunks": an iterator of DataFrames of at most 'chunk_size' documents.
+        - "dataframe": one DataFrame, built column by column from batches of
+          'chunk_size' documents instead of a list of all the documents.
+
+        Args:
+        filter (dict, optional): The query filter. If not provided, all documents match.
+        projection (dict or list, optional): The fields to return, e.g. {'name': 1, '_id': 0}.
+        sort (list or dict, optional): Sort keys, e.g. [('age', -1)] or {'age': -1}.
+        limit (int, optional): Maximum number of documents, 0 means no limit (default is 0).
+        skip (int, optional): Number of documents to skip (default is 0).
+        hint (str or list, optional): Index to use, by name or key pattern.
+        batch_size (int, optional): Number of documents per round-trip to the server.
+        output (str, optional): "cursor", "chunks" or "dataframe" (default is "cursor").
+        chunk_size (int, optional): Number of documents per DataFrame chunk (default is 10000).
+
+        Returns:
+        Cursor, iterator of DataFrames or DataFrame, or None if there is an error.
+
+        Example Usage:
+        ```python
+        for document in my_object.query_data({'age': {'$gt': 30}}, projection={'name': 1}):
+            print(document)
+
+        df = my_object.query_data(
+            {'city': 'Delhi'}, projection=['name', 'age'], sort=[('age', -1)],
+            limit=1000, output="dataframe"
+        )
+
+        for chunk in my_object.query_data(output="chunks", chunk_size=50000, batch_size=5000):
+            chunk.to_csv('part.csv', mode='a')
+        ```
+        """
+        try:
+            if output not in ("cursor", "chunks", "dataframe"):
+                raise Exception("choose 'cursor', 'chunks' or 'dataframe' as output")
+            if isinstance(sort, dict):
+                sort = list(sort.items())
+            self.record_query(filter, sort)
+            cursor = self.collection.find(
+                filter or {},
+                projection,
+                skip=skip,
+                limit=limit,
+                sort=sort,
+                batch_size=batch_size or 0,
+            )
+            if hint is not None:
+                cursor = cursor.hint(hint)
+
+            return self.cursor_output(cursor, output, chunk_size)
+        except Exception as e:
+            termcolor.cprint("Error finding the data:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+
+    @instrumented
+    def aggregate(
+        self,
+        pipeline,
+        allow_disk_use=True,
+        batch_size=None,
+        output="cursor",
+        chunk_size=10000,
+        out=None,
+        merge=None,
+        hint=None,
+    ):
+        """
+        Run an aggregation pipeline on the server, so that only its result is transferred.
+
+        The result can be streamed like the one of 'query_data' ("cursor",
+        "chunks" or "dataframe"), or written to a collection on the server with
+        'out' ($out: replace the collection) or 'merge' ($merge: insert or update
+        the documents of the collection); then nothing is transferred.
+
+        Args:
+        pipeline (list): The stages of the pipeline, e.g. [{'$match': ...}, {'$group': ...}].
+        allow_disk_use (bool, optional): Let the stages that need a lot of memory write
+                                         temporary files on the server (default is True).
+        batch_size (int, optional): Number of documents per round-trip to the server.
+        output (str, optional): "cursor", "chunks" or "dataframe" (default is "cursor").
+        chunk_size (int, optional): Number of documents per DataFrame chunk (default is 10000).
+        out (str or dict, optional): Collection name, or {'db': ..., 'coll': ...}, to write the result to with $out.
+        merge (str or dict, optional): Collection name, or the full $merge document
+                                       (e.g. {'into': 'totals', 'on': '_id', 'whenMatched': 'replace'}).
+        hint (str or list, optional): Index to use, by name or key pattern.
+
+        Returns:
+        Cursor, iterator of DataFrames or DataFrame; with 'out' or 'merge' an OperationResult
+        whose 'rows' is the number of documents of the target collection. None if there is an error.
+
+        Example Usage:
+        ```python
+        pipeline = [
+            {'$match': {'status': 'paid'}},
+            {'$group': {'_id': '$city', 'total': {'$sum': '$amount'}}},
+            {'$sort': {'total': -1}},
+        ]
+        df = my_object.aggregate(pipeline, output="dataframe")
+
+        # Keep the result on the server
+        my_object.aggregate(pipeline, merge={'into': 'city_totals', 'whenMatched': 'replace'})
+        ```
+        """
+        try:
+            if output not in ("cursor", "chunks", "dataframe"):
+                raise Exception("choose 'cursor', 'chunks' or 'dataframe' as output")
+            if out is not None and merge is not None:
+                raise Exception("pass either 'out' or 'merge', not both")
+            pipeline = list(pipeline)
+            if pipeline and "$match" in pipeline[0]:
+                sort = pipeline[1].get("$sort") if len(pipeline) > 1 else None
+                self.record_query(pipeline[0]["$match"], list(sort.items()) if sort else None)
+
+            target = None
+            if out is not None:
+                pipeline.append({"$out": out})
+                target = out
+            elif merge is not None:
+                pipeline.append({"$merge": {"into": merge} if isinstance(merge, str) else merge})
+                target = merge if isinstance(merge, str) else merge["into"]
+
+            options = {"allowDiskUse": allow_disk_use}
+            if batch_size:
+                options["batchSize"] = batch_size
+            if hint is not None:
+                options["hint"] = hint if isinstance(hint, str) else self.index_keys(hint)
+            start = time.perf_counter()
+            cursor = self.collection.aggregate(pipeline, **options)
+            if target is None:
+                return self.cursor_output(cursor, output, chunk_size)
+
+            # $out and $merge return no document, run the pipeline to the end
+            for _ in cursor:
+                pass
+            if isinstance(target, dict):
+                database = self.client[target.get("db", self.collection.database.name)]
+                target = target["coll"]
+            else:
+                database = self.collection.database
+            documents = database[target].estimated_document_count()
+            elapsed = time.perf_counter() - start
+            termcolor.cprint("Aggregation written to:", "green", attrs=["bold"], end=" ")
+            termcolor.cprint(f"'{target}'", "blue", attrs=["bold"], end=" ")
+            print(f"({documents} documents, {elapsed:.2f}s)")
+            return OperationResult(
+                "aggregate",
+                rows=documents,
+                batches=1,
+                elapsed=elapsed,
+                details={"target": target, "stage": "$out" if out is not None else "$merge"},
+            )
+        except Exception as e:
+            termcolor.cprint("Error in aggregation:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+
+    # Helper function
+    def cursor_output(self, cursor, output, chunk_size):
+        """
+        Return a cursor as is ("cursor"), as an iterator of DataFrames of at most
+        'chunk_size' documents ("chunks") or as one DataFrame ("dataframe").
+        """
+        if output == "cursor":
+            return cursor
+        import pandas as pd
 
-    def delete_data(self, key_value=""):
+        chunks = (
+            pd.DataFrame(documents_to_columns(documents))
+            for documents in batched(cursor, chunk_size)
+        )
+        if output == "chunks":
+            return chunks
+
+        columns = {}
+        rows = 0
+        for documents in batched(cursor, chunk_size):
+            documents_to_columns(documents, columns, rows)
+            rows += len(documents)
+        return pd.DataFrame(columns)
+
+    @instrumented
+    def delete_data(self, key_value="", many=None, check_exists=False):
         """
         Deletes data from the MongoDB collection based on the specified key-value pair.
 
+        The delete runs on the server and the number of deleted documents is
+        taken from its result; the matching documents are not read first.
+
         Args:
         key_value (dict, optional): A dictionary representing the key-value pair to identify the documents to delete.
                                     If not provided or an empty dictionary, the user is prompted to delete all entries.
+        many (bool, optional): Delete all the matching documents (True) or only one (False). If not provided,
+                               an interactive object asks. To delete the entire collection without being
+                               asked, pass many=True without key_value.
+        check_exists (bool, optional): Look for one matching document ('_id' only) before deleting (default is False).
 
         Returns:
-        None: Returns None after the deletion process is completed.
+        OperationResult or None: 'rows' and 'details["deleted"]' hold the number of deleted documents.
 
         Raises:
         Exception: If there is an error during the deletion process, an exception is raised,
@@ -372,19 +885,26 @@ class Mongo_operation:
         # Delete the documents based on the key_value
         key_value={'age':38}
         my_object.delete_data(key_value)
+
+        # Without prompt
+        result = my_object.delete_data({'age': 38}, many=True)
+        print(result.details["deleted"])
         ```
         """
 
         try:
+            start = time.perf_counter()
             # Delete the entire data of collection
-            if key_value == "":
-                flag = input(
-                    "It will delete entire data, Do you want to delete the data?(y/n): "
-                ).lower()
-                if flag == "y":
-                    self.collection.delete_many({})
+            if key_value == "" or key_value == {}:
+                if many is None and self.interactive:
+                    flag = input(
+                        "It will delete entire data, Do you want to delete the data?(y/n): "
+                    ).lower()
+                    many = flag == "y"
+                if many:
+                    deleted = self.collection.delete_many({}).deleted_count
                     termcolor.cprint("All entry deleted", "magenta", attrs=["bold"])
-                    return
+                    return self.write_result("delete_data", start, deleted=deleted)
 
                 else:
                     termcolor.cprint("Nothing deleted")
@@ -392,9 +912,9 @@ class Mongo_operation:
 
             # Delete the documents based on the key_value
             else:
+                self.record_query(key_value)
                 # Check the documents based on the key value
-                item_list = list(self.collection.find(key_value))
-                if len(item_list) == 0:
+                if check_exists and self.collection.find_one(key_value, {"_id": 1}) is None:
                     termcolor.cprint(
                         "Entry doesn't exists of given key value.",
                         "dark_grey",
@@ -403,44 +923,67 @@ class Mongo_operation:
                     return
 
                 # Ask for delete single or multiple entries
-                flag = input(
-                    "Do you want delete the one entry or mutiple entries?(one/many) "
-                ).lower()
-
-                if flag == "one":
-                    self.collection.delete_one(key_value)
+                if many is None:
+                    if not self.interactive:
+                        raise Exception("pass many=True or many=False")
+                    flag = input(
+                        "Do you want delete the one entry or mutiple entries?(one/many) "
+                    ).lower()
+                    if flag in ("one", "many"):
+                        many = flag == "many"
+
+                if many is False:
+                    deleted = self.collection.delete_one(key_value).deleted_count
+                    message = "Entry deleted successfully"
+
+                elif many is True:
+                    deleted = self.collection.delete_many(key_value).deleted_count
+                    message = "Multiple entries deleted successfully"
+                else:
                     termcolor.cprint(
-                        "Entry deleted successfully ", "green", attrs=["bold"], end=" "
+                        "Incorrect option:", "red", attrs=["bold"], end=" "
                     )
+                    print("choose either 'one' or 'many'")
+                    record_error(self)
+                    return
 
-                elif flag == "many":
-                    self.collection.delete_many(key_value)
+                if deleted == 0:
                     termcolor.cprint(
-                        "Multiple entries deleted successfully ",
-                        "green",
+                        "Entry doesn't exists of given key value.",
+                        "dark_grey",
                         attrs=["bold"],
-                        end=" ",
                     )
                 else:
-                    termcolor.cprint(
-                        "Incorrect option:", "red", attrs=["bold"], end=" "
-                    )
-                    print("choose either 'one' or 'many'")
+                    termcolor.cprint(message, "green", attrs=["bold"], end=" ")
+                    print(f"({deleted})")
+                return self.write_result("delete_data", start, deleted=deleted)
 
         except Exception as e:
             termcolor.cprint("Error deleting the data:", "red", attrs=["bold"], end=" ")
             print(e)
+            record_error(self)
 
-    def update_data_entry(self, filter_criteria, update_data):
+    @instrumented
+    def update_data_entry(
+        self, filter_criteria, update_data, many=None, check_exists=False, upsert=False
+    ):
         """
         Updates data in the MongoDB collection based on the specified filter criteria.
 
+        The update runs on the server and the matched and modified counts are
+        taken from its result; the matching documents are not read first.
+
         Args:
         filter_criteria (dict): A dictionary representing the criteria to identify the documents to update.
         update_data (dict): A dictionary representing the update operation to be applied to matching documents.
+        many (bool, optional): Update all the matching documents (True) or only one (False). If not provided,
+                               an interactive object asks.
+        check_exists (bool, optional): Look for one matching document ('_id' only) before updating (default is False).
+        upsert (bool, optional): Insert a document when nothing matches (default is False).
 
         Returns:
-        None: Returns None after the update operation is completed.
+        OperationResult or None: 'details' holds the 'matched' and 'modified' counts, 'rows' the modified documents.
+        When no document matches, a warning is printed and 'matched' is 0; None means the update failed.
 
         Raises:
         Exception: If there is an error during the update process, an exception is raised,
@@ -451,67 +994,790 @@ class Mongo_operation:
         filter_criteria = {'age': 28}
         update_data = [{'$set': {'age': 55}}]
         my_object.update_data_entry(filter_criteria, update_data)
+
+        # Without prompt
+        result = my_object.update_data_entry({'age': 28}, {'$set': {'age': 55}}, many=True)
+        print(result.details["matched"], result.details["modified"])
         ```
         """
 
         try:
-            # Retrieve documents based on the specified filter criteria
-            item_list = list(self.collection.find(filter_criteria))
-
-            # Raise the error if there is no document based on filter_criteria
-            if len(item_list) == 0:
-                raise Exception("Entry does not exist, can not update the data")
+            start = time.perf_counter()
+            self.record_query(filter_criteria)
+            # Check that one document matches the filter criteria
+            if check_exists and self.collection.find_one(filter_criteria, {"_id": 1}) is None:
+                return self.nothing_matched(start)
 
             # Ask to update single or multiple entries
-            flag = input(
-                "Do you want single entry update on multiple?(one/many) "
-            ).lower()
+            if many is None:
+                if not self.interactive:
+                    raise Exception("pass many=True or many=False")
+                flag = input(
+                    "Do you want single entry update on multiple?(one/many) "
+                ).lower()
+                if flag not in ("one", "many"):
+                    raise Exception("Invalid input")
+                many = flag == "many"
 
-            if flag == "one":
-                self.collection.update_one(filter_criteria, update_data)
-                termcolor.cprint(
-                    "Updated Successfully (one entry)...",
-                    "green",
-                    attrs=["bold"],
-                    end=" ",
+            if many:
+                result = self.collection.update_many(filter_criteria, update_data, upsert=upsert)
+                message = "Updated Successfully (multiple entries)...."
+            else:
+                result = self.collection.update_one(filter_criteria, update_data, upsert=upsert)
+                message = "Updated Successfully (one entry)..."
+
+            # No document based on filter_criteria, not an error
+            if result.matched_count == 0 and result.upserted_id is None:
+                return self.nothing_matched(start)
+
+            termcolor.cprint(message, "green", attrs=["bold"], end=" ")
+            print(f"(matched {result.matched_count}, modified {result.modified_count})")
+            return self.write_result(
+                "update_data_entry",
+                start,
+                matched=result.matched_count,
+                modified=result.modified_count,
+                upserted_id=result.upserted_id,
+            )
+        except Exception as e:
+            termcolor.cprint("Error updating the data:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+
+    # Helper function
+    def nothing_matched(self, start):
+        """
+        Warn that no document matches the filter of an update and return its result.
+        """
+        termcolor.cprint("Nothing updated:", "magenta", attrs=["bold"], end=" ")
+        print("no document matches the filter criteria")
+        return self.write_result("update_data_entry", start, matched=0, modified=0, upserted_id=None)
+
+    @instrumented
+    def bulk_mutate(self, operations, batch_size=1000, ordered=False, key="_id"):
+        """
+        Apply inserts, upserts, updates, replaces and deletes to the current collection with 'bulk_write'.
+
+        The operations are read lazily from an iterable or a JSON Lines / JSON
+        array file (MongoDB Extended JSON, such as {"$oid": ...}, is read as
+        BSON types) and sent 'batch_size' at a time, one round-trip per batch
+        instead of one per operation. An operation is a dict with an "op" field:
+
+        - {"op": "insert", "document": {...}}
+        - {"op": "upsert", "document": {...}, "key": "email"}: '$set' the document on the
+          document with the same key value(s), or insert it. "key" can be a list of fields,
+          the 'key' argument is used when it is missing. An upsert whose document lacks a key
+          field is not sent: it is counted as failed (and stops an ordered job).
+        - {"op": "update", "filter": {...}, "update": {...}, "many": False, "upsert": False}
+        - {"op": "replace", "filter": {...}, "document": {...}, "upsert": False}
+        - {"op": "delete", "filter": {...}, "many": False}
+
+        pymongo requests ('InsertOne', 'UpdateOne', 'ReplaceOne', ...) are accepted as they are.
+
+        With 'ordered=False' the operations of a batch may run in any order and
+        the failing ones are counted without stopping the job. 'ordered=True'
+        applies the operations in order and stops at the first error: the
+        operations after it in the failing batch are counted as 'skipped', and
+        the operations of the later batches are neither read nor counted.
+
+        Args:
+        - operations (iterable or str): The operations, or the path of a '.jsonl', '.ndjson' or '.json' file.
+        - batch_size (int, optional): Number of operations per 'bulk_write' (default is 1000).
+        - ordered (bool, optional): Apply in order and stop at the first error (default is False).
+        - key (str or list, optional): Default key fields of the upserts (default is "_id").
+
+        Returns:
+        - OperationResult or None: 'rows' is the number of applied operations, 'details' holds the
+          'inserted', 'matched', 'modified', 'deleted', 'upserted', 'failed' and 'skipped' counts
+          ('skipped' only covers the batch of an ordered failure).
+
+        Example Usage:
+        ```python
+        operations = (
+            {"op": "upsert", "key": "sku", "document": {"sku": row["sku"], "price": row["price"]}}
+            for row in rows
+        )
+        result = my_object.bulk_mutate(operations, batch_size=5000)
+        print(result.details["upserted"], result.details["modified"], result.rows_per_second)
+
+        my_object.bulk_mutate("path/to/operations.jsonl", ordered=True)
+        ```
+        """
+        result = OperationResult("bulk_mutate")
+        result.details.update({name: 0 for name in BULK_COUNTS.values()})
+        result.details.update({"failed": 0, "skipped": 0})
+        start = time.perf_counter()
+
+        try:
+            if isinstance(operations, str):
+                result.path = operations
+                if operations.endswith((".jsonl", ".ndjson")):
+                    operations = iter_json_lines(operations, json_util.object_hook)
+                elif operations.endswith(".json"):
+                    operations = iter_json_array(operations, object_hook=json_util.object_hook)
+                else:
+                    raise Exception(f"Unsupported file type: '{operations}'")
+            requests = (
+                self.checked_request(operation, key, number)
+                for number, operation in enumerate(operations, start=1)
+            )
+
+            for batch_no, batch in enumerate(batched(requests, batch_size), start=1):
+                batch_start = time.perf_counter()
+                # The invalid operations are not sent, they fail on their own
+                positions = [index for index, (_, error) in enumerate(batch) if error is None]
+                invalid = [(index, error) for index, (_, error) in enumerate(batch) if error is not None]
+                if ordered and invalid:
+                    positions = [index for index in positions if index < invalid[0][0]]
+                    invalid = invalid[:1]
+                counts, errors = {}, []
+                if positions:
+                    try:
+                        counts = self.collection.bulk_write(
+                            [batch[index][0] for index in positions], ordered=ordered
+                        ).bulk_api_result
+                    except BulkWriteError as e:
+                        counts = e.details
+                        errors = e.details.get("writeErrors", [])
+                for field, name in BULK_COUNTS.items():
+                    result.details[name] += counts.get(field, 0)
+                # (position in the batch, message), the first one stops an ordered job
+                failures = sorted(
+                    [(positions[error["index"]], error.get("errmsg")) for error in errors] + invalid
+                )
+                if ordered:
+                    failures = failures[:1]
+                failed = len(failures)
+                skipped = len(batch) - failures[0][0] - 1 if ordered and failures else 0
+                result.batches += 1
+                result.rows += len(batch) - failed - skipped
+                result.details["failed"] += failed
+                result.details["skipped"] += skipped
+                record_batch(
+                    self, "bulk_mutate", len(batch) - failed - skipped,
+                    time.perf_counter() - batch_start, failed,
                 )
-            elif flag == "many":
-                self.collection.update_many(filter_criteria, update_data)
+                for index, message in failures[: max(0, MAX_REPORTED_ERRORS - len(result.errors))]:
+                    result.errors.append(f"batch {batch_no}, operation {index}: {message}")
+                result.elapsed = time.perf_counter() - start
+                termcolor.cprint(f"Batch {batch_no}:", "blue", attrs=["bold"], end=" ")
+                print(
+                    f"{len(batch) - failed - skipped} applied, {failed} failed "
+                    f"({result.rows} total, {result.rows_per_second:,.0f} ops/s)"
+                )
+                if ordered and failures:
+                    termcolor.cprint("Stopped at the first error:", "red", attrs=["bold"], end=" ")
+                    print(result.errors[-1] if result.errors else failures[0][1])
+                    break
+        except Exception as e:
+            termcolor.cprint("Error in bulk write:", "red", attrs=["bold"], end=" ")
+            print(f"{e} (after {result.batches} batches, {result.rows} operations applied)")
+            record_error(self)
+            return None
+
+        result.elapsed = time.perf_counter() - start
+        termcolor.cprint("Bulk write completed....", "green", attrs=["bold"], end=" ")
+        print(
+            f"{result.rows} operations in {result.batches} batches, {result.elapsed:.2f}s "
+            f"({result.rows_per_second:,.0f} ops/s): "
+            + ", ".join(f"{count} {name}" for name, count in result.details.items())
+        )
+        return result
+
+    # Helper function
+    def checked_request(self, operation, key, number):
+        """
+        Return the pymongo write request of an operation and None, or None and
+        the error of an operation that can not be applied (an upsert without
+        its key fields).
+        """
+        try:
+            return self.write_request(operation, key, number), None
+        except KeyError as e:
+            return None, f"missing key field {e}"
+
+    # Helper function
+    def write_request(self, operation, key="_id", number=None):
+        """
+        Convert an operation dict of 'bulk_mutate' to a pymongo write request.
+        """
+        if isinstance(operation, WRITE_REQUESTS):
+            return operation
+        op = operation.get("op") if isinstance(operation, dict) else None
+        if op == "insert":
+            return InsertOne(operation["document"])
+        if op == "upsert":
+            document = operation["document"]
+            fields = operation.get("key", key)
+            fields = [fields] if isinstance(fields, str) else fields
+            missing = [field for field in fields if field not in document]
+            if missing:
+                raise KeyError(", ".join(missing))
+            return UpdateOne(
+                {field: document[field] for field in fields}, {"$set": document}, upsert=True
+            )
+        if op == "update":
+            request = UpdateMany if operation.get("many") else UpdateOne
+            return request(
+                operation["filter"], operation["update"], upsert=operation.get("upsert", False)
+            )
+        if op == "replace":
+            return ReplaceOne(
+                operation["filter"], operation["document"], upsert=operation.get("upsert", False)
+            )
+        if op == "delete":
+            request = DeleteMany if operation.get("many") else DeleteOne
+            return request(operation["filter"])
+        raise Exception(
+            f"Invalid operation {number}: expected an 'op' of insert, upsert, update, replace or delete"
+        )
+
+    @instrumented
+    def sync_changes(
+        self,
+        checkpoint_file,
+        target=None,
+        output_path=None,
+        batch_size=1000,
+        max_events=None,
+        max_await_ms=1000,
+    ):
+        """
+        Apply or export the changes of the current collection since the last checkpoint.
+
+        The inserts, updates, replaces and deletes are read from a change stream
+        (the server must be a replica set or a sharded cluster), resuming after
+        the resume token saved in 'checkpoint_file'. They are handled in batches
+        of 'batch_size' events:
+        - with 'target', they are applied to that collection with one 'bulk_write'
+          per batch: the full document is upserted by '_id', or the document is deleted.
+        - with 'output_path', they are appended to a JSON Lines file (MongoDB
+          Extended JSON) as operations of 'bulk_mutate', which can replay them.
+        The resume token is saved after every batch, so an interrupted run goes
+        on from the last batch that was written. The method returns when there
+        is no new change, or after 'max_events' changes.
+
+        A 'drop', 'rename' or 'invalidate' event ends the stream: the changes before
+        it are written, and the checkpoint is left on the last of them (a token past
+        an invalidating event cannot be resumed from). 'details["stopped_by"]' names
+        the event; every later run stops on it again, so make a new full copy and
+        delete the checkpoint file to start over.
+
+        The first run, without a checkpoint, only saves the current position of
+        the stream: make a full copy (e.g. with 'save_data') and then call
+        'sync_changes' every time the copy has to be refreshed.
+
+        Args:
+        checkpoint_file (str): File holding the resume token.
+        target (str or Collection, optional): Collection to apply the changes to (a name in the current database).
+        output_path (str, optional): JSON Lines file to append the changes to.
+        batch_size (int, optional): Number of changes per batch (default is 1000).
+        max_events (int, optional): Stop after this many changes.
+        max_await_ms (int, optional): Milliseconds to wait for new changes before returning (default is 1000).
+
+        Returns:
+        OperationResult or None: 'rows' is the number of changes, 'details' counts the
+        'insert', 'update', 'replace' and 'delete' events and holds the 'checkpoint' file
+        and the event that stopped the stream ('stopped_by', None if none did).
+
+        Example Usage:
+        ```python
+        # Keep a copy of the collection in another collection
+        my_object.sync_changes('orders.token', target='orders_copy')
+
+        # Export the changes since the last run
+        result = my_object.sync_changes('orders.token', output_path='orders_delta.jsonl')
+        print(result.rows, result.details)
+        ```
+        """
+        try:
+            if (target is None) == (output_path is None):
+                raise Exception("pass either a target collection or an output_path")
+            if isinstance(target, str):
+                target = self.collection.database[target]
+
+            result = OperationResult("sync_changes", path=output_path)
+            result.details.update({"insert": 0, "update": 0, "replace": 0, "delete": 0})
+            start = time.perf_counter()
+            token = None
+            if os.path.exists(checkpoint_file):
+                with open(checkpoint_file, "r", encoding="utf-8") as token_file:
+                    token = json_util.loads(token_file.read())
+
+            with self.collection.watch(
+                full_document="updateLookup",
+                resume_after=token,
+                batch_size=batch_size,
+                max_await_time_ms=max_await_ms,
+            ) as stream:
+                if token is None:
+                    self.save_resume_token(checkpoint_file, stream.resume_token)
+                    termcolor.cprint("Checkpoint created:", "green", attrs=["bold"], end=" ")
+                    print(f"'{checkpoint_file}', the next run reads the changes from now on")
+                    result.details["checkpoint"] = checkpoint_file
+                    return result
+
+                events = []
+                stopped_by = None
+                while max_events is None or result.rows + len(events) < max_events:
+                    change = stream.try_next()
+                    if change is None:
+                        break
+                    operation = change["operationType"]
+                    if operation not in result.details:
+                        # drop, rename, invalidate...: the stream ends
+                        stopped_by = operation
+                        termcolor.cprint("Change stream stopped by:", "magenta", attrs=["bold"], end=" ")
+                        print(f"{operation}, the checkpoint stays before it: make a new full copy and delete '{checkpoint_file}'")
+                        break
+                    events.append(change)
+                    if len(events) == batch_size:
+                        self.write_changes(events, target, output_path, result)
+                        self.save_resume_token(checkpoint_file, stream.resume_token)
+                        events = []
+                if events:
+                    self.write_changes(events, target, output_path, result)
+                if stopped_by is None:
+                    self.save_resume_token(checkpoint_file, stream.resume_token)
+                elif events:
+                    # The token of the stream is past the invalidating event, which
+                    # 'resume_after' rejects: keep the one of the last change written
+                    self.save_resume_token(checkpoint_file, events[-1]["_id"])
+                result.details["stopped_by"] = stopped_by
+
+            result.elapsed = time.perf_counter() - start
+            result.details["checkpoint"] = checkpoint_file
+            termcolor.cprint("Changes synced successfully....", "green", attrs=["bold"], end=" ")
+            print(
+                f"{result.rows} changes in {result.batches} batches, {result.elapsed:.2f}s ("
+                + ", ".join(f"{result.details[name]} {name}" for name in ("insert", "update", "replace", "delete"))
+                + ")"
+            )
+            return result
+        except Exception as e:
+            termcolor.cprint("Error syncing the changes:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+
+    # Helper function
+    def write_changes(self, events, target, output_path, result):
+        """
+        Apply a batch of change events to the target collection, or append them to the output file.
+        """
+        batch_start = time.perf_counter()
+        operations = []
+        for change in events:
+            result.details[change["operationType"]] += 1
+            key = {"_id": change["documentKey"]["_id"]}
+            if change["operationType"] == "delete":
+                operations.append({"op": "delete", "filter": key})
+            elif change.get("fullDocument") is not None:
+                operations.append(
+                    {"op": "replace", "filter": key, "document": change["fullDocument"], "upsert": True}
+                )
+            # else: updated then deleted before the lookup, the delete event follows
+
+        if target is not None:
+            if operations:
+                target.bulk_write([self.write_request(operation) for operation in operations])
+        else:
+            with open(output_path, "a", encoding="utf-8") as output_file:
+                output_file.write("".join(json_util.dumps(operation) + "\n" for operation in operations))
+        result.batches += 1
+        result.rows += len(events)
+        record_batch(self, "sync_changes", len(events), time.perf_counter() - batch_start)
+
+    # Helper function
+    def save_resume_token(self, checkpoint_file, token):
+        """
+        Write a resume token to the checkpoint file, replacing it atomically.
+        """
+        if token is None:
+            return
+        temporary = f"{checkpoint_file}.tmp"
+        with open(temporary, "w", encoding="utf-8") as token_file:
+            token_file.write(json_util.dumps(token))
+        os.replace(temporary, checkpoint_file)
+
+    @instrumented
+    def create_index(
+        self,
+        keys,
+        name=None,
+        unique=False,
+        background=False,
+        expire_after_seconds=None,
+        partial_filter=None,
+    ):
+        """
+        Create an index on the current collection.
+
+        Args:
+        keys (str, list or dict): A field, a list of fields, or a list of (field, direction)
+                                  pairs / a dict, e.g. [('city', 1), ('age', -1)].
+        name (str, optional): Name of the index. If not provided, the server names it from the keys.
+        unique (bool, optional): Reject documents with a duplicate key (default is False).
+        background (bool, optional): Build the index in the background on servers older than 4.2 (default is False).
+        expire_after_seconds (int, optional): Make a TTL index: documents are deleted this many seconds
+                                              after the date of the (single) indexed field.
+        partial_filter (dict, optional): Only index the documents matching this filter.
+
+        Returns:
+        str or None: The name of the index.
+
+        Example Usage:
+        ```python
+        my_object.create_index([('city', 1), ('age', -1)])
+
+        # Delete the sessions one hour after 'created_at'
+        my_object.create_index('created_at', expire_after_seconds=3600)
+        ```
+        """
+        try:
+            options = {"unique": unique}
+            if name is not None:
+                options["name"] = name
+            if background:
+                options["background"] = True
+            if expire_after_seconds is not None:
+                options["expireAfterSeconds"] = expire_after_seconds
+            if partial_filter is not None:
+                options["partialFilterExpression"] = partial_filter
+            index_name = self.collection.create_index(self.index_keys(keys), **options)
+            termcolor.cprint("Index:", "green", attrs=["bold"], end=" ")
+            termcolor.cprint(f"'{index_name}'", "blue", attrs=["bold"], end=" ")
+            termcolor.cprint("created successfully....", "green", attrs=["bold"])
+            return index_name
+        except Exception as e:
+            termcolor.cprint("Error creating the index:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+
+    @instrumented
+    def list_indexes(self):
+        """
+        List the indexes of the current collection.
+
+        Returns:
+        list or None: One dict per index with its 'name', 'key' (list of (field, direction)),
+                      'unique' and 'expireAfterSeconds' (None if it is not a TTL index).
+
+        Example Usage:
+        ```python
+        for index in my_object.list_indexes():
+            print(index['name'], index['key'])
+        ```
+        """
+        try:
+            indexes = []
+            for index in self.collection.list_indexes():
+                indexes.append(
+                    {
+                        "name": index["name"],
+                        "key": list(index["key"].items()),
+                        "unique": index.get("unique", False),
+                        "expireAfterSeconds": index.get("expireAfterSeconds"),
+                    }
+                )
+                termcolor.cprint(f"{index['name']}:", "blue", attrs=["bold"], end=" ")
+                print(dict(index["key"]))
+            return indexes
+        except Exception as e:
+            termcolor.cprint("Error listing the indexes:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+
+    @instrumented
+    def drop_index(self, index):
+        """
+        Drop an index of the current collection.
+
+        Args:
+        index (str, list or dict): The name of the index, or its keys as for 'create_index'.
+
+        Example Usage:
+        ```python
+        my_object.drop_index('city_1_age_-1')
+        ```
+        """
+        try:
+            if not isinstance(index, str) or index not in {
+                info["name"] for info in self.collection.list_indexes()
+            }:
+                index = self.index_keys(index)
+            self.collection.drop_index(index)
+            termcolor.cprint("Index dropped successfully....", "green", attrs=["bold"])
+        except Exception as e:
+            termcolor.cprint("Error dropping the index:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+
+    @instrumented
+    def explain_query(self, filter=None, sort=None, projection=None, hint=None, max_ratio=10):
+        """
+        Explain how the server runs a query and flag the slow plans.
+
+        The query is run with the "executionStats" verbosity. The plan is
+        flagged when it scans the whole collection (COLLSCAN), sorts in memory
+        (SORT), or examines more than 'max_ratio' documents per returned document.
+
+        Args:
+        filter (dict, optional): The query filter. If not provided, all documents match.
+        sort (list or dict, optional): Sort keys, e.g. [('age', -1)].
+        projection (dict, optional): The fields to return.
+        hint (str or list, optional): Index to use, by name or key pattern.
+        max_ratio (float, optional): Flag plans examining more documents per returned document (default is 10).
+
+        Returns:
+        dict or None: The 'stages' and 'indexes' of the winning plan, 'returned', 'docs_examined',
+                      'keys_examined', 'time_ms', 'ratio', the 'warnings' and the raw 'explain' output.
+
+        Example Usage:
+        ```python
+        plan = my_object.explain_query({'city': 'Delhi', 'age': {'$gt': 30}})
+        if plan['warnings']:
+            print(plan['warnings'])
+        ```
+        """
+        try:
+            command = {"find": self.collection.name, "filter": filter or {}}
+            if sort:
+                command["sort"] = SON(sort.items() if isinstance(sort, dict) else sort)
+            if projection is not None:
+                command["projection"] = projection
+            if hint is not None:
+                command["hint"] = hint if isinstance(hint, str) else SON(self.index_keys(hint))
+            explain = self.collection.database.command(
+                SON([("explain", command), ("verbosity", "executionStats")])
+            )
+            stats = explain.get("executionStats", {})
+            stages, indexes = [], []
+            self.plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}), stages, indexes)
+            returned = stats.get("nReturned", 0)
+            examined = stats.get("totalDocsExamined", 0)
+            ratio = examined / max(returned, 1)
+
+            warnings = []
+            if "COLLSCAN" in stages:
+                warnings.append("COLLSCAN: the query scans the whole collection, no index is used")
+            if "SORT" in stages:
+                warnings.append("SORT: the documents are sorted in memory, no index gives the order")
+            if ratio > max_ratio:
+                warnings.append(
+                    f"{examined} documents examined for {returned} returned (ratio {ratio:,.1f})"
+                )
+            plan = {
+                "stages": stages,
+                "indexes": indexes,
+                "returned": returned,
+                "docs_examined": examined,
+                "keys_examined": stats.get("totalKeysExamined", 0),
+                "time_ms": stats.get("executionTimeMillis", 0),
+                "ratio": ratio,
+                "warnings": warnings,
+                "explain": explain,
+            }
+
+            termcolor.cprint("Plan:", "blue", attrs=["bold"], end=" ")
+            print(
+                f"{' <- '.join(stages)} ({', '.join(indexes) or 'no index'}), "
+                f"{returned} returned, {examined} documents examined, {plan['time_ms']} ms"
+            )
+            for warning in warnings:
+                termcolor.cprint("Warning:", "red", attrs=["bold"], end=" ")
+                print(warning)
+            return plan
+        except Exception as e:
+            termcolor.cprint("Error explaining the query:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+
+    @instrumented
+    def index_advice(self, min_queries=1, explain=False):
+        """
+        Suggest indexes for the filters used by 'find_data', 'query_data',
+        'update_data_entry' and 'delete_data' on this object.
+
+        The filters are grouped by shape (the fields they match and sort on).
+        For every shape a compound index is built with the Equality, Sort, Range
+        rule: the fields matched by equality first, then the sort fields, then
+        the fields matched by a range. Shapes already served by an index (the
+        suggested keys are a prefix of its keys) and suggestions that are a
+        prefix of another one are left out.
+
+        Args:
+        min_queries (int, optional): Only consider the shapes used at least this many times (default is 1).
+        explain (bool, optional): Also run 'explain_query' on the last filter of every shape (default is False).
+
+        Returns:
+        list or None: One dict per suggestion with the index 'keys', the number of 'queries'
+                      it serves, an example 'filter' and, with explain=True, the 'plan'.
+
+        Example Usage:
+        ```python
+        my_object.query_data({'city': 'Delhi', 'age': {'$gt': 30}}, sort=[('name', 1)])
+        for advice in my_object.index_advice():
+            my_object.create_index(advice['keys'])
+        ```
+        """
+        try:
+            existing = [
+                list(index["key"].items()) for index in self.collection.list_indexes()
+            ]
+            with self._shapes_lock:
+                shapes = [
+                    dict(shape, keys=list(keys))
+                    for keys, shape in self.query_shapes.items()
+                    if shape["queries"] >= min_queries
+                ]
+            shapes.sort(key=lambda shape: shape["queries"], reverse=True)
+
+            suggestions = []
+            for shape in shapes:
+                keys = shape["keys"]
+                if not keys:
+                    continue
+                if any(index[: len(keys)] == keys for index in existing):
+                    continue
+                if any(
+                    other["keys"][: len(keys)] == keys and other["keys"] != keys
+                    for other in shapes
+                ):
+                    continue
+                advice = {"keys": keys, "queries": shape["queries"], "filter": shape["filter"]}
+                if explain:
+                    advice["plan"] = self.explain_query(shape["filter"], shape["sort"])
+                suggestions.append(advice)
+
+                termcolor.cprint("Suggested index:", "green", attrs=["bold"], end=" ")
+                termcolor.cprint(f"{keys}", "blue", attrs=["bold"], end=" ")
+                print(f"({shape['queries']} queries, e.g. {shape['filter']})")
+
+            if not suggestions:
                 termcolor.cprint(
-                    "Updated Successfully (multiple entries)....",
-                    "green",
+                    "No index to suggest, the recorded queries are served by the indexes.",
+                    "dark_grey",
                     attrs=["bold"],
-                    end=" ",
                 )
-            else:
-                raise Exception("Invalid input")
+            return suggestions
         except Exception as e:
-            termcolor.cprint("Error updating the data:", "red", attrs=["bold"], end=" ")
+            termcolor.cprint("Error in index advice:", "red", attrs=["bold"], end=" ")
             print(e)
+            record_error(self)
 
     # Helper function
-    def convert_to_serializable(self, obj):
+    def record_query(self, filter, sort=None):
         """
-        Convert MongoDB document to JSON serializable format.
+        Count the shape of a filter for 'index_advice': its suggested index keys.
         """
-        if isinstance(obj, ObjectId):
-            return str(obj)
-        return obj
+        equality, ranges = [], []
+        self.filter_fields(filter or {}, equality, ranges)
+        keys = [(field, 1) for field in equality]
+        for field, direction in sort or []:
+            if field not in equality:
+                keys.append((field, direction))
+        sorted_fields = {field for field, _ in keys}
+        keys.extend((field, 1) for field in ranges if field not in sorted_fields)
+        keys = tuple(dict(keys).items())
+        with self._shapes_lock:
+            shape = self.query_shapes.setdefault(keys, {"queries": 0})
+            shape.update(queries=shape["queries"] + 1, filter=filter, sort=sort)
 
-    def save_data(self):
+    # Helper function
+    @staticmethod
+    def filter_fields(filter, equality, ranges):
+        """
+        Split the fields of a filter into the equality and the range fields.
+        '$and' is followed, '$or' and the other top level operators are ignored.
+        """
+        for field, value in filter.items():
+            if field == "$and":
+                for part in value:
+                    Mongo_operation.filter_fields(part, equality, ranges)
+            elif field.startswith("$"):
+                continue
+            elif isinstance(value, dict) and RANGE_OPERATORS.intersection(value):
+                if field not in ranges:
+                    ranges.append(field)
+            elif field not in equality:
+                equality.append(field)
+
+    # Helper function
+    @staticmethod
+    def plan_stages(plan, stages, indexes):
+        """
+        Collect the stages and the index names of an explain plan, from the top.
+        """
+        if "queryPlan" in plan:
+            plan = plan["queryPlan"]
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        if "indexName" in plan and plan["indexName"] not in indexes:
+            indexes.append(plan["indexName"])
+        for child in plan.get("inputStages", [plan["inputStage"]] if "inputStage" in plan else []):
+            Mongo_operation.plan_stages(child, stages, indexes)
+
+    # Helper function
+    @staticmethod
+    def index_keys(keys):
+        """
+        Return index keys as a list of (field, direction) pairs.
         """
-        Save data from the MongoDB collection to either a JSON or CSV file.
+        if isinstance(keys, str):
+            return [(keys, 1)]
+        if isinstance(keys, dict):
+            return list(keys.items())
+        return [(key, 1) if isinstance(key, str) else tuple(key) for key in keys]
+
+    # Helper function
+    def write_result(self, operation, start, **counts):
+        """
+        Build the OperationResult of a write; 'rows' is the deleted or modified count.
+        """
+        rows = counts.get("deleted", counts.get("modified", 0))
+        return OperationResult(
+            operation,
+            rows=rows,
+            batches=1,
+            elapsed=time.perf_counter() - start,
+            details=counts,
+        )
+
+    @instrumented
+    def save_data(
+        self, file_format=None, file_name=None, filter=None, projection=None, batch_size=1000, fields=None
+    ):
+        """
+        Save data from the MongoDB collection to a JSON, JSON Lines, CSV, Parquet or Arrow IPC file.
 
         This method retrieves data from the MongoDB collection and allows the user
-        to choose between saving it as a JSON or CSV file. The user is prompted to
-        input the desired file format and filename. The data is then serialized and
-        saved to the specified file.
+        to choose the type of the file. The user is prompted to input the desired
+        file format and filename, unless they are passed as arguments. The
+        documents are read from the cursor 'batch_size' at a time and every
+        batch is written to the file before the next one is read, so the memory
+        does not grow with the size of the collection (see 'DocumentWriter' for
+        the formats). ObjectIds, Decimal128 and Decimal values are saved as
+        strings and datetimes as ISO 8601 strings in JSON and CSV files.
+
+        The columns of a CSV, Parquet or Arrow file are fixed before it is
+        written, the rows are never rewritten. A CSV file takes them from
+        'fields' or the projection; otherwise, and always for Parquet and Arrow
+        files (for the types of the columns), a first pass over the matching
+        documents reads the fields and types (see 'scan_columns'). A document
+        changed in between with a field that is not a column fails the export.
 
         Args:
-            No argument requires.
+            file_format (str, optional): 'json', 'jsonl', 'csv', 'parquet' or 'arrow'. If not provided,
+                                         it is taken from the extension of file_name, or asked.
+            file_name (str, optional): Path of the output file.
+            filter (dict, optional): Only save the matching documents.
+            projection (dict or list, optional): Only save these fields.
+            batch_size (int, optional): Number of documents per batch (default is 1000).
+            fields (list, optional): The columns of a CSV, Parquet or Arrow file, first in this order.
 
         Returns:
-            None: The method doesn't return any value.
+            OperationResult or None: The saved documents, batches, elapsed time and file path;
+                                     'details' holds the columns ('fields') of a CSV, Parquet or Arrow file.
 
         Raises:
             Exception: Raised if there is an error during the file-saving process,
@@ -520,54 +1786,104 @@ class Mongo_operation:
          Example Usage:
         ```python
         my_object.save_data()
+
+        my_object.save_data("parquet", "collection.parquet")
+        result = my_object.save_data(file_name="export.jsonl", filter={"status": "active"})
+        print(result.rows, result.rows_per_second)
         ```
         """
 
         try:
-            # Retrieve data from the MongoDB collection
-            item_list = list(self.collection.find())
-            data = item_list
+            if file_format is None and file_name is not None:
+                extension = os.path.splitext(file_name)[1].lower().lstrip(".")
+                if extension in DocumentWriter.FORMATS:
+                    file_format = extension
+                elif columnar_format(file_name) is not None:
+                    file_format = columnar_format(file_name)
 
             # Ask the user to save the type of the file
-            flag = input(
-                "Do you want to save the data as json file or csv file?(json/csv)"
-            ).lower()
-            file_name = ""
-
-            # Store the file as json format
-            if flag == "json":
-                json_file = input("Enter the filename: ")
-                serialized_data = json.dumps(
-                    data, default=self.convert_to_serializable, indent=2
-                )
-                with open(json_file, "w") as jsonfile:
-                    jsonfile.write(serialized_data)
-                file_name = json_file
-
-            # Store the file as csv format
-            elif flag == "csv":
-                csv_file_name = input("Enter the filename: ")
-                df = pd.DataFrame(data)
-                df.to_csv(csv_file_name)
-                file_name = csv_file_name
-
+            if file_format is None:
+                if not self.interactive:
+                    raise Exception("pass the file_format or a file_name with a known extension")
+                flag = input(
+                    "Do you want to save the data as json, jsonl, csv, parquet or arrow file?(json/jsonl/csv/parquet/arrow)"
+                ).lower()
             else:
+                flag = file_format.lower()
+
+            # Check the option before reading the collection
+            if flag not in DocumentWriter.FORMATS:
                 termcolor.cprint("Incorrect option:", "red", attrs=["bold"], end=" ")
-                print("choose either 'json' or 'csv'")
+                print("choose either 'json', 'jsonl', 'csv', 'parquet' or 'arrow'")
+                record_error(self)
                 return
 
+            if file_name is None:
+                if not self.interactive:
+                    raise Exception("pass the file_name")
+                file_name = input("Enter the filename: ")
+
+            # Stream the data of the MongoDB collection to the file
+            start = time.perf_counter()
+            fields = list(fields or self.projection_fields(projection))
+            schema = None
+            if flag in ("parquet", "arrow") or (flag == "csv" and not fields):
+                cursor = self.collection.find(filter or {}, projection, batch_size=batch_size)
+                fields, schema = scan_columns(batched(cursor, batch_size), flag, fields)
+            batches = 0
+            cursor = self.collection.find(filter or {}, projection, batch_size=batch_size)
+            with DocumentWriter(file_name, flag, fields, schema) as writer:
+                batch_start = time.perf_counter()
+                for documents in batched(cursor, batch_size):
+                    writer.write(documents)
+                    batches += 1
+                    record_batch(self, "save_data", len(documents), time.perf_counter() - batch_start)
+                    batch_start = time.perf_counter()
+            elapsed = time.perf_counter() - start
+
             # Check if the file is created or not
             if os.path.exists(file_name):
+                rate = writer.documents / elapsed if elapsed > 0 else 0.0
                 termcolor.cprint("File:", "green", attrs=["bold"], end=" ")
                 termcolor.cprint(f"'{file_name}'", "blue", attrs=["bold"], end=" ")
-                termcolor.cprint("saved successfully....", "green", attrs=["bold"])
+                termcolor.cprint("saved successfully....", "green", attrs=["bold"], end=" ")
+                print(f"{writer.documents} documents in {elapsed:.2f}s ({rate:,.0f} docs/s)")
             else:
                 raise Exception("File path is not exist")
 
+            return OperationResult(
+                "save_data",
+                rows=writer.documents,
+                batches=batches,
+                elapsed=elapsed,
+                path=file_name,
+                details={"fields": writer.fields},
+            )
+
         except Exception as e:
             termcolor.cprint("Error saving data:", "red", attrs=["bold"], end=" ")
             print(e)
+            record_error(self)
 
+    # Helper function
+    @staticmethod
+    def projection_fields(projection):
+        """
+        Return the top level fields of an inclusion projection, '_id' first
+        unless it is excluded, or an empty list for an exclusion projection.
+        """
+        if not projection:
+            return []
+        if isinstance(projection, dict):
+            included = [name for name, value in projection.items() if value and name != "_id"]
+            if not included:
+                return []
+            names = included if projection.get("_id", 1) == 0 else ["_id"] + included
+        else:
+            names = ["_id"] + [name for name in projection if name != "_id"]
+        return list(dict.fromkeys(name.split(".")[0] for name in names))
+
+    @instrumented
     def close_mongo_client(self):
         """
         Closes the MongoDB client connection.
@@ -610,3 +1926,4 @@ class Mongo_operation:
                     "Error closing MongoDB client:", "red", attrs=["bold"], end=" "
                 )
                 print(e)
+                record_error(self)
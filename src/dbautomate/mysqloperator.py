@@ -1,16 +1,130 @@
 import os
 import csv
 import time
+import tempfile
+import functools
+import threading
 import termcolor
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import mysql.connector
-from prettytable import PrettyTable
+from mysql.connector import pooling
+from .results import OperationResult
+from .metrics import instrumented, record_batch, record_error, record_retry
+from .columnar import ColumnarWriter, columnar_format, iter_row_batches
+
+# Error codes raised when LOAD DATA LOCAL INFILE is not allowed by the server
+# (ER_NOT_ALLOWED_COMMAND, ER_CLIENT_LOCAL_FILES_DISABLED) or by the
+# connector (CR_LOAD_DATA_LOCAL_INFILE_REJECTED).
+LOCAL_INFILE_DISABLED = (1148, 3948, 2068)
+
+# Arrow types of the MySQL field types, used for the columns of a Parquet or
+# Arrow export that are NULL in the whole first batch
+ARROW_TYPES = {
+    "TINY": "int64",
+    "SHORT": "int64",
+    "LONG": "int64",
+    "INT24": "int64",
+    "LONGLONG": "int64",
+    "YEAR": "int64",
+    "FLOAT": "float64",
+    "DOUBLE": "float64",
+    "DATE": "date32",
+    "NEWDATE": "date32",
+    "DATETIME": "timestamp[us]",
+    "TIMESTAMP": "timestamp[us]",
+}
+
+
+def pooled_connection(method):
+    """
+    Decorator for the public methods of 'MySQL_operation'.
+
+    In pooled mode the calling thread borrows a connection from the pool for
+    the duration of the call ('self.connection' resolves to it) and gives it
+    back afterwards. Nested calls reuse the connection already borrowed by the
+    thread. Without a pool the method is called unchanged.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.pool is None or getattr(self._local, "connection", None) is not None:
+            return method(self, *args, **kwargs)
+        try:
+            connection = self.checkout_connection()
+        except Exception as e:
+            termcolor.cprint(
+                "Error borrowing a connection:", "red", attrs=["bold"], end=" "
+            )
+            print(e)
+            record_error(self)
+            return None
+        self._local.connection = connection
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._local.connection = None
+            # Closing a pooled connection returns it to the pool
+            connection.close()
+
+    return wrapper
+
+
+class BorrowedConnection:
+    """
+    A connection borrowed from the pool with 'checkout_connection'. It is used
+    like the pooled connection; 'close()' gives it back through
+    'MySQL_operation.return_connection', which wakes up the threads waiting
+    for a free connection.
+    """
+
+    def __init__(self, connection, handler, pool):
+        self._connection = connection
+        self._handler = handler
+        self._pool = pool
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def close(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._handler.return_connection(connection, self._pool)
+
 
 class MySQL_operation:
-    def __init__(self):
+    metrics_name = "mysql"
+
+    def __init__(self, interactive=True):
+        """
+        Parameters:
+        - interactive (bool, optional): Ask with 'input()' for the options that are not passed
+          to a method (default is True). Use False for scripts, schedulers and worker pools.
+        """
+        self.interactive = interactive
         self.config = None
-        self.connection = None
+        self._connection = None
         self.cursor = None
+        self.pool = None
+        self.pool_timeout = 30
+        self.health_check = True
+        self._local = threading.local()
+        # Borrowed pool connections, notified when one is given back
+        self._pool_condition = threading.Condition()
+        self._borrowed = 0
+        self.schema_ttl = 300
+        self._schema_cache = {}
+        self._schema_lock = threading.Lock()
+        self.metric_hooks = []
+
+    @property
+    def connection(self):
+        # In pooled mode, the connection borrowed by the current thread
+        borrowed = getattr(self._local, "connection", None)
+        return self._connection if borrowed is None else borrowed
+
+    @connection.setter
+    def connection(self, value):
+        self._connection = value
 
     def __str__(self):
         termcolor.cprint("MySQLHandler Object -", "dark_grey", attrs=["bold"], end="\n")
@@ -18,21 +132,39 @@ class MySQL_operation:
         termcolor.cprint(f"{self.config}", "blue", attrs=["bold"], end="\n")
         termcolor.cprint("Connected:", attrs=["bold"], end=" ")
         termcolor.cprint(
-            f"{self.connection is not None}", "blue", attrs=["bold"], end="\n"
+            f"{self.connection is not None or self.pool is not None}",
+            "blue",
+            attrs=["bold"],
+            end="\n",
         )
+        if self.pool is not None:
+            termcolor.cprint("Pool size:", attrs=["bold"], end=" ")
+            termcolor.cprint(f"{self.pool.pool_size}", "blue", attrs=["bold"], end="\n")
         return ""
 
-    def connect_to_mysql(self, config, attempts=3, delay=2):
+    @instrumented
+    def connect_to_mysql(
+        self, config, attempts=3, delay=2, pool_size=None, pool_timeout=30, health_check=True
+    ):
         """
         Attempt to establish a connection to a MySQL database.
 
+        With 'pool_size' a pool of connections is created instead of a single
+        connection. Every public method then borrows a connection from the pool
+        and gives it back when it returns, so one object can be shared by the
+        threads of a thread pool.
+
         Parameters:
         - attempts (int): The maximum number of connection attempts (default is 3).
         - delay (int): The delay in seconds between connection attempts (default is 2).
+        - pool_size (int, optional): Number of pooled connections (default is None, no pool).
+        - pool_timeout (float, optional): Seconds to wait for a free pooled connection (default is 30).
+        - health_check (bool, optional): Ping (and reconnect) a pooled connection when it is borrowed (default is True).
 
         Returns:
         - mysql.connector.connection.MySQLConnection or None: The MySQL database connection object if successful,
-          or None if the connection attempts are exhausted.
+          or None if the connection attempts are exhausted. In pooled mode the
+          connection pool object is returned.
 
         Raises:
         - mysql.connector.Error: If a MySQL-specific error occurs during connection.
@@ -50,9 +182,14 @@ class MySQL_operation:
         # Initiate MySQL object
         mysql_handler=MySQL_connector()
         connection = mysql_handler.connect_to_mysql(config, attempts=3, delay=2)
+
+        # Pool of 8 connections shared by worker threads
+        pool = mysql_handler.connect_to_mysql(config, pool_size=8, pool_timeout=10)
         ```
         """
         self.config = config
+        self.pool_timeout = pool_timeout
+        self.health_check = health_check
         attempt = 1
         # Implement a reconnection routine
         while attempt < attempts + 1:
@@ -60,6 +197,17 @@ class MySQL_operation:
                 no_dict = ""
                 if type(self.config) != dict:
                     no_dict = "Not dict type"
+                if pool_size:
+                    self.pool = pooling.MySQLConnectionPool(
+                        pool_name=f"dbautomate_{id(self)}",
+                        pool_size=pool_size,
+                        **self.config,
+                    )
+                    termcolor.cprint(
+                        "Connected successfully....", "green", attrs=["bold"], end=" "
+                    )
+                    print(f"(pool of {pool_size} connections)")
+                    return self.pool
                 self.connection = mysql.connector.connect(**self.config)
                 self.cursor = self.connection.cursor()
                 termcolor.cprint(
@@ -76,21 +224,121 @@ class MySQL_operation:
                         end=" ",
                     )
                     print(e, no_dict)
+                    record_error(self)
                     return None
+                record_retry(self, "connect_to_mysql")
                 # progressive reconnect delay
                 time.sleep(delay**attempt)
                 attempt += 1
+        record_error(self)
         return None
 
-    def execute_query(self, query):
+    def add_metrics_hook(self, hook):
+        """
+        Register a metrics hook: a callable that receives a 'MetricEvent' after every
+        public method, every batch of the streaming methods and every connection retry.
+
+        Parameters:
+        - hook (callable): E.g. a 'dbautomate.metrics.Metrics' instance, or a function.
+
+        Example Usage:
+        ```python
+        from dbautomate.metrics import Metrics
+
+        metrics = Metrics()
+        mysql_handler.add_metrics_hook(metrics)
+        print(metrics.to_prometheus())
+        ```
+        """
+        self.metric_hooks.append(hook)
+
+    def remove_metrics_hook(self, hook):
+        """
+        Unregister a metrics hook added with 'add_metrics_hook'.
+        """
+        if hook in self.metric_hooks:
+            self.metric_hooks.remove(hook)
+
+    # Helper function
+    def checkout_connection(self):
+        """
+        Borrow a connection from the pool, waiting up to 'pool_timeout' seconds
+        for one to be given back when none is free. With 'health_check' the
+        connection is pinged (and reconnected if needed) before it is handed out.
+
+        Returns:
+        - BorrowedConnection: The borrowed connection, 'close()' gives it back to the pool.
+
+        Raises:
+        - mysql.connector.errors.PoolError: If no connection is free before the timeout.
+        """
+        deadline = time.monotonic() + self.pool_timeout
+        with self._pool_condition:
+            pool = self.pool
+            while True:
+                try:
+                    connection = pool.get_connection()
+                    break
+                except mysql.connector.errors.PoolError:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise mysql.connector.errors.PoolError(
+                            f"No free connection in the pool after {self.pool_timeout}s"
+                        )
+                    self._pool_condition.wait(remaining)
+            self._borrowed += 1
+        connection = BorrowedConnection(connection, self, pool)
+        if self.health_check:
+            try:
+                connection.ping(reconnect=True, attempts=2, delay=0)
+            except Exception:
+                connection.close()
+                raise
+        return connection
+
+    # Helper function
+    def return_connection(self, connection, pool):
+        """
+        Give a borrowed connection back to its pool, or disconnect it if the
+        pool was closed in the meantime, and wake up a waiting thread.
+        """
+        try:
+            if pool is self.pool:
+                connection.close()
+            else:
+                connection.disconnect()
+        except mysql.connector.Error:
+            pass
+        finally:
+            with self._pool_condition:
+                self._borrowed -= 1
+                self._pool_condition.notify()
+
+    @instrumented
+    @pooled_connection
+    def execute_query(self, query, result="table", max_rows=100, batch_size=10000, count_rows=False):
         """
         Execute a SQL query and display displays the results in a formatted table. Or simply execute query only.
 
+        The rows are pulled from the server in batches of 'batch_size'. "table"
+        and "preview" stop reading after the first 'max_rows' rows and discard
+        the rest of the result, so a large query is not read to the end just
+        to be shown. The other result modes do not render anything:
+        - "table": print the first 'max_rows' rows (default). With 'count_rows'
+          the whole result is read to print the total number of rows.
+        - "dataframe": return all the rows as a pandas DataFrame, built batch by batch.
+        - "preview": return the first 'max_rows' rows as a DataFrame.
+        - "batches": return an iterator of lists of row tuples (see 'iter_query').
+
         Parameters:
         - query (str): The SQL query to be executed.
+        - result (str, optional): The result mode (default is "table").
+        - max_rows (int, optional): Number of rows shown by "table" and returned by "preview" (default is 100).
+        - batch_size (int, optional): Number of rows fetched from the server per batch (default is 10000).
+        - count_rows (bool, optional): Read the whole result to count the rows of "table" (default is False).
 
         Returns:
-        None
+        None, or a DataFrame / an iterator of batches depending on 'result'.
 
         Raises:
         - Exception: If an error occurs during the query execution or result retrieval.
@@ -103,41 +351,161 @@ class MySQL_operation:
         # Execute a query
         select_query = "SELECT * FROM my_table"
         mysql_handler.execute_query(select_query)
+
+        # Use the results in the program
+        df = mysql_handler.execute_query(select_query, result="dataframe")
+        for rows in mysql_handler.execute_query(select_query, result="batches", batch_size=5000):
+            ...
         ```
         """
+        if result == "batches":
+            return self.iter_query(query, batch_size)
+        if result not in ("table", "dataframe", "preview"):
+            termcolor.cprint("Incorrect option:", "red", attrs=["bold"], end=" ")
+            print("choose 'table', 'dataframe', 'preview' or 'batches'")
+            record_error(self)
+            return None
+
+        cursor = None
         try:
-            self.cursor.execute(query)
-            try:
-                rows = self.cursor.fetchall()
-                column_names = [desc[0] for desc in self.cursor.description]
-                # Display results using PrettyTable
-                if rows:
-                    table = PrettyTable(column_names)
-                    table.align = "l"
-                    for row in rows:
-                        table.add_row(row)
+            cursor = self.connection.cursor()
+            cursor.execute(query)
+            # Schema changes make the cached metadata stale
+            if query.split(maxsplit=1)[0].lower() in ("create", "alter", "drop", "rename"):
+                self.invalidate_schema()
+
+            # The query does not return rows
+            if cursor.description is None:
+                termcolor.cprint("Query:", "green", attrs=["bold"], end=" ")
+                termcolor.cprint(f'"{query}"', "blue", attrs=["bold"], end=" ")
+                termcolor.cprint(
+                    "executed successfully.", "green", attrs=["bold"], end=" "
+                )
+                return None
+
+            column_names = [desc[0] for desc in cursor.description]
+            if result == "dataframe":
+                import pandas as pd
+
+                frames = []
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    frames.append(pd.DataFrame.from_records(rows, columns=column_names))
+                if not frames:
+                    return pd.DataFrame(columns=column_names)
+                return pd.concat(frames, ignore_index=True)
+
+            # One more row than shown tells whether the result is longer
+            rows = cursor.fetchmany(max_rows + 1)
+            more_rows = len(rows) > max_rows
+            rows = rows[:max_rows]
+            total_rows = None
+            if more_rows and count_rows and result == "table":
+                # Read the rest of the result without keeping it
+                total_rows = max_rows + 1
+                while True:
+                    rest = cursor.fetchmany(batch_size)
+                    if not rest:
+                        break
+                    total_rows += len(rest)
+            elif more_rows:
+                # Drop the unread rows instead of fetching them, the cursor
+                # can not be closed while the result is pending
+                self.connection.consume_results()
+
+            if result == "preview":
+                import pandas as pd
+
+                return pd.DataFrame.from_records(rows, columns=column_names)
+
+            # Display results using PrettyTable
+            if rows:
+                from prettytable import PrettyTable
+
+                table = PrettyTable(column_names)
+                table.align = "l"
+                for row in rows:
+                    table.add_row(row)
+                termcolor.cprint(
+                    "Query executed successfully....",
+                    "green",
+                    attrs=["bold"],
+                    end="\n",
+                )
+                print(table)
+                if total_rows is not None:
                     termcolor.cprint(
-                        "Query executed successfully....",
-                        "green",
+                        f"Showing {len(rows)} of {total_rows} rows.",
+                        "dark_grey",
                         attrs=["bold"],
-                        end="\n",
                     )
-                    print(table)
-                else:
+                elif more_rows:
                     termcolor.cprint(
-                        "No results found.", "red", attrs=["bold"], end=" "
+                        f"Showing the first {len(rows)} rows.",
+                        "dark_grey",
+                        attrs=["bold"],
                     )
-
-            except Exception as e:
-                termcolor.cprint("Query:", "green", attrs=["bold"], end=" ")
-                termcolor.cprint(f'"{query}"', "blue", attrs=["bold"], end=" ")
+            else:
                 termcolor.cprint(
-                    "executed successfully.", "green", attrs=["bold"], end=" "
+                    "No results found.", "red", attrs=["bold"], end=" "
                 )
-                return
         except Exception as e:
             termcolor.cprint("Error executing query:", "red", attrs=["bold"], end=" ")
             print(e)
+            record_error(self)
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+    def iter_query(self, query, batch_size=10000, as_dicts=False):
+        """
+        Execute a SQL query and yield its rows in lists of at most 'batch_size'
+        tuples (or dicts of column name to value with 'as_dicts'), reading them
+        from the server only when they are needed.
+
+        The iterator keeps its own connection until it is exhausted or closed
+        (a pooled connection, or the single connection of the object, which
+        should not be used for other queries in the meantime).
+
+        Parameters:
+        - query (str): The SQL query to be executed.
+        - batch_size (int, optional): Number of rows per batch (default is 10000).
+        - as_dicts (bool, optional): Yield the rows as dicts (default is False).
+
+        Yields:
+        - list: The rows of the next batch.
+
+        Example Usage:
+        ```python
+        for rows in mysql_handler.iter_query("SELECT * FROM my_table", batch_size=5000):
+            process(rows)
+        ```
+        """
+        if self.pool is not None:
+            connection = self.checkout_connection()
+        else:
+            connection = self.connection
+        cursor = connection.cursor()
+        try:
+            if self.pool is not None and self.config.get("database"):
+                cursor.execute(f"use {self.config['database']}")
+            cursor.execute(query)
+            names = [desc[0] for desc in cursor.description] if as_dicts else None
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if as_dicts:
+                    rows = [dict(zip(names, row)) for row in rows]
+                yield rows
+        finally:
+            try:
+                cursor.close()
+            finally:
+                if self.pool is not None:
+                    connection.close()
 
     # Helper function
     def fetch_db(self, db_name):
@@ -155,6 +523,11 @@ class MySQL_operation:
         Raises:
         - Exception: If an error occurs during the database selection or retrieval.
         """
+        # A pooled connection may still use the database selected by its
+        # previous borrower, so switch back to the configured one
+        if db_name == "" and self.pool is not None and self.config.get("database"):
+            db_name = self.config["database"]
+
         if db_name == "":
             cursor = self.connection.cursor()
             query_select = "select database()"
@@ -171,36 +544,155 @@ class MySQL_operation:
             except Exception as e:
                 termcolor.cprint("Error using db_name:", "red", attrs=["bold"], end=" ")
                 print(e, end="")
+                record_error(self)
                 return None, None
 
     # Helper function
-    def fetch_tables(self, cursor):
+    def fetch_tables(self, cursor, db_name=None):
         """
         Retrieve a list of table names in the connected database using the provided database cursor.
 
+        When 'db_name' is given the list is cached for 'schema_ttl' seconds (see 'invalidate_schema').
+
         Parameters:
         - cursor: The database cursor used to execute the query.
+        - db_name (str, optional): The name of the active database, used as the cache key.
 
         Returns:
         - list: A list containing the names of the tables in the connected database.
         """
-        query_tables = "show tables"
-        cursor.execute(query_tables)
-        tables = cursor.fetchall()
-        list_table = [table[0] for table in tables]
-        return list_table
 
-    def insert_data(self, table_name, values, db_name=""):
+        def load():
+            query_tables = "show tables"
+            cursor.execute(query_tables)
+            tables = cursor.fetchall()
+            return [self._text(table[0]) for table in tables]
+
+        if db_name is None:
+            return load()
+        return self._cached((db_name, None), load)
+
+    # Helper function
+    def fetch_table_schema(self, cursor, table_name, db_name):
+        """
+        Retrieve the columns, column types and primary key of a table from
+        'information_schema'. The result is cached for 'schema_ttl' seconds, so
+        repeated inserts do not query the server again.
+
+        Parameters:
+        - cursor: The database cursor used to execute the query.
+        - table_name (str): The name of the table.
+        - db_name (str): The name of the database of the table.
+
+        Returns:
+        - dict: {'columns': [names in table order], 'types': {name: column type},
+          'primary_key': [names]}.
+
+        Example Usage:
+        ```python
+        cursor, db_name = mysql_handler.fetch_db("my_database")
+        schema = mysql_handler.fetch_table_schema(cursor, "example_table", db_name)
+        print(schema["columns"], schema["primary_key"])
+        ```
+        """
+
+        def load():
+            cursor.execute(
+                "SELECT column_name, column_type, column_key "
+                "FROM information_schema.columns "
+                "WHERE table_schema = %s AND table_name = %s "
+                "ORDER BY ordinal_position",
+                (db_name, table_name),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                # No access to information_schema, read the result metadata only
+                cursor.execute(f"SELECT * FROM {table_name} LIMIT 0")
+                cursor.fetchall()
+                columns = [desc[0] for desc in cursor.description]
+                return {"columns": columns, "types": {}, "primary_key": []}
+            rows = [tuple(self._text(value) for value in row) for row in rows]
+            return {
+                "columns": [row[0] for row in rows],
+                "types": {row[0]: row[1] for row in rows},
+                "primary_key": [row[0] for row in rows if row[2] == "PRI"],
+            }
+
+        return self._cached((db_name, table_name), load)
+
+    def invalidate_schema(self, db_name=None, table_name=None):
+        """
+        Drop cached schema metadata, e.g. after altering or creating tables
+        outside of this object.
+
+        Parameters:
+        - db_name (str, optional): Only drop the entries of this database. If not provided, the whole cache is dropped.
+        - table_name (str, optional): Only drop the columns of this table (and the table list of its database).
+
+        Returns:
+        None
+
+        Example Usage:
+        ```python
+        mysql_handler.invalidate_schema()  # everything
+        mysql_handler.invalidate_schema("my_database", "example_table")
+        ```
+        """
+        with self._schema_lock:
+            if db_name is None:
+                self._schema_cache.clear()
+                return
+            for key in list(self._schema_cache):
+                if key[0] != db_name:
+                    continue
+                if table_name is None or key[1] in (None, table_name):
+                    del self._schema_cache[key]
+
+    def _cached(self, key, load):
+        now = time.monotonic()
+        with self._schema_lock:
+            entry = self._schema_cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+        value = load()
+        with self._schema_lock:
+            self._schema_cache[key] = (now + self.schema_ttl, value)
+        return value
+
+    @staticmethod
+    def _text(value):
+        # information_schema values may come back as bytes with some servers
+        if isinstance(value, (bytes, bytearray)):
+            return value.decode("utf-8")
+        return value
+
+    @instrumented
+    @pooled_connection
+    def insert_data(
+        self, table_name, values, db_name="", columns=None, skip_columns=None, many=None
+    ):
         """
         Insert data into a specified table in the connected database.
 
+        The columns can be given explicitly with 'columns', or as the columns of
+        the table without 'skip_columns' (e.g. an auto-increment id). If neither
+        is given, an interactive object asks whether the 'id' column is missing
+        from the values, while a non-interactive one (see '__init__') skips the
+        first column only when it is the primary key and every row has one
+        value less than the table. Likewise 'many' tells whether 'values' holds
+        several rows; when it is None it is asked for, or detected from 'values'
+        in non-interactive mode.
+
         Parameters:
         - table_name (str): The name of the table where the data will be inserted.
         - values (list or tuple): The values to be inserted into the table.
         - db_name (str, optional): The name of the database. If not provided, the active database is used.
+        - columns (list, optional): The columns the values are inserted into, in order.
+        - skip_columns (list, optional): Columns of the table that the values do not provide.
+        - many (bool, optional): True for a list of rows, False for a single row.
 
         Returns:
-        None
+        - OperationResult or None: The inserted rows and the elapsed time, or None if nothing was inserted.
 
         Raises:
         - Exception: If an error occurs during the data insertion process.
@@ -221,24 +713,32 @@ class MySQL_operation:
             (3, 'Bob Johnson', 22)
         ]
         mysql_handler.insert_data("example_table", values_multiple_entries, db_name="my_database")
+
+        # Without prompts, the 'id' column is filled by the server
+        result = mysql_handler.insert_data(
+            "example_table", [('John Doe', 25)], skip_columns=["id"], many=True
+        )
+        print(result.rows, result.elapsed)
         ```
         """
+        start = time.perf_counter()
         # Fetch the database and cursor
         cursor, db_name = self.fetch_db(db_name)
         if db_name == None:
             return
-        else:
+        elif self.interactive:
             print(f"Your database: '{db_name}'")
 
         try:
             # Fetch the tables of the database
-            list_table = self.fetch_tables(cursor)
+            list_table = self.fetch_tables(cursor, db_name)
 
             if table_name in list_table:
-                termcolor.cprint("Your table:", "green", attrs=["bold"], end=" ")
-                termcolor.cprint(f"'{table_name}'", "blue", attrs=["bold"], end=" ")
-                termcolor.cprint(", present in the database", end=" ")
-                termcolor.cprint(f"'{db_name}'", "blue", attrs=["bold"], end="\n")
+                if self.interactive:
+                    termcolor.cprint("Your table:", "green", attrs=["bold"], end=" ")
+                    termcolor.cprint(f"'{table_name}'", "blue", attrs=["bold"], end=" ")
+                    termcolor.cprint(", present in the database", end=" ")
+                    termcolor.cprint(f"'{db_name}'", "blue", attrs=["bold"], end="\n")
 
             else:
                 termcolor.cprint("Table not found:", "red", attrs=["bold"], end=" ")
@@ -246,55 +746,72 @@ class MySQL_operation:
                 print(f"Select one of the following tables ", end="")
                 termcolor.cprint(f"{list_table}", attrs=["bold"], end=" ")
                 print("or create new table or use another database.")
+                record_error(self)
                 return
         except Exception as e:
             termcolor.cprint(
                 "Error fetching the tables:", "red", attrs=["bold"], end=" "
             )
             print(e)
+            record_error(self)
             return
 
+        # Single entry or multiple entries
+        if many is None and not self.interactive:
+            many = (
+                isinstance(values, list)
+                and len(values) > 0
+                and all(isinstance(row, (list, tuple)) for row in values)
+            )
+
         # Fetch the columns of table
         try:
-            query_table = f"select * from {table_name}"
-            cursor.execute(query_table)
-            cursor.fetchall()
-            desc = cursor.description
-            columns = [t[0] for t in desc]
-
-            flag = input(
-                "Enter yes if the first value of argument is 'id' and you have not provided: "
-            ).lower()
-            if flag == "y" or flag == "yes":
-                columns = columns[1:]
-            d = str(tuple(columns))
-            column_table = d.replace("'", "")
+            if columns is not None:
+                columns = list(columns)
+            else:
+                schema = self.fetch_table_schema(cursor, table_name, db_name)
+                columns = list(schema["columns"])
+                if skip_columns is not None:
+                    columns = [column for column in columns if column not in skip_columns]
+                elif self.interactive:
+                    flag = input(
+                        "Enter yes if the first value of argument is 'id' and you have not provided: "
+                    ).lower()
+                    if flag == "y" or flag == "yes":
+                        columns = columns[1:]
+                else:
+                    rows = values if many else [values]
+                    if (
+                        columns[:1] == schema["primary_key"]
+                        and len(rows) > 0
+                        and all(len(row) == len(columns) - 1 for row in rows)
+                    ):
+                        columns = columns[1:]
 
         except Exception as e:
             termcolor.cprint(
                 "Error fetching column names:", "red", attrs=["bold"], end=" "
             )
             print(e)
+            record_error(self)
             return
 
         # Write query and insert the data
-        query = f"INSERT INTO {table_name} {column_table} VALUES ({', '.join('%s' for _ in columns)})"
+        query = self.insert_query(table_name, columns)
         try:
             tmp = 0
-            while tmp < 3:
+            while many is None and tmp < 3:
                 flag_insert = input(
                     "Are you inserting more than one entry?(y/n) "
                 ).lower()
                 if flag_insert == "y":
-                    cursor.executemany(query, values)
-                    break
+                    many = True
                 elif flag_insert == "n":
-                    cursor.execute(query, values)
-                    break
+                    many = False
                 else:
                     print("Incorrect option..")
                 tmp += 1
-            if tmp == 3:
+            if many is None:
                 termcolor.cprint(
                     "Program exited without inserting",
                     "magenta",
@@ -302,24 +819,71 @@ class MySQL_operation:
                     end=" ",
                 )
                 return
+            if many:
+                cursor.executemany(query, values)
+                rows = len(values)
+            else:
+                cursor.execute(query, values)
+                rows = 1
             self.connection.commit()
             termcolor.cprint(
                 "Inserted successfully....", "green", attrs=["bold"], end=" "
             )
+            return OperationResult(
+                "insert_data",
+                rows=rows,
+                batches=1,
+                elapsed=time.perf_counter() - start,
+            )
         except Exception as e:
             termcolor.cprint("Error inserting data:", "red", attrs=["bold"], end=" ")
             print(e)
+            record_error(self)
+
+    # Helper function
+    def insert_query(self, table_name, columns):
+        """
+        Build a parameterized INSERT statement for the given table and columns.
+
+        Parameters:
+        - table_name (str): The name of the table where the data will be inserted.
+        - columns (list): The column names, in the order of the values that will be bound.
+
+        Returns:
+        - str: The INSERT query with one '%s' placeholder per column.
+        """
+        column_table = ", ".join(str(column) for column in columns)
+        placeholders = ", ".join("%s" for _ in columns)
+        return f"INSERT INTO {table_name} ({column_table}) VALUES ({placeholders})"
 
-    def bulk_insert(self, table_name, filepath, db_name=""):
+    @instrumented
+    @pooled_connection
+    def bulk_insert(
+        self, table_name, filepath, db_name="", chunksize=None, columns=None, skip_columns=None
+    ):
         """
         Reads data from a CSV file located at the specified 'filepath',
         replaces NaN values with None, and inserts the data into the
         specified database table ('table_name') using the 'insert_data' method.
+        Parquet ('.parquet') and Arrow IPC ('.arrow', '.feather') files are
+        always streamed in batches (10000 rows unless 'chunksize' is given).
+
+        When 'chunksize' is given the file is streamed instead: it is read
+        'chunksize' rows at a time and every chunk is sent and committed as its
+        own batch, so memory stays bounded by the chunk size and not by the
+        file size. In this mode the CSV header is used as the column list of
+        the INSERT statement and the progress (batches, rows/s) is printed.
 
         Args:
         - table_name (str): The name of the database table to insert data into.
-        - filepath (str): The path to the CSV file containing the data.
+        - filepath (str): The path to the CSV, Parquet or Arrow file containing the data.
         - db_name (str, optional): The name of the database (default is an empty string).
+        - chunksize (int, optional): Number of rows per batch for the streaming mode (default is None).
+        - columns (list, optional): The table columns of the fields of the file, in order.
+        - skip_columns (list, optional): Columns of the table that the file does not provide (see 'insert_data').
+
+        Returns:
+        - OperationResult or None: The inserted rows and the elapsed time, or None if an error occurred.
 
         Raises:
         - Exception: If an error occurs during file execution, an exception is caught
@@ -329,29 +893,304 @@ class MySQL_operation:
         ```python
         mysql_handler.bulk_insert("your_table", "/path/to/your/data.csv", "your_database")
         # database is optional
+
+        # Stream a large file in batches of 50,000 rows
+        mysql_handler.bulk_insert("your_table", "/path/to/big.csv", chunksize=50000)
         ```
         """
+        if columnar_format(filepath) is not None and chunksize is None:
+            chunksize = 10000
+        if chunksize is not None:
+            return self.stream_insert(
+                table_name, filepath, db_name, chunksize, columns, skip_columns
+            )
         try:
+            import pandas as pd
+
             df = pd.read_csv(filepath)
             df = df.replace({float("nan"): None})
             tuple_list = [tuple(x) for x in df.to_numpy()]
-            self.insert_data(table_name, tuple_list, db_name)
+            result = self.insert_data(
+                table_name, tuple_list, db_name, columns, skip_columns, many=True
+            )
+            if result is not None:
+                result.operation = "bulk_insert"
+                result.path = filepath
+            return result
         except Exception as e:
             termcolor.cprint(
                 "Error with file execution:", "red", attrs=["bold"], end=" "
             )
             print(e)
+            record_error(self)
+
+    @instrumented
+    @pooled_connection
+    def stream_insert(
+        self, table_name, filepath, db_name="", chunksize=10000, columns=None, skip_columns=None
+    ):
+        """
+        Stream a CSV, Parquet or Arrow IPC file into a table in batches of 'chunksize' rows.
+
+        Each chunk is converted to a list of tuples (NaN values become None),
+        sent with a single 'executemany' and committed before the next chunk is
+        read, so only one chunk is held in memory at a time. The columns of the
+        file header are used as the columns of the INSERT statement, unless
+        'columns' maps every field of the file to a table column, or
+        'skip_columns' is given: then the fields are the columns of the table
+        without 'skip_columns', in order (as in 'insert_data').
+
+        Parameters:
+        - table_name (str): The name of the database table to insert data into.
+        - filepath (str): The path to the CSV, Parquet or Arrow file containing the data.
+        - db_name (str, optional): The name of the database. If not provided, the active database is used.
+        - chunksize (int, optional): Number of rows per batch (default is 10000).
+        - columns (list, optional): One table column per field of the file; fields mapped to None are skipped.
+        - skip_columns (list, optional): Columns of the table that the file does not provide.
+
+        Returns:
+        - OperationResult or None: The inserted rows, batches and elapsed time, or None if an error occurred.
+
+        Example Usage:
+        ```python
+        result = mysql_handler.stream_insert("your_table", "/path/to/big.csv", chunksize=50000)
+        print(result.rows, result.batches, result.rows_per_second)
+        ```
+        """
+        if chunksize is None or chunksize < 1:
+            termcolor.cprint("Invalid chunksize:", "red", attrs=["bold"], end=" ")
+            print("'chunksize' should be a positive integer.")
+            record_error(self)
+            return None
+
+        cursor, db_name = self.fetch_db(db_name)
+        if db_name == None:
+            return None
+
+        total_rows = 0
+        batch_no = 0
+        start = time.perf_counter()
+        try:
+            query = None
+            keep = None
+            if columns is None and skip_columns is not None:
+                table_columns = self.fetch_table_schema(cursor, table_name, db_name)["columns"]
+                columns = [column for column in table_columns if column not in skip_columns]
+            if columnar_format(filepath) is not None:
+                batches = iter_row_batches(filepath, chunksize)
+            else:
+                batches = self.csv_row_batches(filepath, chunksize)
+            batch_start = time.perf_counter()
+            for header, rows in batches:
+                if query is None:
+                    names = list(header) if columns is None else list(columns)
+                    keep = [i for i, name in enumerate(names) if name is not None]
+                    query = self.insert_query(table_name, [names[i] for i in keep])
+                if len(keep) != len(header):
+                    rows = [tuple(row[i] for i in keep) for row in rows]
+                cursor.executemany(query, rows)
+                self.connection.commit()
+
+                batch_no += 1
+                total_rows += len(rows)
+                record_batch(self, "stream_insert", len(rows), time.perf_counter() - batch_start)
+                elapsed = time.perf_counter() - start
+                rate = total_rows / elapsed if elapsed > 0 else 0.0
+                termcolor.cprint(f"Batch {batch_no}:", "blue", attrs=["bold"], end=" ")
+                print(f"{len(rows)} rows ({total_rows} total, {rate:,.0f} rows/s)")
+                batch_start = time.perf_counter()
+        except Exception as e:
+            termcolor.cprint(
+                "Error with file execution:", "red", attrs=["bold"], end=" "
+            )
+            print(f"{e} (after {batch_no} batches, {total_rows} rows committed)")
+            record_error(self)
+            return None
+
+        elapsed = time.perf_counter() - start
+        rate = total_rows / elapsed if elapsed > 0 else 0.0
+        termcolor.cprint("Inserted successfully....", "green", attrs=["bold"], end=" ")
+        print(f"{total_rows} rows in {batch_no} batches, {elapsed:.2f}s ({rate:,.0f} rows/s)")
+        return OperationResult(
+            "stream_insert",
+            rows=total_rows,
+            batches=batch_no,
+            elapsed=elapsed,
+            path=filepath,
+        )
+
+    # Helper function
+    def csv_row_batches(self, filepath, chunksize):
+        """
+        Yield (column_names, list of row tuples) for every 'chunksize' rows of a
+        CSV file, with NaN values replaced by None.
+        """
+        import pandas as pd
+
+        for chunk in pd.read_csv(filepath, chunksize=chunksize):
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            yield list(chunk.columns), list(chunk.itertuples(index=False, name=None))
+
+    @instrumented
+    @pooled_connection
+    def load_data_infile(
+        self, table_name, source, db_name="", columns=None, fallback_chunksize=10000
+    ):
+        """
+        Bulk load a CSV file or a DataFrame into a table with MySQL's native
+        'LOAD DATA LOCAL INFILE' loader.
+
+        A DataFrame is first spooled to a temporary CSV file. The fields of the
+        file are mapped to the table by the CSV header (or by 'columns'); fields
+        that are not columns of the table are skipped and empty fields are
+        loaded as NULL. If the server or the connection does not allow local
+        infile, the data is inserted with batched 'executemany' instead (see
+        'stream_insert').
+
+        Note: the connection has to be opened with 'allow_local_infile': True in
+        the config, and the server needs 'local_infile' enabled.
+
+        Parameters:
+        - table_name (str): The name of the database table to load the data into.
+        - source (str or pandas.DataFrame): Path to a CSV file with a header row, or a DataFrame.
+        - db_name (str, optional): The name of the database. If not provided, the active database is used.
+        - columns (list, optional): Table column for every field of the file, in file order.
+        - fallback_chunksize (int, optional): Batch size used by the 'executemany' fallback (default is 10000).
+
+        Returns:
+        - OperationResult or None: The loaded rows and the elapsed time, or None if an error occurred.
+          'details["engine"]' is 'load_data' or 'executemany' (fallback).
+
+        Example Usage:
+        ```python
+        config = {'host': 'your_mysql_host', 'user': 'user', 'password': 'pwd',
+                  'database': 'db', 'allow_local_infile': True}
+        mysql_handler.connect_to_mysql(config)
+        mysql_handler.load_data_infile("your_table", "/path/to/big.csv")
+
+        # Load a DataFrame
+        mysql_handler.load_data_infile("your_table", df)
+        ```
+        """
+        cursor, db_name = self.fetch_db(db_name)
+        if db_name == None:
+            return None
+
+        spooled = None
+        try:
+            if not isinstance(source, (str, os.PathLike)):
+                spooled = tempfile.NamedTemporaryFile(
+                    mode="w", suffix=".csv", newline="", encoding="utf-8", delete=False
+                )
+                with spooled:
+                    source.to_csv(spooled, index=False, na_rep="")
+                filepath = spooled.name
+            else:
+                filepath = source
+
+            # Read the header and the line terminator of the file
+            with open(filepath, "r", newline="", encoding="utf-8") as csv_file:
+                first_line = csv_file.readline()
+            header = next(csv.reader([first_line]))
+            line_end = "\\r\\n" if first_line.endswith("\r\n") else "\\n"
+
+            # Map the fields of the file to the columns of the table
+            table_columns = self.fetch_table_schema(cursor, table_name, db_name)["columns"]
+            names = header if columns is None else list(columns)
+            if len(names) != len(header):
+                raise Exception(
+                    f"'columns' has {len(names)} entries but the file has {len(header)} fields."
+                )
+            mapping = [name if name in table_columns else None for name in names]
+            if not any(mapping):
+                raise Exception(
+                    f"None of the fields {header} are columns of the table '{table_name}'."
+                )
+
+            variables = ", ".join(
+                f"@v{i}" if name else "@dummy" for i, name in enumerate(mapping)
+            )
+            assignments = ", ".join(
+                f"{name} = NULLIF(@v{i}, '')" for i, name in enumerate(mapping) if name
+            )
+            path = os.path.abspath(filepath).replace("\\", "/").replace("'", "\\'")
+            query = (
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table_name} "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                f"LINES TERMINATED BY '{line_end}' IGNORE 1 LINES "
+                f"({variables}) SET {assignments}"
+            )
+
+            start = time.perf_counter()
+            try:
+                cursor.execute(query)
+            except mysql.connector.Error as e:
+                if e.errno not in LOCAL_INFILE_DISABLED:
+                    raise
+                termcolor.cprint(
+                    "LOCAL INFILE is disabled, using executemany:",
+                    "magenta",
+                    attrs=["bold"],
+                    end=" ",
+                )
+                print(e)
+                result = self.stream_insert(
+                    table_name, filepath, db_name, fallback_chunksize, mapping
+                )
+                if result is not None:
+                    result.operation = "load_data_infile"
+                    result.details["engine"] = "executemany"
+                return result
+            rows = cursor.rowcount
+            self.connection.commit()
+            elapsed = time.perf_counter() - start
+            rate = rows / elapsed if elapsed > 0 else 0.0
+            termcolor.cprint("Loaded successfully....", "green", attrs=["bold"], end=" ")
+            print(f"{rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+            return OperationResult(
+                "load_data_infile",
+                rows=rows,
+                batches=1,
+                elapsed=elapsed,
+                path=None if spooled is not None else filepath,
+                details={"engine": "load_data"},
+            )
+
+        except Exception as e:
+            termcolor.cprint("Error loading data:", "red", attrs=["bold"], end=" ")
+            print(e)
+            record_error(self)
+            return None
+        finally:
+            if spooled is not None and os.path.exists(spooled.name):
+                os.remove(spooled.name)
 
-    def save_data(self, table_name, db_name=""):
+    @instrumented
+    @pooled_connection
+    def save_data(
+        self, table_name, db_name="", batch_size=10000, output_path=None, file_format=None
+    ):
         """
-        Save data from a specified table in the connected database to a CSV file.
+        Save data from a specified table in the connected database to a CSV, Parquet or Arrow IPC file.
+
+        The rows are streamed with an unbuffered cursor: they are pulled from the
+        server 'batch_size' rows at a time with 'fetchmany' and written to the
+        file as they arrive, so the client memory does not grow with the size
+        of the table. Parquet files get one row group per batch and Arrow IPC
+        files one record batch per batch ('pyarrow' is needed for both).
 
         Parameters:
         - table_name (str): The name of the table from which data will be saved.
         - db_name (str, optional): The name of the database where the given table is present. If not provided, the active database is used.
+        - batch_size (int, optional): Number of rows fetched from the server per batch (default is 10000).
+        - output_path (str, optional): Path of the file. If not provided, an interactive object asks
+          for the filename and a non-interactive one writes '<table_name>.<file_format>' ('.csv' by default).
+        - file_format (str, optional): 'csv', 'parquet' or 'arrow'. If not provided, it is taken from
+          the extension of the file ('.parquet', '.arrow', '.feather'), else 'csv'.
 
         Returns:
-        None
+        - OperationResult or None: The saved rows, batches, elapsed time and file path, or None if an error occurred.
 
         Raises:
         - Exception: If an error occurs during the data retrieval or CSV file creation process.
@@ -366,6 +1205,12 @@ class MySQL_operation:
 
         # Save data from the 'another_table' in the specified database to a CSV file
         mysql_handler.save_data("another_table", db_name="my_database")
+
+        # Without prompt
+        result = mysql_handler.save_data("example_table", output_path="exports/example.csv")
+
+        # Columnar export
+        mysql_handler.save_data("example_table", output_path="example.parquet")
         ```
         """
         cursor, db_name = self.fetch_db(db_name)
@@ -373,7 +1218,7 @@ class MySQL_operation:
             return
 
         try:
-            list_table = self.fetch_tables(cursor)
+            list_table = self.fetch_tables(cursor, db_name)
 
             if table_name not in list_table:
                 termcolor.cprint("Table not found:", "red", attrs=["bold"], end=" ")
@@ -381,6 +1226,7 @@ class MySQL_operation:
                 print(f"Select one of the following tables ", end="")
                 termcolor.cprint(f"{list_table}", attrs=["bold"], end=" ")
                 print("or create new table or use another database.")
+                record_error(self)
                 return
 
         except Exception as e:
@@ -388,35 +1234,229 @@ class MySQL_operation:
                 "Error fetching the tables:", "red", attrs=["bold"], end=" "
             )
             print(e)
+            record_error(self)
             return
 
+        export_cursor = None
         try:
-            query = f"SELECT * FROM {table_name}"
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            column_names = [desc[0] for desc in cursor.description]
-            csv_file_name = input("Enter the filename: ")
+            if output_path is not None:
+                csv_file_name = output_path
+            elif self.interactive:
+                csv_file_name = input("Enter the filename: ")
+            else:
+                csv_file_name = f"{table_name}.{file_format or 'csv'}"
             # Create the full path for the output CSV file
             file_path = os.path.join(os.getcwd(), csv_file_name)
-            with open(file_path, "w", newline="") as csv_file:
-                csv_writer = csv.writer(csv_file)
-                csv_writer.writerow(column_names)
-                csv_writer.writerows(rows)
-            if os.path.exists(csv_file_name):
+            # Check the format before the query starts streaming the table
+            if file_format is None:
+                file_format = columnar_format(file_path) or "csv"
+            if file_format not in ("csv", "parquet", "arrow"):
+                raise Exception(
+                    f"Unknown file format '{file_format}', choose 'csv', 'parquet' or 'arrow'."
+                )
+
+            # Unbuffered cursor, the rows stay on the server until fetched
+            export_cursor = self.connection.cursor(buffered=False)
+            query = f"SELECT * FROM {table_name}"
+            export_cursor.execute(query)
+            column_names = [desc[0] for desc in export_cursor.description]
+
+            total_rows = 0
+            batches = 0
+            start = time.perf_counter()
+            if file_format == "csv":
+                with open(file_path, "w", newline="") as csv_file:
+                    csv_writer = csv.writer(csv_file)
+                    csv_writer.writerow(column_names)
+                    csv_file.flush()
+                    while True:
+                        batch_start = time.perf_counter()
+                        rows = export_cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        csv_writer.writerows(rows)
+                        csv_file.flush()
+                        total_rows += len(rows)
+                        batches += 1
+                        record_batch(self, "save_data", len(rows), time.perf_counter() - batch_start)
+            else:
+                null_types = {
+                    desc[0]: ARROW_TYPES.get(mysql.connector.FieldType.get_info(desc[1]), "string")
+                    for desc in export_cursor.description
+                }
+                with ColumnarWriter(file_path, file_format, column_names, null_types) as writer:
+                    while True:
+                        batch_start = time.perf_counter()
+                        rows = export_cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        writer.write_rows(rows)
+                        total_rows += len(rows)
+                        batches += 1
+                        record_batch(self, "save_data", len(rows), time.perf_counter() - batch_start)
+            elapsed = time.perf_counter() - start
+
+            # The workers of 'export_tables' report through the caller
+            if os.path.exists(file_path) and not getattr(self._local, "quiet", False):
                 termcolor.cprint("File:", "green", attrs=["bold"], end=" ")
                 termcolor.cprint(f"'{csv_file_name}'", "blue", attrs=["bold"], end=" ")
-                termcolor.cprint("saved successfully....", "green", attrs=["bold"])
+                termcolor.cprint("saved successfully....", "green", attrs=["bold"], end=" ")
+                print(f"{total_rows} rows in {elapsed:.2f}s")
+            return OperationResult(
+                "save_data",
+                rows=total_rows,
+                batches=batches,
+                elapsed=elapsed,
+                path=file_path,
+            )
 
         except Exception as e:
             termcolor.cprint("Error saving data:", "red", attrs=["bold"], end=" ")
             print(e)
+            record_error(self)
+        finally:
+            if export_cursor is not None:
+                try:
+                    export_cursor.close()
+                except Exception:
+                    pass
+
+    @instrumented
+    @pooled_connection
+    def list_tables(self, db_name=""):
+        """
+        Retrieve the names of the tables of a database.
+
+        Parameters:
+        - db_name (str, optional): The name of the database. If not provided, the active database is used.
+
+        Returns:
+        - tuple: (db_name, list of table names), or (None, None) if the database can not be used.
 
+        Example Usage:
+        ```python
+        db_name, tables = mysql_handler.list_tables("my_database")
+        ```
+        """
+        cursor, db_name = self.fetch_db(db_name)
+        if db_name == None:
+            return None, None
+        return db_name, self.fetch_tables(cursor, db_name)
+
+    @instrumented
+    def export_tables(
+        self, tables=None, db_name="", output_dir=".", max_workers=4, batch_size=10000
+    ):
+        """
+        Export several tables (or a whole database) to CSV files concurrently.
+
+        Every table is streamed with 'save_data' to '<output_dir>/<table>.csv'
+        by a pool of 'max_workers' threads. In pooled mode the threads borrow
+        connections from the pool; otherwise each thread opens its own
+        connection with the config of 'connect_to_mysql' and closes it at the
+        end. The database and its table list are resolved only once.
+
+        Parameters:
+        - tables (list, optional): The tables to export. If not provided, all the tables of the database are exported.
+        - db_name (str, optional): The name of the database. If not provided, the active database is used.
+        - output_dir (str, optional): Directory of the CSV files (default is the current directory).
+        - max_workers (int, optional): Number of tables exported at the same time (default is 4).
+        - batch_size (int, optional): Number of rows fetched from the server per batch (default is 10000).
+
+        Returns:
+        - OperationResult or None: Total rows, number of exported tables, elapsed time and the failed
+          tables in 'errors'. 'details["tables"]' maps each exported table to its own result.
+
+        Example Usage:
+        ```python
+        # Snapshot of the whole database with 8 connections
+        mysql_handler.connect_to_mysql(config, pool_size=8)
+        result = mysql_handler.export_tables(db_name="my_database", output_dir="backup", max_workers=8)
+        print(result.rows, result.rows_per_second, result.errors)
+        ```
+        """
+        db_name, list_table = self.list_tables(db_name)
+        if db_name == None:
+            return None
+
+        if tables is None:
+            tables = list_table
+        missing = [table for table in tables if table not in list_table]
+        if missing:
+            termcolor.cprint("Table not found:", "red", attrs=["bold"], end=" ")
+            print(f"{missing} not present in the database '{db_name}'.")
+            record_error(self)
+            return None
+
+        os.makedirs(output_dir, exist_ok=True)
+        opened = []
+        opened_lock = threading.Lock()
+
+        def export(table):
+            # Without a pool every worker thread uses its own connection
+            if self.pool is None and getattr(self._local, "connection", None) is None:
+                connection = mysql.connector.connect(**self.config)
+                with opened_lock:
+                    opened.append(connection)
+                self._local.connection = connection
+            self._local.quiet = True
+            return self.save_data(
+                table,
+                db_name,
+                batch_size=batch_size,
+                output_path=os.path.join(output_dir, f"{table}.csv"),
+            )
+
+        summary = OperationResult("export_tables", path=output_dir)
+        summary.details["tables"] = {}
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(export, table): table for table in tables}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    table = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = None
+                        termcolor.cprint("Error saving data:", "red", attrs=["bold"], end=" ")
+                        print(f"'{table}': {e}")
+                    termcolor.cprint(
+                        f"[{done}/{len(tables)}]", "blue", attrs=["bold"], end=" "
+                    )
+                    if result is None:
+                        summary.errors.append(table)
+                        print(f"'{table}' failed")
+                        continue
+                    summary.details["tables"][table] = result
+                    summary.rows += result.rows
+                    summary.batches += 1
+                    print(f"'{table}': {result.rows} rows in {result.elapsed:.2f}s")
+        finally:
+            for connection in opened:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+        summary.elapsed = time.perf_counter() - start
+        termcolor.cprint("Export finished....", "green", attrs=["bold"], end=" ")
+        print(
+            f"{summary.batches}/{len(tables)} tables, {summary.rows} rows in "
+            f"{summary.elapsed:.2f}s ({summary.rows_per_second:,.0f} rows/s)"
+        )
+        return summary
+
+    @instrumented
     def close_connection(self):
         """
         Close the active MySQL database connection.
 
-        If a connection is active, close both the cursor and the connection. If no active connection is found,
-        print a message indicating that the MySQL connection is not active.
+        If a connection is active, close both the cursor and the connection. In pooled mode the
+        connections still borrowed by other threads are waited for up to 'pool_timeout' seconds,
+        then the free connections of the pool are disconnected. The connections still borrowed
+        after the wait are reported, and disconnected when they are given back. If no active
+        connection is found, print a message indicating that the MySQL connection is not active.
 
         Parameters:
         None
@@ -433,7 +1473,36 @@ class MySQL_operation:
         mysql_handler.close_connection()
         ```
         """
-        if self.connection:
+        if self.pool is not None:
+            deadline = time.monotonic() + self.pool_timeout
+            with self._pool_condition:
+                while self._borrowed and time.monotonic() < deadline:
+                    self._pool_condition.wait(deadline - time.monotonic())
+                borrowed = self._borrowed
+                # Borrow every free connection of the pool and disconnect it
+                # instead of giving it back
+                while True:
+                    try:
+                        connection = self.pool.get_connection()
+                    except mysql.connector.Error:
+                        break
+                    try:
+                        connection.disconnect()
+                    except mysql.connector.Error:
+                        pass
+                self.pool = None
+            termcolor.cprint(
+                "MySQL connection pool closed.", "dark_grey", attrs=["bold"], end=" "
+            )
+            if borrowed:
+                termcolor.cprint(
+                    f"{borrowed} connection(s) still borrowed after {self.pool_timeout}s,",
+                    "magenta",
+                    attrs=["bold"],
+                    end=" ",
+                )
+                print("they are disconnected when given back.")
+        elif self.connection:
             self.cursor.close()
             self.connection.close()
             termcolor.cprint(
@@ -0,0 +1,647 @@
+"""
+Pipelines moving data directly between MySQL and MongoDB, without an
+intermediate file.
+"""
+import time
+import decimal
+import datetime
+import termcolor
+import mysql.connector
+from bson.objectid import ObjectId
+from bson.decimal128 import Decimal128
+from .results import OperationResult
+from .documents import DOCUMENT_ENCODER, batched, bson_documents, flatten_document
+
+# Maximum number of keys in the IN (...) list of a join lookup
+JOIN_LOOKUP_SIZE = 1000
+
+# Number of rejected documents kept in the errors of 'mongo_to_mysql'
+MAX_REPORTED_ERRORS = 100
+
+# Longest sampled string stored as TEXT (65,535 bytes, at least 16,383
+# characters), the longer ones are LONGTEXT: room for longer values
+TEXT_SAMPLE_LENGTH = 2048
+
+# Kind of a sampled value, for the column type inference of 'mongo_to_mysql'
+VALUE_KINDS = {
+    bool: "bool",
+    int: "int",
+    float: "float",
+    decimal.Decimal: "decimal",
+    Decimal128: "decimal",
+    datetime.datetime: "datetime",
+    ObjectId: "objectid",
+    str: "str",
+    dict: "json",
+    list: "json",
+}
+
+
+def mysql_to_mongo(
+    mysql_handler,
+    mongo_handler,
+    table_name=None,
+    collection_name="",
+    db_name="",
+    query=None,
+    joins=None,
+    id_column=None,
+    batch_size=5000,
+    workers=2,
+    max_pending=None,
+):
+    """
+    Copy a MySQL table (or the result of a query) into a MongoDB collection.
+
+    The rows are read through an unbuffered cursor 'batch_size' at a time,
+    converted to documents and written with 'insert_many' by 'workers'
+    threads (see 'Mongo_operation.insert_batches'). Reading and writing
+    overlap: while the writers insert a batch the next ones are read, and at
+    most 'max_pending' batches (default is twice the workers) wait for a
+    writer, so the memory does not grow with the size of the table. With
+    'workers=1' the batches are read and written one after another.
+
+    Rows of other tables can be nested into the documents with 'joins', a list
+    of dicts:
+    - "table": the child table.
+    - "local_key": the field of the document, "foreign_key": the column of the child table.
+    - "as": the name of the nested field (default is the child table name).
+    - "many": nest a list of rows (True, the default) or the first row (False).
+    - "columns": the columns of the child table (default is all of them).
+    - "joins": the joins of the child rows, nested the same way.
+    The child rows of every batch are read with one 'IN (...)' query per join,
+    on a second connection (borrowed from the pool in pooled mode).
+
+    Parameters:
+    - mysql_handler (MySQL_operation): The connected MySQL operator.
+    - mongo_handler (Mongo_operation): The MongoDB operator, with a database selected.
+    - table_name (str, optional): The table to copy. Either 'table_name' or 'query' is needed.
+    - collection_name (str, optional): The target collection. If not provided, the current collection is used.
+    - db_name (str, optional): The database of the table.
+    - query (str, optional): A SELECT query to copy instead of a whole table.
+    - joins (list, optional): The child tables to nest, see above.
+    - id_column (str, optional): Use this column as '_id', so that a rerun reports the
+      documents already copied as duplicates instead of inserting them again.
+    - batch_size (int, optional): Number of rows per batch (default is 5000).
+    - workers (int, optional): Number of writer threads (default is 2).
+    - max_pending (int, optional): Maximum number of batches waiting for a writer.
+
+    Returns:
+    - OperationResult or None: The inserted documents, batches, errors and throughput;
+      'details["read_seconds"]' is the time spent reading and converting the rows.
+
+    Example Usage:
+    ```python
+    from dbautomate.pipelines import mysql_to_mongo
+
+    result = mysql_to_mongo(
+        mysql_handler, mongo, "orders", "orders", id_column="id",
+        joins=[{"table": "order_items", "local_key": "id", "foreign_key": "order_id", "as": "items"}],
+    )
+    print(result.rows, result.rows_per_second)
+    ```
+    """
+    try:
+        if query is None:
+            if table_name is None:
+                raise Exception("pass a table_name or a query")
+            query = f"SELECT * FROM {db_name + '.' if db_name else ''}{table_name}"
+        if collection_name != "":
+            mongo_handler.create_collection(collection_name)
+        if mongo_handler.collection is None:
+            raise Exception("No collection selected")
+    except Exception as e:
+        termcolor.cprint("Error in the migration:", "red", attrs=["bold"], end=" ")
+        print(e)
+        return None
+
+    timing = {"read": 0.0}
+    result = mongo_handler.insert_batches(
+        read_document_batches(mysql_handler, query, batch_size, joins, id_column, db_name, timing),
+        workers,
+        False,
+        max_pending,
+        "mysql_to_mongo",
+    )
+    if result is not None:
+        result.details["read_seconds"] = timing["read"]
+        result.details["source"] = query
+    return result
+
+
+# Helper function
+def read_document_batches(mysql_handler, query, batch_size, joins, id_column, db_name, timing):
+    """
+    Yield the rows of a query as lists of BSON ready documents, with the joined
+    rows nested, and add the time spent in this stage to 'timing["read"]'.
+    """
+    connection = None
+    batches = mysql_handler.iter_query(query, batch_size, as_dicts=True)
+    try:
+        if joins:
+            if mysql_handler.pool is not None:
+                connection = mysql_handler.checkout_connection()
+            else:
+                connection = mysql.connector.connect(**mysql_handler.config)
+            if db_name or mysql_handler.config.get("database"):
+                cursor = connection.cursor()
+                cursor.execute(f"use {db_name or mysql_handler.config['database']}")
+                cursor.close()
+        while True:
+            start = time.perf_counter()
+            documents = next(batches, None)
+            if documents is None:
+                break
+            # The joins first: their 'local_key' can be the id column
+            for join in joins or []:
+                nest_rows(connection, documents, join)
+            if id_column is not None:
+                for document in documents:
+                    document["_id"] = document.pop(id_column)
+            bson_documents(documents)
+            timing["read"] += time.perf_counter() - start
+            yield documents
+    finally:
+        batches.close()
+        if connection is not None:
+            connection.close()
+
+
+# Helper function
+def nest_rows(connection, documents, join):
+    """
+    Read the rows of a join for a batch of documents and nest them, with their
+    MySQL values unchanged.
+    """
+    local_key = join["local_key"]
+    foreign_key = join["foreign_key"]
+    name = join.get("as", join["table"])
+    many = join.get("many", True)
+    columns = join.get("columns")
+    if columns is not None:
+        # The keys of the lookups are read even if they are not listed
+        needed = [foreign_key] + [child["local_key"] for child in join.get("joins", [])]
+        columns = list(columns) + [key for key in needed if key not in columns]
+    column_list = ", ".join(columns) if columns is not None else "*"
+
+    keys = list(dict.fromkeys(document[local_key] for document in documents))
+    children = {}
+    cursor = connection.cursor()
+    try:
+        for offset in range(0, len(keys), JOIN_LOOKUP_SIZE):
+            part = keys[offset : offset + JOIN_LOOKUP_SIZE]
+            placeholders = ", ".join("%s" for _ in part)
+            cursor.execute(
+                f"SELECT {column_list} FROM {join['table']} WHERE {foreign_key} IN ({placeholders})",
+                tuple(part),
+            )
+            names = [desc[0] for desc in cursor.description]
+            # Raw MySQL values: the keys are compared and passed to the nested
+            # lookups as read, the finished documents are converted afterwards
+            rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+            for child_join in join.get("joins", []):
+                nest_rows(connection, rows, child_join)
+            for row in rows:
+                children.setdefault(row[foreign_key], []).append(row)
+    finally:
+        cursor.close()
+
+    for document in documents:
+        rows = children.get(document[local_key], [])
+        if many:
+            document[name] = rows
+        else:
+            document[name] = rows[0] if rows else None
+
+
+def mongo_to_mysql(
+    mongo_handler,
+    mysql_handler,
+    table_name,
+    db_name="",
+    filter=None,
+    sample_size=1000,
+    batch_size=1000,
+    replace=False,
+    separator="_",
+):
+    """
+    Copy the current MongoDB collection into MySQL tables, in one pass.
+
+    A sample of 'sample_size' documents gives the schema (see 'infer_schema'):
+    the nested documents are flattened into columns ('address_city'), and every
+    array becomes a child table '<table>_<field>' with the '_id' of the parent
+    document, the position 'idx' and the fields of the items (or a 'value'
+    column for scalar items; arrays inside the items are stored as JSON). The
+    tables are created if they do not exist, then the documents are read from
+    the cursor 'batch_size' at a time and written with one multi-row INSERT
+    per table and batch, committed together, so the memory does not grow with
+    the size of the collection. ObjectIds are written as strings.
+
+    The types are chosen with room for the documents outside the sample:
+    strings are TEXT or LONGTEXT (VARCHAR(255) for the keys), integers mixed
+    with floats DOUBLE, with decimals DECIMAL. A document that does not fit
+    the tables anyway (e.g. a string in a DOUBLE column) is not copied, it is
+    counted in 'details["rejected"]' and reported in 'errors' with its '_id',
+    and the copy goes on. Fields that are not in the sample are not copied,
+    they are listed in 'details["dropped_fields"]'. Fields that give the same
+    column name once flattened ('a.b' and 'a_b', or 'Name' and 'name') stop
+    the copy before the tables are created.
+
+    Parameters:
+    - mongo_handler (Mongo_operation): The MongoDB operator, with a collection selected.
+    - mysql_handler (MySQL_operation): The connected MySQL operator.
+    - table_name (str): The name of the main table.
+    - db_name (str, optional): The database of the tables. If not provided, the active database is used.
+    - filter (dict, optional): Only copy the matching documents.
+    - sample_size (int, optional): Number of documents sampled to infer the schema (default is 1000).
+    - batch_size (int, optional): Number of documents per batch (default is 1000).
+    - replace (bool, optional): Drop the tables first, e.g. for a nightly copy (default is False).
+    - separator (str, optional): Separator of the flattened field names (default is "_").
+
+    Returns:
+    - OperationResult or None: 'rows' is the number of copied documents, 'details' holds the
+      rows written per table, the 'schema', the 'dropped_fields' and the number of
+      'rejected' documents (the first ones are in 'errors').
+
+    Example Usage:
+    ```python
+    from dbautomate.pipelines import mongo_to_mysql
+
+    result = mongo_to_mysql(mongo, mysql_handler, "orders", replace=True)
+    print(result.rows, result.details["tables"], result.rows_per_second)
+    ```
+    """
+    start = time.perf_counter()
+    connection = None
+    tables = {}
+    dropped = set()
+    errors = []
+    rejected = 0
+    total = 0
+    batch_no = 0
+    try:
+        collection = mongo_handler.collection
+        if collection is None:
+            raise Exception("No collection selected")
+        sample = list(
+            collection.aggregate([{"$match": filter or {}}, {"$sample": {"size": sample_size}}])
+        )
+        if not sample:
+            raise Exception("No document to copy")
+        schema = infer_schema(sample, table_name, separator)
+
+        if mysql_handler.pool is not None:
+            connection = mysql_handler.checkout_connection()
+        else:
+            connection = mysql_handler.connection
+        cursor = connection.cursor()
+        db_name = db_name or (mysql_handler.config or {}).get("database", "")
+        if db_name:
+            cursor.execute(f"use {db_name}")
+        for name, table in schema.items():
+            if replace:
+                cursor.execute(f"DROP TABLE IF EXISTS {name}")
+            cursor.execute(create_table_query(name, table))
+            tables[name] = 0
+        mysql_handler.invalidate_schema(db_name or None)
+        termcolor.cprint("Tables ready:", "green", attrs=["bold"], end=" ")
+        print(", ".join(schema))
+
+        queries = {
+            name: mysql_handler.insert_query(name, [f"`{column}`" for column in table["columns"]])
+            for name, table in schema.items()
+        }
+        checks = value_checks(schema)
+        cursor_mongo = collection.find(filter or {}, batch_size=batch_size)
+        for documents in batched(cursor_mongo, batch_size):
+            rows = {name: [] for name in schema}
+            for document in documents:
+                try:
+                    table_rows(document, table_name, schema, separator, rows, dropped, checks)
+                except ValueError as e:
+                    rejected += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"_id": mysql_value(document.get("_id")), "error": str(e)})
+            for name, values in rows.items():
+                if values:
+                    cursor.executemany(queries[name], values)
+                    tables[name] += len(values)
+            connection.commit()
+
+            batch_no += 1
+            total += len(documents)
+            elapsed = time.perf_counter() - start
+            rate = total / elapsed if elapsed > 0 else 0.0
+            termcolor.cprint(f"Batch {batch_no}:", "blue", attrs=["bold"], end=" ")
+            print(f"{len(documents)} documents ({total} total, {rate:,.0f} docs/s)")
+    except Exception as e:
+        termcolor.cprint("Error in the migration:", "red", attrs=["bold"], end=" ")
+        print(f"{e} (after {batch_no} batches, {total} documents committed)")
+        return None
+    finally:
+        if connection is not None and mysql_handler.pool is not None:
+            connection.close()
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    termcolor.cprint("Copied successfully....", "green", attrs=["bold"], end=" ")
+    print(f"{total} documents in {batch_no} batches, {elapsed:.2f}s ({rate:,.0f} docs/s)")
+    if dropped:
+        termcolor.cprint("Fields not in the sample, not copied:", "magenta", attrs=["bold"], end=" ")
+        print(sorted(dropped))
+    if rejected:
+        termcolor.cprint("Documents not copied:", "magenta", attrs=["bold"], end=" ")
+        print(f"{rejected}, e.g. {errors[0]}")
+    return OperationResult(
+        "mongo_to_mysql",
+        rows=total - rejected,
+        batches=batch_no,
+        elapsed=elapsed,
+        errors=errors,
+        details={
+            "tables": tables,
+            "schema": schema,
+            "dropped_fields": sorted(dropped),
+            "rejected": rejected,
+        },
+    )
+
+
+def infer_schema(documents, table_name, separator="_"):
+    """
+    Infer the MySQL tables of a list of sampled documents.
+
+    Returns:
+    - dict: Table name to {'columns': {column: MySQL type}, 'primary_key': [columns],
+      'path': the flattened array path of a child table, None for the main table}.
+
+    Raises:
+    - ValueError: If fields give the same column (or child table) name once flattened,
+      e.g. 'a.b' and 'a_b', or names that differ only by case.
+
+    Example Usage:
+    ```python
+    schema = infer_schema(list(collection.find().limit(1000)), "orders")
+    ```
+    """
+    values = {table_name: {}}
+    parent_key = f"{table_name}_id"
+    paths = {table_name: None}
+    # Lower case name -> key paths giving it, per table (and for the table names)
+    sources = {None: {}, table_name: {}}
+    for document in documents:
+        fields, arrays = flatten_document(document, separator)
+        for column, value in fields.items():
+            values[table_name].setdefault(column, []).append(value)
+        for path, value in key_paths(document):
+            names = sources[None] if isinstance(value, list) else sources[table_name]
+            names.setdefault(separator.join(path).lower(), set()).add(path)
+        for path, items in arrays.items():
+            child = f"{table_name}_{path}"
+            paths[child] = path
+            # Only the type of 'idx' is needed, it is INT
+            child_values = values.setdefault(child, {parent_key: [], "idx": []})
+            child_values[parent_key].append(document.get("_id"))
+            child_sources = sources.setdefault(child, {parent_key.lower(): {()}, "idx": {()}})
+            for item in items:
+                for column, value in item_fields(item, separator).items():
+                    child_values.setdefault(column, []).append(value)
+                item_paths = key_paths(item) if isinstance(item, dict) else [(("value",), item)]
+                for path, value in item_paths:
+                    child_sources.setdefault(separator.join(path).lower(), set()).add(path)
+    collisions = [
+        f"{', '.join(separator.join(path) or '(parent key or position)' for path in sorted(found))}"
+        f" in {'the table names' if table is None else repr(table)}"
+        for table, names in sources.items()
+        for found in names.values()
+        if len(found) > 1
+    ]
+    if collisions:
+        raise ValueError(f"Fields with the same name once flattened: {'; '.join(collisions)}")
+
+    schema = {}
+    for name, columns in values.items():
+        types = {column: column_type(sample) for column, sample in columns.items()}
+        if name == table_name:
+            key = ["_id"] if "_id" in types else []
+        else:
+            types["idx"] = "INT"
+            key = [parent_key, "idx"]
+        for column in key:
+            if types[column] in ("TEXT", "LONGTEXT", "JSON"):
+                types[column] = "VARCHAR(255)"
+        schema[name] = {"columns": types, "primary_key": key, "path": paths[name]}
+    return schema
+
+
+# Helper function
+def key_paths(document, prefix=()):
+    """
+    Yield (tuple of keys, value) for the fields of a document that are not
+    nested documents, the arrays included.
+    """
+    for key, value in document.items():
+        path = prefix + (str(key),)
+        if isinstance(value, dict):
+            yield from key_paths(value, path)
+        else:
+            yield path, value
+
+
+# Helper function
+def item_fields(item, separator):
+    """
+    Return the fields of an array item: its flattened fields (arrays in JSON)
+    or {'value': item} for a scalar.
+    """
+    if not isinstance(item, dict):
+        return {"value": item}
+    fields, arrays = flatten_document(item, separator)
+    fields.update(arrays)
+    return fields
+
+
+# Helper function
+def column_type(values):
+    """
+    Return the MySQL type of a column from its sampled values.
+    """
+    kinds = {VALUE_KINDS.get(type(value), "str") for value in values if value is not None}
+    if not kinds:
+        return "TEXT"
+    if kinds == {"bool"}:
+        return "BOOLEAN"
+    if kinds <= {"int", "bool"}:
+        return "BIGINT"
+    if kinds <= {"int", "float", "decimal", "bool"} and "float" in kinds:
+        return "DOUBLE"
+    if kinds <= {"int", "decimal", "bool"}:
+        scale = integer_digits = 1
+        for value in values:
+            if value is None:
+                continue
+            value = value.to_decimal() if isinstance(value, Decimal128) else decimal.Decimal(value)
+            sign, digits, exponent = value.as_tuple()
+            if isinstance(exponent, int):
+                scale = max(scale, -exponent)
+                integer_digits = max(integer_digits, len(digits) + exponent)
+        scale = min(scale, 30)
+        # Room for values larger than the ones of the sample
+        return f"DECIMAL({min(65, integer_digits + scale + 6)}, {scale})"
+    if kinds == {"datetime"}:
+        return "DATETIME(6)"
+    if kinds == {"objectid"}:
+        return "CHAR(24)"
+    if kinds == {"json"}:
+        return "JSON"
+    longest = max(len(str(mysql_value(value))) for value in values if value is not None)
+    if longest <= TEXT_SAMPLE_LENGTH:
+        return "TEXT"
+    return "LONGTEXT"
+
+
+# Helper function
+def create_table_query(name, table):
+    """
+    Build the CREATE TABLE IF NOT EXISTS statement of an inferred table.
+    """
+    definitions = [f"`{column}` {kind}" for column, kind in table["columns"].items()]
+    if table["primary_key"]:
+        keys = ", ".join(f"`{column}`" for column in table["primary_key"])
+        definitions.append(f"PRIMARY KEY ({keys})")
+    return f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(definitions)})"
+
+
+# Helper function
+def mysql_value(value):
+    """
+    Convert a document value to a value MySQL accepts: ObjectIds become
+    strings, Decimal128 'Decimal', nested documents and arrays JSON.
+    """
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return value.to_decimal()
+    if isinstance(value, (dict, list)):
+        return DOCUMENT_ENCODER.encode(value)
+    if isinstance(value, str) or not isinstance(value, tuple(VALUE_KINDS)):
+        return str(value) if value is not None else None
+    return value
+
+
+# Helper function
+def table_rows(document, table_name, schema, separator, rows, dropped, checks=None):
+    """
+    Add the rows of a document to 'rows' (table name to list of tuples) and
+    the names of its fields that are not in the schema to 'dropped'.
+
+    Raises:
+    - ValueError: If a value does not fit its column ('checks', see
+      'value_checks'); no row of the document is added then.
+    """
+    document_rows = {}
+    fields, arrays = flatten_document(document, separator)
+    columns = schema[table_name]["columns"]
+    dropped.update(column for column in fields if column not in columns)
+    values = [fields.get(column) for column in columns]
+    document_rows[table_name] = [values]
+
+    parent_id = document.get("_id")
+    for path, items in arrays.items():
+        child = f"{table_name}_{path}"
+        if child not in schema:
+            dropped.add(path)
+            continue
+        columns = list(schema[child]["columns"])[2:]
+        document_rows[child] = []
+        for idx, item in enumerate(items):
+            fields = item_fields(item, separator)
+            dropped.update(f"{path}.{column}" for column in fields if column not in columns)
+            document_rows[child].append([parent_id, idx] + [fields.get(column) for column in columns])
+
+    if checks is not None:
+        for name, table_values in document_rows.items():
+            for row in table_values:
+                for column, check, value in zip(schema[name]["columns"], checks[name], row):
+                    if not check(value):
+                        raise ValueError(
+                            f"{type(value).__name__} value does not fit the column "
+                            f"'{column}' {schema[name]['columns'][column]} of '{name}'"
+                        )
+    for name, table_values in document_rows.items():
+        rows[name].extend(tuple(mysql_value(value) for value in row) for row in table_values)
+
+
+# Helper function
+def value_checks(schema):
+    """
+    Return, for every table of a schema, the functions telling if a value
+    fits each of its columns, e.g. to reject a document before its INSERT
+    fails the batch.
+    """
+    return {
+        name: [
+            value_check(kind, column in table["primary_key"])
+            for column, kind in table["columns"].items()
+        ]
+        for name, table in schema.items()
+    }
+
+
+# Helper function
+def value_check(kind, key=False):
+    """
+    Return a function telling if a document value fits a column of this MySQL type.
+    """
+    if kind in ("BOOLEAN", "BIGINT", "INT"):
+        bits = 1 if kind == "BOOLEAN" else 63 if kind == "BIGINT" else 31
+        low = 0 if kind == "BOOLEAN" else -(2**bits)
+
+        def check(value):
+            return isinstance(value, int) and low <= value < 2**bits
+
+    elif kind == "DOUBLE":
+
+        def check(value):
+            return isinstance(value, (int, float, decimal.Decimal, Decimal128))
+
+    elif kind.startswith("DECIMAL"):
+        precision, scale = (int(number) for number in kind[8:-1].split(","))
+
+        def check(value):
+            if isinstance(value, Decimal128):
+                value = value.to_decimal()
+            if not isinstance(value, (int, decimal.Decimal)) or not decimal.Decimal(value).is_finite():
+                return False
+            sign, digits, exponent = decimal.Decimal(value).as_tuple()
+            return len(digits) + exponent <= precision - scale
+
+    elif kind == "DATETIME(6)":
+
+        def check(value):
+            return isinstance(value, datetime.datetime)
+
+    elif kind == "CHAR(24)":
+
+        def check(value):
+            return isinstance(value, ObjectId) or len(str(mysql_value(value))) <= 24
+
+    elif kind == "JSON":
+
+        def check(value):
+            return isinstance(value, (dict, list))
+
+    else:
+        # VARCHAR(255), TEXT (65,535 bytes) or LONGTEXT
+        limit = 255 if kind.startswith("VARCHAR") else 65535 if kind == "TEXT" else None
+
+        def check(value):
+            if limit is None:
+                return True
+            text = str(mysql_value(value))
+            return len(text) <= limit if limit == 255 else len(text.encode("utf-8")) <= limit
+
+    if key:
+        return lambda value: value is not None and check(value)
+    return lambda value: value is None or check(value)
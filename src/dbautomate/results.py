@@ -0,0 +1,41 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class OperationResult:
+    """
+    Summary of a data operation, returned by the non-interactive methods of
+    the operators so that schedulers and worker pools can inspect it.
+
+    Attributes:
+    - operation (str): Name of the method that produced the result.
+    - rows (int): Rows (or documents) affected, inserted or written.
+    - batches (int): Number of batches sent to or read from the server.
+    - elapsed (float): Wall time of the operation in seconds.
+    - path (str or None): File written or read by the operation, if any.
+    - errors (list): Errors that were reported without stopping the operation.
+    - details (dict): Operation specific counters.
+
+    Example Usage:
+    ```python
+    result = mysql_handler.save_data("example_table", output_path="example.csv")
+    print(result.rows, result.elapsed, result.rows_per_second)
+    ```
+    """
+
+    operation: str
+    rows: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    path: Optional[str] = None
+    errors: list = field(default_factory=list)
+    details: dict = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def ok(self):
+        return not self.errors
@@ -0,0 +1,26 @@
+import pytest
+
+from dbautomate.mysqloperator import MySQL_operation
+from dbautomate.mongodboperator import Mongo_operation
+# The in-process MySQL stand-in (SQLite behind mysql.connector)
+from tests import fake_mysql
+
+
+@pytest.fixture
+def mysql_handler():
+    restore = fake_mysql.install()
+    handler = MySQL_operation(interactive=False)
+    handler.connect_to_mysql({"host": "in-process", "database": "test"}, attempts=1)
+    yield handler
+    restore()
+
+
+@pytest.fixture
+def mongo():
+    mongomock = pytest.importorskip("mongomock")
+    handler = Mongo_operation(interactive=False)
+    handler.client = mongomock.MongoClient()
+    handler.is_closed = False
+    handler.database = handler.client["test"]
+    handler.collection = handler.database["items"]
+    return handler
@@ -0,0 +1,139 @@
+"""
+In-process stand-in for a MySQL server, used by the tests and by the
+benchmarks when no server is given.
+
+'install()' replaces 'mysql.connector.connect' with a connector backed by an
+in-memory SQLite database. It understands the statements the operators send
+('use', 'select database()', 'show tables', 'information_schema.columns'),
+and rejects LOAD DATA LOCAL INFILE like a server with 'local_infile'
+disabled, so the fallback path is measured. The numbers measure the
+operators (conversion, batching, file IO), not a MySQL server.
+"""
+import re
+import sqlite3
+import threading
+import mysql.connector
+
+VAR_STRING = 253
+
+
+class FakeCursor:
+    def __init__(self, database, lock):
+        self._database = database
+        self._lock = lock
+        self._cursor = database.cursor()
+        self._rows = None
+        self.description = None
+        self.rowcount = -1
+
+    def execute(self, query, params=()):
+        statement = query.strip().lower()
+        if statement.startswith("load data"):
+            raise mysql.connector.Error(msg="Loading local data is disabled", errno=3948)
+        if statement.startswith("use "):
+            self._result([], None)
+        elif statement.startswith("select database()"):
+            self._result([("benchmark",)], ["database()"])
+        elif statement.startswith("show tables"):
+            with self._lock:
+                tables = self._database.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                ).fetchall()
+            self._result(tables, ["Tables"])
+        elif "information_schema.columns" in statement:
+            with self._lock:
+                info = self._database.execute(f"PRAGMA table_info({params[1]})").fetchall()
+            self._result(
+                [(row[1], row[2].lower(), "PRI" if row[5] else "") for row in info],
+                ["column_name", "column_type", "column_key"],
+            )
+        else:
+            query = re.sub(r"\bDOUBLE\b", "REAL", query.replace("%s", "?"), flags=re.I)
+            with self._lock:
+                self._cursor.execute(query, tuple(params or ()))
+            self._rows = None
+            self.rowcount = self._cursor.rowcount
+            self.description = (
+                [(column[0], VAR_STRING) for column in self._cursor.description]
+                if self._cursor.description
+                else None
+            )
+
+    def _result(self, rows, names):
+        self._rows = list(rows)
+        self.rowcount = len(self._rows)
+        self.description = [(name, VAR_STRING) for name in names] if names else None
+
+    def executemany(self, query, rows):
+        with self._lock:
+            self._cursor.executemany(query.replace("%s", "?"), rows)
+        self.rowcount = self._cursor.rowcount
+
+    def fetchmany(self, size=1):
+        if self._rows is not None:
+            rows, self._rows = self._rows[:size], self._rows[size:]
+            return rows
+        with self._lock:
+            return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        if self._rows is not None:
+            rows, self._rows = self._rows, []
+            return rows
+        with self._lock:
+            return self._cursor.fetchall()
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def close(self):
+        self._cursor.close()
+
+
+class FakeConnection:
+    def __init__(self, database, lock):
+        self._database = database
+        self._lock = lock
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self._database, self._lock)
+
+    def commit(self):
+        with self._lock:
+            self._database.commit()
+
+    def rollback(self):
+        with self._lock:
+            self._database.rollback()
+
+    def consume_results(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def ping(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+def install():
+    """
+    Replace 'mysql.connector.connect' with the in-memory stand-in.
+
+    Returns:
+    - function: Restores the original 'mysql.connector.connect'.
+    """
+    database = sqlite3.connect(":memory:", check_same_thread=False)
+    lock = threading.RLock()
+    original = mysql.connector.connect
+    mysql.connector.connect = lambda **config: FakeConnection(database, lock)
+
+    def restore():
+        mysql.connector.connect = original
+        database.close()
+
+    return restore
@@ -0,0 +1,272 @@
+import datetime
+import decimal
+import types
+import pytest
+from bson.decimal128 import Decimal128
+
+
+def test_parquet_round_trip_keeps_decimals(mongo, tmp_path):
+    pytest.importorskip("pyarrow")
+
+    mongo.collection.insert_many(
+        [{"name": "a", "price": Decimal128("1.50")}, {"name": "b", "price": Decimal128("20.25")}]
+    )
+    path = str(tmp_path / "collection.parquet")
+    assert mongo.save_data("parquet", path).rows == 2
+
+    target = mongo.database["copy"]
+    mongo.collection = target
+    assert mongo.bulk_insert(path).rows == 2
+    prices = [document["price"] for document in target.find({}, {"_id": 0}).sort("name")]
+    assert prices == [Decimal128("1.50"), Decimal128("20.25")]
+
+
+def test_parquet_dates_are_inserted_as_datetimes(mongo, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = str(tmp_path / "rows.parquet")
+    pyarrow.parquet.write_table(
+        pa.table(
+            {
+                "day": pa.array([datetime.date(2024, 1, 2)], pa.date32()),
+                "amount": pa.array([decimal.Decimal("3.10")], pa.decimal128(5, 2)),
+            }
+        ),
+        path,
+    )
+    assert mongo.bulk_insert(path).rows == 1
+    document = mongo.collection.find_one({}, {"_id": 0})
+    assert document == {"day": datetime.datetime(2024, 1, 2), "amount": Decimal128("3.10")}
+
+
+@pytest.mark.parametrize("check_exists", [False, True])
+def test_update_without_match_is_not_an_error(mongo, check_exists):
+    mongo.collection.insert_one({"age": 28})
+
+    result = mongo.update_data_entry(
+        {"age": 99}, {"$set": {"age": 55}}, many=True, check_exists=check_exists
+    )
+
+    assert result is not None
+    assert result.details["matched"] == 0 and result.rows == 0
+
+
+def test_update_counts_and_failure(mongo):
+    mongo.collection.insert_many([{"age": 28}, {"age": 28}])
+
+    result = mongo.update_data_entry({"age": 28}, {"$set": {"age": 55}}, many=True)
+    assert result.details == {"matched": 2, "modified": 2, "upserted_id": None}
+    # An invalid update document is a failure
+    assert mongo.update_data_entry({"age": 55}, {"age": 1}, many=True) is None
+
+
+def test_csv_export_keeps_fields_of_later_batches(mongo, tmp_path):
+    mongo.collection.insert_many(
+        [{"_id": 1, "a": 1}, {"_id": 2, "a": 2, "b": {"c": 3}}, {"_id": 3, "d": "x"}]
+    )
+    path = tmp_path / "out.csv"
+
+    result = mongo.save_data("csv", str(path), batch_size=1)
+
+    assert result.details["fields"] == ["_id", "a", "b", "d"]
+    assert path.read_text().splitlines() == [
+        "_id,a,b,d",
+        "1,1,,",
+        '2,2,"{""c"":3}",',
+        "3,,,x",
+    ]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.csv"]
+
+
+def test_csv_header_from_the_projection(mongo, tmp_path):
+    mongo.collection.insert_many([{"a": 1}, {"a": 2, "b": 3}])
+    path = tmp_path / "out.csv"
+
+    result = mongo.save_data("csv", str(path), projection={"_id": 0, "b": 1, "a": 1}, batch_size=1)
+
+    assert result.details["fields"] == ["b", "a"]
+    assert path.read_text().splitlines() == ["b,a", ",1", "3,2"]
+
+
+def test_parquet_export_keeps_fields_of_later_batches(mongo, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    mongo.collection.insert_many([{"_id": 1, "a": 1}, {"_id": 2, "a": 2.5, "b": "x"}])
+    path = str(tmp_path / "out.parquet")
+
+    assert mongo.save_data("parquet", path, batch_size=1).details["fields"] == ["_id", "a", "b"]
+    assert pyarrow.parquet.read_table(path).to_pylist() == [
+        {"_id": 1, "a": 1.0, "b": None},
+        {"_id": 2, "a": 2.5, "b": "x"},
+    ]
+
+
+def insert_operations(ids):
+    return [{"op": "insert", "document": {"_id": _id}} for _id in ids]
+
+
+def test_bulk_mutate_unordered_counts_the_failures(mongo):
+    mongo.collection.insert_many([{"_id": 2}, {"_id": 5}])
+
+    result = mongo.bulk_mutate(insert_operations(range(1, 8)), batch_size=3, ordered=False)
+
+    assert result.batches == 3
+    assert result.rows == 5
+    assert result.details["inserted"] == 5
+    assert result.details["failed"] == 2
+    assert result.details["skipped"] == 0
+    assert len(result.errors) == 2
+    assert mongo.collection.count_documents({}) == 7
+
+
+def test_bulk_mutate_ordered_stops_at_the_first_error(mongo):
+    mongo.collection.insert_one({"_id": 2})
+
+    # Batches [1, 2, 3] [4, 5, 6] [7]: stops in the first batch at _id 2
+    result = mongo.bulk_mutate(insert_operations(range(1, 8)), batch_size=3, ordered=True)
+
+    assert result.batches == 1
+    assert result.rows == 1
+    assert result.details["inserted"] == 1
+    assert result.details["failed"] == 1
+    # Only the rest of the failing batch, the later batches are not read
+    assert result.details["skipped"] == 1
+    assert sorted(document["_id"] for document in mongo.collection.find()) == [1, 2]
+
+
+def upsert_operations():
+    return [
+        {"op": "upsert", "key": "sku", "document": {"sku": "a", "price": 1}},
+        {"op": "upsert", "key": "sku", "document": {"price": 2}},
+        {"op": "upsert", "key": "sku", "document": {"sku": "b", "price": 3}},
+    ]
+
+
+class UpsertCollection:
+    """
+    Records the requests of 'bulk_write' (mongomock does not run pymongo's UpdateOne).
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    def bulk_write(self, requests, ordered):
+        self.batches.append([request._filter for request in requests])
+        return types.SimpleNamespace(bulk_api_result={"nUpserted": len(requests)})
+
+
+def test_bulk_mutate_unordered_fails_the_upsert_without_key(mongo):
+    mongo.collection = UpsertCollection()
+    result = mongo.bulk_mutate(upsert_operations(), batch_size=2, ordered=False)
+
+    assert result.rows == 2
+    assert result.details["upserted"] == 2
+    assert result.details["failed"] == 1
+    assert result.errors == ["batch 1, operation 1: missing key field 'sku'"]
+    assert mongo.collection.batches == [[{"sku": "a"}], [{"sku": "b"}]]
+
+
+def test_bulk_mutate_ordered_stops_at_the_upsert_without_key(mongo):
+    mongo.collection = UpsertCollection()
+    result = mongo.bulk_mutate(upsert_operations(), batch_size=3, ordered=True)
+
+    assert result.rows == 1
+    assert result.details["failed"] == 1
+    assert result.details["skipped"] == 1
+    assert mongo.collection.batches == [[{"sku": "a"}]]
+
+
+class FakeChangeStream:
+    """
+    Change stream replaying a list of events, with the resume token of the last one read.
+    """
+
+    def __init__(self, events):
+        self.events = list(events)
+        self.resume_token = {"_data": "start"}
+
+    def try_next(self):
+        if not self.events:
+            return None
+        change = self.events.pop(0)
+        self.resume_token = change["_id"]
+        return change
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def change_event(number, operation="insert"):
+    change = {"_id": {"_data": f"token{number}"}, "operationType": operation}
+    if operation in ("insert", "delete"):
+        change["documentKey"] = {"_id": number}
+    if operation == "insert":
+        change["fullDocument"] = {"_id": number}
+    return change
+
+
+@pytest.mark.parametrize("batch_size", [1, 10])
+def test_sync_changes_does_not_checkpoint_past_an_invalidating_event(mongo, tmp_path, batch_size):
+    from bson import json_util
+
+    events = [change_event(1), change_event(2, "delete"), change_event(3, "drop"), change_event(4, "invalidate")]
+    watched = []
+
+    def watch(**kwargs):
+        watched.append(kwargs)
+        return FakeChangeStream(events)
+
+    mongo.collection = type("FakeCollection", (), {"watch": staticmethod(watch), "database": mongo.database})()
+    checkpoint = tmp_path / "changes.token"
+    checkpoint.write_text(json_util.dumps({"_data": "start"}))
+
+    result = mongo.sync_changes(str(checkpoint), output_path=str(tmp_path / "delta.jsonl"), batch_size=batch_size)
+    assert result.rows == 2
+    assert result.details["stopped_by"] == "drop"
+    assert json_util.loads(checkpoint.read_text()) == {"_data": "token2"}
+    assert watched[0]["resume_after"] == {"_data": "start"}
+
+
+def test_sync_changes_keeps_the_checkpoint_when_the_stream_starts_invalidated(mongo, tmp_path):
+    from bson import json_util
+
+    mongo.collection = type(
+        "FakeCollection", (), {"watch": staticmethod(lambda **kwargs: FakeChangeStream([change_event(1, "invalidate")]))}
+    )()
+    checkpoint = tmp_path / "changes.token"
+    checkpoint.write_text(json_util.dumps({"_data": "start"}))
+
+    result = mongo.sync_changes(str(checkpoint), output_path=str(tmp_path / "delta.jsonl"))
+    assert result.rows == 0
+    assert result.details["stopped_by"] == "invalidate"
+    assert json_util.loads(checkpoint.read_text()) == {"_data": "start"}
+
+
+def test_metrics_count_the_errors_caught_by_the_methods(mongo):
+    from dbautomate.metrics import Metrics
+
+    metrics = Metrics()
+    mongo.add_metrics_hook(metrics)
+    mongo.insert_data({"_id": 1})
+    mongo.insert_data("not a document")
+    mongo.insert_data({"_id": 1})
+    mongo.find_data({"_id": 2})
+    mongo.drop_index("missing_index")
+
+    series = {item["operation"]: item for item in metrics.snapshot() if item["kind"] == "call"}
+    assert (series["insert_data"]["count"], series["insert_data"]["errors"]) == (3, 2)
+    assert series["find_data"]["errors"] == 0
+    assert series["drop_index"]["errors"] == 1
+
+
+def test_csv_export_with_fields_fails_on_another_field(mongo, tmp_path):
+    mongo.collection.insert_many([{"_id": 1, "a": 1}, {"_id": 2, "b": 2}])
+    path = tmp_path / "out.csv"
+
+    assert mongo.save_data("csv", str(path), fields=["_id", "a"], batch_size=1) is None
+    assert not path.exists()
@@ -0,0 +1,249 @@
+import os
+import time
+import threading
+import pytest
+import mysql.connector
+
+
+def select(handler, query):
+    return [tuple(row) for row in handler.execute_query(query, result="preview").values.tolist()]
+
+
+def write_csv(tmp_path, rows):
+    path = tmp_path / "cats.csv"
+    path.write_text("cat_name,cat_age\n" + "".join(f"{name},{age}\n" for name, age in rows))
+    return str(path)
+
+
+def test_bulk_insert_skip_columns_single_and_chunked(mysql_handler, tmp_path):
+    mysql_handler.execute_query(
+        "CREATE TABLE cats (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, age INT)"
+    )
+    path = write_csv(tmp_path, [("Mena", 5), ("Kena", 11), ("Tom", 3)])
+
+    single = mysql_handler.bulk_insert("cats", path, skip_columns=["id"])
+    chunked = mysql_handler.bulk_insert("cats", path, chunksize=2, skip_columns=["id"])
+
+    assert single.rows == chunked.rows == 3
+    assert chunked.batches == 2
+    assert select(mysql_handler, "SELECT id, name, age FROM cats ORDER BY id") == [
+        (1, "Mena", 5),
+        (2, "Kena", 11),
+        (3, "Tom", 3),
+        (4, "Mena", 5),
+        (5, "Kena", 11),
+        (6, "Tom", 3),
+    ]
+
+
+def test_execute_query_closes_its_cursor(mysql_handler):
+    connection = mysql_handler.connection
+    cursor_factory = connection.cursor
+    opened, closed = [], []
+
+    def cursor(*args, **kwargs):
+        new_cursor = cursor_factory(*args, **kwargs)
+        close = new_cursor.close
+        new_cursor.close = lambda: (closed.append(new_cursor), close())
+        opened.append(new_cursor)
+        return new_cursor
+
+    connection.cursor = cursor
+    mysql_handler.execute_query("CREATE TABLE cats (name TEXT)")
+    mysql_handler.execute_query("SELEC broken")
+    mysql_handler.execute_query("SELECT * FROM cats")
+    mysql_handler.execute_query("SELECT * FROM cats", result="dataframe")
+
+    assert len(opened) == 4
+    assert closed == opened
+
+
+def test_execute_query_table_stops_after_max_rows(mysql_handler, capsys):
+    mysql_handler.execute_query("CREATE TABLE numbers (n INT)")
+    cursor = mysql_handler.connection.cursor()
+    cursor.executemany("INSERT INTO numbers VALUES (%s)", [(n,) for n in range(50)])
+    cursor.close()
+    connection = mysql_handler.connection
+    fetched, consumed = [], []
+    cursor_factory = connection.cursor
+
+    def cursor(*args, **kwargs):
+        new_cursor = cursor_factory(*args, **kwargs)
+        fetchmany = new_cursor.fetchmany
+
+        def counted_fetchmany(size=1):
+            rows = fetchmany(size)
+            fetched.extend(rows)
+            return rows
+
+        new_cursor.fetchmany = counted_fetchmany
+        return new_cursor
+
+    connection.cursor = cursor
+    connection.consume_results = lambda: consumed.append(True)
+
+    mysql_handler.execute_query("SELECT n FROM numbers ORDER BY n", max_rows=10, batch_size=4)
+    assert "Showing the first 10 rows." in capsys.readouterr().out
+    assert len(fetched) == 11 and consumed == [True]
+
+    fetched.clear()
+    mysql_handler.execute_query("SELECT n FROM numbers ORDER BY n", max_rows=10, batch_size=4, count_rows=True)
+    assert "Showing 10 of 50 rows." in capsys.readouterr().out
+    assert len(fetched) == 50
+
+    fetched.clear()
+    preview = mysql_handler.execute_query("SELECT n FROM numbers ORDER BY n", result="preview", max_rows=3)
+    assert preview["n"].tolist() == [0, 1, 2]
+    assert len(fetched) == 4 and consumed == [True, True]
+
+
+class FakePool:
+    def __init__(self, size):
+        self.free = [FakePooledConnection(self) for _ in range(size)]
+
+    def get_connection(self):
+        if not self.free:
+            raise mysql.connector.errors.PoolError("pool exhausted")
+        return self.free.pop()
+
+
+class FakePooledConnection:
+    connected = True
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def ping(self, **kwargs):
+        pass
+
+    def close(self):
+        self.pool.free.append(self)
+
+    def disconnect(self):
+        self.connected = False
+
+
+def test_close_connection_disconnects_the_pool(mysql_handler):
+    pool = FakePool(3)
+    connections = list(pool.free)
+    mysql_handler.pool = pool
+
+    mysql_handler.close_connection()
+
+    assert mysql_handler.pool is None
+    assert not any(connection.connected for connection in connections)
+
+
+def test_checkout_connection_waits_for_a_connection_given_back(mysql_handler):
+    mysql_handler.pool = FakePool(1)
+    mysql_handler.pool_timeout = 5
+    first = mysql_handler.checkout_connection()
+    connection = first._connection
+    threading.Timer(0.1, first.close).start()
+
+    start = time.monotonic()
+    second = mysql_handler.checkout_connection()
+    assert time.monotonic() - start < 2
+    assert second._connection is connection
+    second.close()
+
+    mysql_handler.pool_timeout = 0.1
+    held = mysql_handler.checkout_connection()
+    with pytest.raises(mysql.connector.errors.PoolError, match="after 0.1s"):
+        mysql_handler.checkout_connection()
+    held.close()
+
+
+def test_close_connection_reports_the_borrowed_connections(mysql_handler, capsys):
+    pool = FakePool(2)
+    mysql_handler.pool = pool
+    mysql_handler.pool_timeout = 0.1
+    borrowed = mysql_handler.checkout_connection()
+
+    mysql_handler.close_connection()
+    assert "1 connection(s) still borrowed" in capsys.readouterr().out
+    assert mysql_handler.pool is None
+
+    # Given back after the close, it is disconnected instead of pooled
+    connection = borrowed._connection
+    borrowed.close()
+    assert not connection.connected
+    assert connection not in pool.free
+
+
+def test_save_data_default_name_follows_the_format(mysql_handler, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    mysql_handler.execute_query("CREATE TABLE cats (name TEXT, age INT)")
+    mysql_handler.insert_data("cats", [("Mena", 5)], many=True)
+
+    result = mysql_handler.save_data("cats", file_format="parquet")
+
+    assert result.path == str(tmp_path / "cats.parquet")
+    assert os.listdir(tmp_path) == ["cats.parquet"]
+
+
+def test_save_data_checks_the_format_before_the_query(mysql_handler, tmp_path):
+    mysql_handler.execute_query("CREATE TABLE cats (name TEXT, age INT)")
+    connection = mysql_handler.connection
+    cursor_factory = connection.cursor
+    queries = []
+
+    def cursor(*args, **kwargs):
+        new_cursor = cursor_factory(*args, **kwargs)
+        execute = new_cursor.execute
+        new_cursor.execute = lambda query, *params: (queries.append(query), execute(query, *params))
+        return new_cursor
+
+    connection.cursor = cursor
+    assert mysql_handler.save_data("cats", output_path=str(tmp_path / "cats.xlsx"), file_format="xlsx") is None
+    assert not any(query.startswith("SELECT * FROM cats") for query in queries)
+    assert os.listdir(tmp_path) == []
+
+
+def test_insert_data_detects_rows_and_the_missing_primary_key(mysql_handler):
+    mysql_handler.execute_query(
+        "CREATE TABLE cats (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, age INT)"
+    )
+
+    # Several rows without the id
+    assert mysql_handler.insert_data("cats", [("Mena", 5), ("Kena", 11)]).rows == 2
+    # One row without the id
+    assert mysql_handler.insert_data("cats", ("Tom", 3)).rows == 1
+    # Rows with every column
+    assert mysql_handler.insert_data("cats", [(10, "Bob", 7)]).rows == 1
+    # Explicit columns
+    assert mysql_handler.insert_data("cats", [(2, "Zoe")], columns=["age", "name"]).rows == 1
+
+    assert select(mysql_handler, "SELECT id, name, age FROM cats ORDER BY id") == [
+        (1, "Mena", 5),
+        (2, "Kena", 11),
+        (3, "Tom", 3),
+        (10, "Bob", 7),
+        (11, "Zoe", 2),
+    ]
+
+
+def test_insert_data_keeps_a_first_column_that_is_not_the_key(mysql_handler):
+    mysql_handler.execute_query("CREATE TABLE cats (code TEXT, name TEXT, age INT)")
+
+    assert mysql_handler.insert_data("cats", [("Mena", 5)]) is None
+    assert select(mysql_handler, "SELECT * FROM cats") == []
+
+
+def test_metrics_count_the_errors_caught_by_the_methods(mysql_handler, tmp_path):
+    from dbautomate.metrics import Metrics
+
+    metrics = Metrics()
+    mysql_handler.add_metrics_hook(metrics)
+    # A statement without a result set returns None too, but succeeds
+    assert mysql_handler.execute_query("CREATE TABLE cats (name TEXT, age INTEGER)") is None
+    assert mysql_handler.execute_query("SELEC 1") is None
+    # The error of the nested 'stream_insert' fails the 'bulk_insert' call as well
+    assert mysql_handler.bulk_insert("cats", str(tmp_path / "missing.csv"), chunksize=10) is None
+
+    series = {item["operation"]: item for item in metrics.snapshot() if item["kind"] == "call"}
+    assert (series["execute_query"]["count"], series["execute_query"]["errors"]) == (2, 1)
+    assert series["bulk_insert"]["errors"] == 1
+    assert series["stream_insert"]["errors"] == 1
+    assert 'dbautomate_call_errors_total{operator="mysql",operation="execute_query"} 1' in metrics.to_prometheus()
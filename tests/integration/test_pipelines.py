@@ -0,0 +1,106 @@
+from dbautomate.pipelines import mongo_to_mysql, mysql_to_mongo
+
+
+def create_orders(mysql_handler):
+    cursor = mysql_handler.connection.cursor()
+    cursor.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer TEXT)")
+    cursor.execute("CREATE TABLE order_items (order_id INTEGER, sku TEXT, quantity INTEGER)")
+    cursor.executemany("INSERT INTO orders VALUES (%s, %s)", [(1, "ann"), (2, "bob"), (3, "cid")])
+    cursor.executemany(
+        "INSERT INTO order_items VALUES (%s, %s, %s)", [(1, "a", 2), (1, "b", 1), (2, "a", 5)]
+    )
+    mysql_handler.connection.commit()
+    cursor.close()
+
+
+def test_mysql_to_mongo_joins_on_the_id_column(mysql_handler, mongo):
+    create_orders(mysql_handler)
+    joins = [
+        {"table": "order_items", "local_key": "id", "foreign_key": "order_id", "as": "items", "columns": ["sku"]}
+    ]
+    result = mysql_to_mongo(mysql_handler, mongo, "orders", id_column="id", joins=joins, batch_size=2)
+    assert result.rows == 3
+    documents = list(mongo.collection.find().sort("_id"))
+    assert documents == [
+        {"_id": 1, "customer": "ann", "items": [{"sku": "a", "order_id": 1}, {"sku": "b", "order_id": 1}]},
+        {"_id": 2, "customer": "bob", "items": [{"sku": "a", "order_id": 2}]},
+        {"_id": 3, "customer": "cid", "items": []},
+    ]
+
+
+def select(mysql_handler, query):
+    cursor = mysql_handler.connection.cursor()
+    cursor.execute(query)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def test_mysql_to_mongo_copies_a_query(mysql_handler, mongo):
+    create_orders(mysql_handler)
+    result = mysql_to_mongo(
+        mysql_handler, mongo, query="SELECT id, customer FROM orders WHERE id > 1", workers=1, batch_size=1
+    )
+    assert (result.rows, result.batches) == (2, 2)
+    assert sorted(document["customer"] for document in mongo.collection.find()) == ["bob", "cid"]
+
+
+def test_mongo_to_mysql_copies_documents_and_arrays(mysql_handler, mongo):
+    mongo.collection.insert_many(
+        [
+            {"_id": 1, "name": "a", "address": {"city": "Paris"}, "tags": ["x", "y"], "items": [{"sku": "s1", "qty": 2}]},
+            {"_id": 2, "name": "b", "tags": []},
+            {"_id": 3, "name": "c", "tags": ["z"]},
+        ]
+    )
+    result = mongo_to_mysql(mongo, mysql_handler, "orders", batch_size=2)
+    assert (result.rows, result.batches) == (3, 2)
+    assert result.details["tables"] == {"orders": 3, "orders_tags": 3, "orders_items": 1}
+    assert result.details["dropped_fields"] == []
+    assert select(mysql_handler, "SELECT * FROM orders ORDER BY _id") == [
+        (1, "a", "Paris"),
+        (2, "b", None),
+        (3, "c", None),
+    ]
+    assert select(mysql_handler, "SELECT * FROM orders_tags ORDER BY orders_id, idx") == [
+        (1, 0, "x"),
+        (1, 1, "y"),
+        (3, 0, "z"),
+    ]
+    assert select(mysql_handler, "SELECT * FROM orders_items") == [(1, 0, "s1", 2)]
+
+
+def test_mongo_to_mysql_replace_copies_again(mysql_handler, mongo):
+    mongo.collection.insert_many([{"_id": 1, "name": "a"}, {"_id": 2, "name": "b"}])
+    assert mongo_to_mysql(mongo, mysql_handler, "docs").rows == 2
+    # Without 'replace' the rows already copied are duplicate keys
+    assert mongo_to_mysql(mongo, mysql_handler, "docs") is None
+    assert mongo_to_mysql(mongo, mysql_handler, "docs", replace=True).rows == 2
+    assert select(mysql_handler, "SELECT count(*) FROM docs") == [(2,)]
+
+
+def test_mongo_to_mysql_filter_and_empty_collection(mysql_handler, mongo):
+    assert mongo_to_mysql(mongo, mysql_handler, "docs") is None
+    mongo.collection.insert_many([{"_id": 1, "kind": "a"}, {"_id": 2, "kind": "b"}])
+    assert mongo_to_mysql(mongo, mysql_handler, "docs", filter={"kind": "b"}).rows == 1
+    assert select(mysql_handler, "SELECT * FROM docs") == [(2, "b")]
+
+
+def test_mongo_to_mysql_reports_the_documents_that_do_not_fit(mysql_handler, mongo, monkeypatch):
+    documents = [{"_id": 1, "amount": 1}, {"_id": 2, "amount": "unknown"}, {"_id": 3, "amount": 2.5}]
+    mongo.collection.insert_many(documents)
+    # The sample only holds the first document
+    monkeypatch.setattr(mongo.collection, "aggregate", lambda pipeline: iter(documents[:1]))
+
+    result = mongo_to_mysql(mongo, mysql_handler, "docs", batch_size=2)
+    assert result.rows == 1
+    assert result.details["rejected"] == 2
+    assert [error["_id"] for error in result.errors] == [2, 3]
+    assert select(mysql_handler, "SELECT * FROM docs") == [(1, 1)]
+
+
+def test_mongo_to_mysql_stops_on_colliding_names(mysql_handler, mongo):
+    mongo.collection.insert_many([{"_id": 1, "a": {"b": 1}}, {"_id": 2, "a_b": 2}])
+
+    assert mongo_to_mysql(mongo, mysql_handler, "docs") is None
+    assert select(mysql_handler, "SELECT name FROM sqlite_master WHERE name = 'docs'") == []
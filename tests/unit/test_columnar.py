@@ -0,0 +1,108 @@
+import os
+import decimal
+import pytest
+
+pytest.importorskip("pyarrow")
+from dbautomate.columnar import ColumnarWriter, column_table, import_pyarrow, widen_schema  # noqa: E402
+
+# pyarrow with its 'parquet' and 'ipc' modules loaded
+pa = import_pyarrow()
+
+
+def read(path, file_format):
+    if file_format == "parquet":
+        return pa.parquet.read_table(path)
+    return pa.ipc.open_file(path).read_all()
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_schema_given_up_front(tmp_path, file_format):
+    batches = [
+        [{"a": 1, "b": None, "c": 1}],
+        [{"a": 2.5, "b": 7, "c": "x"}],
+        [{"a": 3, "b": None, "c": {"k": 1}}],
+    ]
+    schema = None
+    for records in batches:
+        schema = widen_schema(schema, column_table({name: [r[name] for r in records] for name in "abc"}).schema)
+    assert schema == pa.schema([("a", pa.float64()), ("b", pa.int64()), ("c", pa.string())])
+
+    path = str(tmp_path / f"out.{file_format}")
+    with ColumnarWriter(path, file_format, None, schema=schema) as writer:
+        for records in batches:
+            writer.write_records(records)
+
+    table = read(path, file_format)
+    assert table.schema == schema
+    assert table.to_pylist() == [
+        {"a": 1.0, "b": None, "c": "1"},
+        {"a": 2.5, "b": 7, "c": "x"},
+        {"a": 3.0, "b": None, "c": '{"k": 1}'},
+    ]
+
+
+def test_widen_schema_adds_the_new_columns():
+    schema = widen_schema(pa.schema([("a", pa.null())]), pa.schema([("a", pa.int64()), ("b", pa.string())]))
+    assert schema == pa.schema([("a", pa.int64()), ("b", pa.string())])
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_value_that_does_not_fit_fails_without_rewriting(tmp_path, file_format):
+    path = str(tmp_path / f"out.{file_format}")
+    with pytest.raises(ValueError, match="does not fit"):
+        with ColumnarWriter(path, file_format, ["a"]) as writer:
+            writer.write_records([{"a": 1}])
+            writer.write_records([{"a": 2.5}])
+    assert os.listdir(tmp_path) == []
+
+
+def test_unknown_column_fails(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with pytest.raises(ValueError, match="not columns"):
+        with ColumnarWriter(path, "parquet", ["a"]) as writer:
+            writer.write_records([{"a": 1, "b": 2}])
+    assert os.listdir(tmp_path) == []
+
+
+def test_decimals_of_later_batches_can_be_longer(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ColumnarWriter(path, "parquet", ["a"]) as writer:
+        writer.write_rows([(decimal.Decimal("1.50"),)])
+        writer.write_rows([(decimal.Decimal("123456789.25"),)])
+    column = read(path, "parquet").column("a")
+    assert column.type == pa.decimal128(38, 2)
+    assert column.to_pylist() == [decimal.Decimal("1.50"), decimal.Decimal("123456789.25")]
+
+
+def test_mixed_types_in_one_batch_are_strings(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ColumnarWriter(path, "parquet", ["a"]) as writer:
+        writer.write_rows([(1,), ("x",)])
+    assert read(path, "parquet").column("a").to_pylist() == ["1", "x"]
+
+
+def test_null_columns_of_the_first_batch_are_strings(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ColumnarWriter(path, "parquet", ["a"]) as writer:
+        writer.write_rows([(None,)])
+        writer.write_rows([(5,)])
+    assert read(path, "parquet").column("a").to_pylist() == [None, "5"]
+
+
+def test_null_types_of_the_first_batch(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with ColumnarWriter(path, "parquet", ["a"], {"a": "int64"}) as writer:
+        writer.write_rows([(None,)])
+        writer.write_rows([(5,)])
+    table = read(path, "parquet")
+    assert table.schema.field("a").type == pa.int64()
+    assert table.column("a").to_pylist() == [None, 5]
+
+
+def test_failed_write_deletes_the_file(tmp_path):
+    path = str(tmp_path / "out.arrow")
+    with pytest.raises(RuntimeError):
+        with ColumnarWriter(path, "arrow", ["a"]) as writer:
+            writer.write_rows([(1,)])
+            raise RuntimeError("export failed")
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,199 @@
+import json
+import datetime
+import decimal
+import numpy as np
+import pandas as pd
+import pytest
+from bson.decimal128 import Decimal128
+from bson import json_util
+
+from dbautomate.documents import DocumentWriter, dataframe_to_documents, iter_json_array, iter_json_lines, scan_columns
+
+DOCUMENTS = [
+    {"name": 'quote " and \\ backslash', "tags": [[1, 2], [], ["a,]"]]},
+    {"text": "brackets ] [ } { and , commas", "unicode": "é中"},
+    {"nested": {"a": [{"b": None}, True, False]}, "number": -1.5e3},
+    {},
+    [],
+    "string ] value",
+    42,
+]
+
+
+def write(tmp_path, text):
+    path = tmp_path / "data.json"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+def test_iter_json_array_chunk_boundaries(tmp_path, chunk_size):
+    path = write(tmp_path, json.dumps(DOCUMENTS, ensure_ascii=False))
+    assert list(iter_json_array(path, chunk_size)) == DOCUMENTS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_iter_json_array_escapes(tmp_path, chunk_size):
+    # \uXXXX escapes and escaped quotes cut by the chunk boundaries
+    path = write(tmp_path, json.dumps(DOCUMENTS, ensure_ascii=True))
+    assert list(iter_json_array(path, chunk_size)) == DOCUMENTS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 16])
+def test_iter_json_array_whitespace(tmp_path, chunk_size):
+    path = write(tmp_path, ' \n\t[ \r\n {"a" : 1} ,\n\n  {"a": 2}\t,[ ] \n]  \n')
+    assert list(iter_json_array(path, chunk_size)) == [{"a": 1}, {"a": 2}, []]
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ \n ]  "])
+def test_iter_json_array_empty(tmp_path, text):
+    assert list(iter_json_array(write(tmp_path, text), 1)) == []
+
+
+def test_iter_json_array_single_object(tmp_path):
+    path = write(tmp_path, '  {"a": [1, 2]}')
+    assert list(iter_json_array(path, 2)) == [{"a": [1, 2]}]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '[{"a": 1}',
+        '[{"a": 1},',
+        '[{"a": }]',
+        '[{"a": 1} {"a": 2}]',
+        "[1 2]",
+        "[,1]",
+        "[1,,2]",
+        "[1,]",
+        "[1] trailing",
+        '{"a": 1',
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+def test_iter_json_array_malformed(tmp_path, text, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(write(tmp_path, text), chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1 << 16])
+def test_iter_json_array_values_cut_after_a_valid_prefix(tmp_path, chunk_size):
+    # "1.5" and "nul" parse or fail before the whole value is read
+    text = '[1.5e3, -12345678901234567890, null, "\\ud83d\\ude00", true]'
+    path = write(tmp_path, text)
+    assert list(iter_json_array(path, chunk_size)) == json.loads(text)
+
+
+def test_iter_json_array_fails_at_the_malformed_element(tmp_path, monkeypatch):
+    path = write(tmp_path, '[{"a": 1}, {"a": x}, ' + ", ".join(['{"a": 1}'] * 100000) + "]")
+    reads = []
+
+    class CountingFile:
+        def __init__(self, json_file):
+            self.json_file = json_file
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.json_file.close()
+
+        def read(self, size=-1):
+            reads.append(size)
+            return self.json_file.read(size)
+
+    monkeypatch.setattr(
+        "dbautomate.documents.open", lambda *args, **kwargs: CountingFile(open(*args, **kwargs)), raising=False
+    )
+    documents = iter_json_array(path, 64)
+    assert next(documents) == {"a": 1}
+    with pytest.raises(ValueError, match="Expecting value"):
+        next(documents)
+    assert len(reads) == 1
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1 << 16])
+def test_iter_json_array_object_hook(tmp_path, chunk_size):
+    text = '[{"_id": {"$oid": "5f43a1b2c3d4e5f6a7b8c9d0"}, "price": {"$numberDecimal": "1.5"}}]'
+    documents = list(iter_json_array(write(tmp_path, text), chunk_size, json_util.object_hook))
+    assert str(documents[0]["_id"]) == "5f43a1b2c3d4e5f6a7b8c9d0"
+    assert documents[0]["price"] == Decimal128("1.5")
+
+
+def test_iter_json_lines_object_hook(tmp_path):
+    path = tmp_path / "data.jsonl"
+    path.write_text('{"d": {"$date": "2024-01-02T00:00:00Z"}}\n\n{"d": null}\n')
+    documents = list(iter_json_lines(str(path), json_util.object_hook))
+    assert documents[0]["d"].replace(tzinfo=None) == datetime.datetime(2024, 1, 2)
+    assert documents[1] == {"d": None}
+
+
+def test_dataframe_to_documents_types():
+    dataframe = pd.DataFrame(
+        {
+            "int": np.array([1, 2], dtype="int64"),
+            "float": [1.5, np.nan],
+            "nullable": pd.array([1, None], dtype="Int64"),
+            "text": ["a", None],
+            "when": pd.to_datetime(["2024-01-02 03:04:05", None]),
+            "delta": pd.to_timedelta(["90s", None]),
+            "decimal": [decimal.Decimal("1.25"), None],
+            "flag": [True, False],
+        }
+    )
+    documents = dataframe_to_documents(dataframe)
+    assert documents == [
+        {
+            "int": 1,
+            "float": 1.5,
+            "nullable": 1,
+            "text": "a",
+            "when": datetime.datetime(2024, 1, 2, 3, 4, 5),
+            "delta": 90.0,
+            "decimal": Decimal128("1.25"),
+            "flag": True,
+        },
+        {
+            "int": 2,
+            "float": None,
+            "nullable": None,
+            "text": None,
+            "when": None,
+            "delta": None,
+            "decimal": None,
+            "flag": False,
+        },
+    ]
+    first = documents[0]
+    assert type(first["int"]) is int and type(first["float"]) is float
+    assert type(first["nullable"]) is int and type(first["flag"]) is bool
+    assert type(first["when"]) is datetime.datetime
+
+
+def test_dataframe_to_documents_empty():
+    assert dataframe_to_documents(pd.DataFrame({"a": []})) == []
+
+
+def test_document_writer_fails_on_a_field_that_is_not_a_column(tmp_path):
+    path = tmp_path / "out.csv"
+    with pytest.raises(ValueError, match=r"\['c'\]"):
+        with DocumentWriter(str(path), "csv") as writer:
+            writer.write([{"a": 1}, {"a": 2, "b": 3}])
+            writer.write([{"a": 3, "c": 4}])
+    assert not path.exists()
+
+
+def test_scan_columns_finds_the_fields_of_every_batch():
+    batches = [[{"_id": 1, "a": 1}], [{"_id": 2, "b": "x"}], [{"_id": 3, "a": 2.5}]]
+    assert scan_columns(iter(batches), "csv", ["b"]) == (["b", "_id", "a"], None)
+
+
+def test_scan_columns_widens_the_types():
+    pa = pytest.importorskip("pyarrow")
+
+    batches = [[{"a": 1, "b": None}], [{"a": 2.5, "b": Decimal128("1.5")}], [{"c": {"k": 1}}]]
+    fields, schema = scan_columns(iter(batches), "parquet")
+    assert fields == ["a", "b", "c"]
+    assert schema.field("a").type == pa.float64()
+    assert pa.types.is_decimal(schema.field("b").type)
+    assert pa.types.is_struct(schema.field("c").type)
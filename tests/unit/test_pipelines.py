@@ -0,0 +1,198 @@
+import datetime
+import decimal
+import pytest
+from bson.objectid import ObjectId
+from bson.decimal128 import Decimal128
+from dbautomate.pipelines import column_type, infer_schema, nest_rows, table_rows, value_check, value_checks
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        ([None, None], "TEXT"),
+        ([True, False], "BOOLEAN"),
+        ([1, True, None], "BIGINT"),
+        ([1, 2.5], "DOUBLE"),
+        ([Decimal128("1.50"), decimal.Decimal("-123.1"), 7], "DECIMAL(11, 2)"),
+        ([datetime.datetime(2024, 1, 1)], "DATETIME(6)"),
+        ([ObjectId()], "CHAR(24)"),
+        ([{"a": 1}, [1, 2]], "JSON"),
+        ([1, 2.5, Decimal128("1.5")], "DOUBLE"),
+        (["short", 3], "TEXT"),
+        (["x" * 2048], "TEXT"),
+        (["x" * 2049], "LONGTEXT"),
+    ],
+)
+def test_column_type(values, expected):
+    assert column_type(values) == expected
+
+
+def test_infer_schema_flattens_documents_and_splits_arrays():
+    documents = [
+        {"_id": ObjectId(), "name": "a", "address": {"city": "Paris"}, "tags": ["x", "y"]},
+        {"_id": ObjectId(), "name": "b", "items": [{"sku": "s1", "qty": 2, "sizes": [1, 2]}]},
+    ]
+    schema = infer_schema(documents, "orders")
+    assert schema["orders"] == {
+        "columns": {"_id": "CHAR(24)", "name": "TEXT", "address_city": "TEXT"},
+        "primary_key": ["_id"],
+        "path": None,
+    }
+    assert schema["orders_tags"] == {
+        "columns": {"orders_id": "CHAR(24)", "idx": "INT", "value": "TEXT"},
+        "primary_key": ["orders_id", "idx"],
+        "path": "tags",
+    }
+    assert schema["orders_items"]["columns"] == {
+        "orders_id": "CHAR(24)",
+        "idx": "INT",
+        "sku": "TEXT",
+        "qty": "BIGINT",
+        "sizes": "JSON",
+    }
+
+
+def test_infer_schema_keys_are_not_text():
+    schema = infer_schema([{"_id": "x" * 300, "tags": [1]}], "docs")
+    assert schema["docs"]["columns"]["_id"] == "VARCHAR(255)"
+    assert schema["docs_tags"]["columns"]["docs_id"] == "VARCHAR(255)"
+
+
+def test_table_rows_fills_child_tables():
+    object_id = ObjectId()
+    document = {"_id": object_id, "name": "a", "tags": ["x", "y"], "items": [{"sku": "s1"}, {"qty": 2}]}
+    schema = infer_schema([document], "orders")
+    rows = {name: [] for name in schema}
+    dropped = set()
+    table_rows(document, "orders", schema, "_", rows, dropped)
+    assert rows == {
+        "orders": [(str(object_id), "a")],
+        "orders_tags": [(str(object_id), 0, "x"), (str(object_id), 1, "y")],
+        "orders_items": [(str(object_id), 0, "s1", None), (str(object_id), 1, None, 2)],
+    }
+    assert dropped == set()
+
+
+def test_table_rows_reports_the_fields_not_in_the_schema():
+    schema = infer_schema([{"_id": 1, "name": "a", "items": [{"sku": "s1"}]}], "orders")
+    document = {
+        "_id": 2,
+        "name": "b",
+        "price": Decimal128("1.50"),
+        "address": {"city": "Paris"},
+        "items": [{"sku": "s2", "qty": 3}],
+        "tags": ["x"],
+    }
+    rows = {name: [] for name in schema}
+    dropped = set()
+    table_rows(document, "orders", schema, "_", rows, dropped)
+    assert rows == {"orders": [(2, "b")], "orders_items": [(2, 0, "s2")]}
+    assert dropped == {"price", "address_city", "items.qty", "tags"}
+
+
+@pytest.mark.parametrize(
+    "documents",
+    [
+        [{"a": {"b": 1}}, {"a_b": 2}],
+        [{"a": {"b": 1}, "a_b": 2}],
+        [{"Name": "x"}, {"name": "y"}],
+        [{"items": [{"idx": 1}]}],
+        [{"a": {"b": [1]}}, {"a_b": [2]}],
+    ],
+)
+def test_infer_schema_detects_name_collisions(documents):
+    with pytest.raises(ValueError, match="same name"):
+        infer_schema(documents, "orders")
+
+
+def test_table_rows_rejects_a_document_that_does_not_fit():
+    schema = infer_schema([{"_id": 1, "price": 1.5, "items": [{"qty": 1}]}], "orders")
+    checks = value_checks(schema)
+    rows = {name: [] for name in schema}
+
+    table_rows({"_id": 2, "price": 2, "items": [{"qty": 2}]}, "orders", schema, "_", rows, set(), checks)
+    with pytest.raises(ValueError, match="'qty' BIGINT of 'orders_items'"):
+        table_rows({"_id": 3, "price": 3.5, "items": [{"qty": "many"}]}, "orders", schema, "_", rows, set(), checks)
+    with pytest.raises(ValueError, match="'_id'"):
+        table_rows({"price": 1.0}, "orders", schema, "_", rows, set(), checks)
+    # No row of a rejected document is added
+    assert rows == {"orders": [(2, 2)], "orders_items": [(2, 0, 2)]}
+
+
+@pytest.mark.parametrize(
+    "kind, fits, does_not_fit",
+    [
+        ("DECIMAL(8, 2)", [decimal.Decimal("123456.78"), 5, Decimal128("0.5")], [decimal.Decimal("1234567"), 1.5]),
+        ("VARCHAR(255)", ["x" * 255, 7], ["x" * 256]),
+        ("TEXT", ["é" * 32767], ["é" * 32768]),
+        ("BIGINT", [2**63 - 1, True], [2**63, 1.5]),
+        ("DATETIME(6)", [datetime.datetime(2024, 1, 1)], ["2024-01-01"]),
+        ("JSON", [{"a": 1}, []], ["text"]),
+    ],
+)
+def test_value_check(kind, fits, does_not_fit):
+    check = value_check(kind)
+    assert check(None)
+    assert all(check(value) for value in fits)
+    assert not any(check(value) for value in does_not_fit)
+
+
+class TableCursor:
+    """
+    A cursor over in memory tables that answers 'SELECT * FROM t WHERE k IN (...)'.
+    """
+
+    def __init__(self, tables, queries):
+        self.tables = tables
+        self.queries = queries
+
+    def execute(self, query, params):
+        self.queries.append(params)
+        table, key = query.split(" FROM ")[1].split(" IN ")[0].split(" WHERE ")
+        names, rows = self.tables[table]
+        self.description = [(name,) for name in names]
+        self.rows = [row for row in rows if row[names.index(key)] in params]
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class TableConnection:
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+
+    def cursor(self):
+        return TableCursor(self.tables, self.queries)
+
+
+def test_nest_rows_keys_on_the_mysql_values():
+    day = datetime.date(2024, 1, 1)
+    connection = TableConnection(
+        {
+            "accounts": (["code", "day"], [(decimal.Decimal("1.50"), day)]),
+            "entries": (["day", "amount"], [(day, decimal.Decimal("2.5"))]),
+        }
+    )
+    documents = [{"code": decimal.Decimal("1.50")}]
+    join = {
+        "table": "accounts",
+        "local_key": "code",
+        "foreign_key": "code",
+        "joins": [{"table": "entries", "local_key": "day", "foreign_key": "day", "many": False}],
+    }
+
+    nest_rows(connection, documents, join)
+    assert documents == [
+        {
+            "code": decimal.Decimal("1.50"),
+            "accounts": [
+                {"code": decimal.Decimal("1.50"), "day": day, "entries": {"day": day, "amount": decimal.Decimal("2.5")}}
+            ],
+        }
+    ]
+    # The nested lookup gets the date, not the BSON datetime
+    assert connection.queries == [(decimal.Decimal("1.50"),), (day,)]